@@ -0,0 +1,181 @@
+"""
+Product Catalog Snapshot
+products / products_vector.content 를 프로세스 메모리에 열(Column) 단위로 적재하여
+추천 요청마다 수행하던 products / products_vector in_ 조회를 배열 조회로 대체합니다.
+
+- 시작 시 1회 전체 적재, 이후 CATALOG_REFRESH_INTERVAL 주기로 백그라운드 갱신
+- 갱신 시 updated_at 최대값(+행 수)을 먼저 확인하여 바뀌지 않았으면 재적재 생략
+  (updated_at 컬럼이 없으면 매 주기 전체 재적재 후 내용 해시로 변경 여부 판단)
+- products_vector.embedding 으로 로컬 벡터 인덱스(vector_index.VectorIndex)를 함께 구성
+- 새 스냅샷이 완성된 뒤 참조를 통째로 교체 (Atomic Swap), 적재 전/실패 시 기존 DB 조회 경로 사용
+"""
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from vector_index import VectorIndex, parse_embedding
+from config import (
+    settings,
+    PRODUCT_VECTOR_FK_COL, EMBED_DIM,
+    CATALOG_REFRESH_INTERVAL, CATALOG_PAGE_SIZE,
+)
+
+# 추천 결과 구성에 쓰는 products 컬럼 (recommend_product_with_brands 의 기존 select 와 동일)
+PRODUCT_COLUMNS = [
+    "id", "brand", "name", "category_major", "category_middle", "category_small",
+    "price_final", "discount_rate", "review_score", "review_count",
+]
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """한 시점의 카탈로그 (불변, 행 번호 = ids 배열 위치)"""
+    ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    row_of: Dict[Any, int] = field(default_factory=dict)         # product id -> 행 번호
+    columns: Dict[str, List[Any]] = field(default_factory=dict)  # 컬럼명 -> 행 순서 값 리스트
+    contents: List[Optional[str]] = field(default_factory=list)  # products_vector.content
+    index: Optional[VectorIndex] = None                          # 임베딩이 있는 상품의 벡터 인덱스
+    version: str = ""
+    loaded_at: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def product(self, product_id: Any) -> Optional[Dict[str, Any]]:
+        """products 행 dict (기존 products 조회 결과와 같은 형태), 없으면 None"""
+        row = self.row_of.get(product_id)
+        if row is None:
+            return None
+        return {name: values[row] for name, values in self.columns.items()}
+
+    def content(self, product_id: Any) -> Optional[str]:
+        row = self.row_of.get(product_id)
+        return None if row is None else self.contents[row]
+
+
+def build_snapshot(product_rows: List[Dict[str, Any]], vector_rows: List[Dict[str, Any]]) -> CatalogSnapshot:
+    product_rows = sorted(product_rows, key=lambda r: r["id"])
+    content_map = {r[PRODUCT_VECTOR_FK_COL]: r.get("content") for r in vector_rows}
+    embedding_map = {r[PRODUCT_VECTOR_FK_COL]: parse_embedding(r.get("embedding")) for r in vector_rows}
+
+    row_of = {row["id"]: idx for idx, row in enumerate(product_rows)}
+    columns = {name: [row.get(name) for row in product_rows] for name in PRODUCT_COLUMNS}
+    contents = [content_map.get(row["id"]) for row in product_rows]
+
+    indexed = [row for row in product_rows if embedding_map.get(row["id"]) is not None]
+    embeddings = (
+        np.stack([embedding_map[row["id"]] for row in indexed]) if indexed
+        else np.empty((0, EMBED_DIM), dtype=np.float32)
+    )
+
+    hasher = hashlib.sha256(json.dumps([columns, contents], ensure_ascii=False, default=str).encode())
+    hasher.update(embeddings.tobytes())
+    digest = hasher.hexdigest()[:12]
+
+    return CatalogSnapshot(
+        ids=np.asarray([row["id"] for row in product_rows]),
+        row_of=row_of,
+        columns=columns,
+        contents=contents,
+        index=VectorIndex(
+            [row["id"] for row in indexed], embeddings, [row.get("brand") for row in indexed]
+        ) if indexed else None,
+        version=digest,
+        loaded_at=time.time(),
+    )
+
+
+class CatalogStore:
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._client = None
+        self._watermark: Optional[tuple] = None  # (products updated_at, products_vector updated_at, 행 수)
+
+    @property
+    def is_ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        return self._snapshot
+
+    def _get_client(self):
+        if self._client is None:
+            from supabase import create_client
+            self._client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        return self._client
+
+    def _iter_rows(self, table: str, columns: str, key: str) -> Iterator[Dict[str, Any]]:
+        """Keyset Pagination 전체 스캔"""
+        sb = self._get_client()
+        last_key = None
+        while True:
+            query = sb.table(table).select(columns).order(key).limit(CATALOG_PAGE_SIZE)
+            if last_key is not None:
+                query = query.gt(key, last_key)
+            rows = query.execute().data or []
+            yield from rows
+            if len(rows) < CATALOG_PAGE_SIZE:
+                return
+            last_key = rows[-1][key]
+
+    def _probe_watermark(self) -> Optional[tuple]:
+        """카탈로그 변경 감지용 값 (updated_at 컬럼이 없으면 None → 전체 재적재)"""
+        sb = self._get_client()
+        try:
+            latest = []
+            for table in ("products", "products_vector"):
+                resp = (
+                    sb.table(table).select("updated_at", count="exact")
+                    .order("updated_at", desc=True).limit(1).execute()
+                )
+                latest.append(((resp.data or [{}])[0].get("updated_at"), resp.count))
+            return tuple(latest)
+        except Exception:
+            return None
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        카탈로그 재적재 (동기, 스레드에서 실행)
+        Returns: 스냅샷이 교체되었으면 True
+        """
+        watermark = self._probe_watermark()
+        if not force and self.is_ready and watermark is not None and watermark == self._watermark:
+            return False
+
+        started = time.monotonic()
+        products = list(self._iter_rows("products", ", ".join(PRODUCT_COLUMNS), "id"))
+        vectors = list(self._iter_rows(
+            "products_vector", f"{PRODUCT_VECTOR_FK_COL}, content, embedding", PRODUCT_VECTOR_FK_COL
+        ))
+        snapshot = build_snapshot(products, vectors)
+        self._watermark = watermark
+
+        if self._snapshot is not None and snapshot.version == self._snapshot.version:
+            return False
+        self._snapshot = snapshot
+        index = snapshot.index
+        print(
+            f"📦 [Catalog] {len(snapshot)} products 적재 "
+            f"(vector index: {len(index) if index else 0}, {index.mode if index else '-'}, version={snapshot.version}, "
+            f"{time.monotonic() - started:.1f}s)"
+        )
+        return True
+
+    async def run_refresh(self):
+        """주기적 갱신 루프 (main.py startup 에서 Task 로 실행, 실패 시 기존 스냅샷 유지)"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                print(f"⚠️ [Catalog] Refresh failed, keeping previous snapshot: {e}")
+            await asyncio.sleep(CATALOG_REFRESH_INTERVAL)
+
+
+# Global instance
+catalog_store = CatalogStore()
@@ -0,0 +1,123 @@
+"""
+Cross-Encoder Score Cache
+같은 뷰티 프로필(쿼리 텍스트)에 대해 같은 후보 상품의 CE 점수는 항상 같으므로
+(쿼리 해시, 상품 content 해시) → 점수를 캐싱하고 캐시에 없는 쌍만 ce.predict 로 계산합니다.
+
+- 키는 실제 모델 입력(truncate_for_ce 적용 후 텍스트)의 해시, 쿼리 해시에 CE_MODEL 포함
+  → 상품 content 가 바뀌거나 모델이 바뀌면 키가 달라져 이전 점수는 자동으로 사용되지 않음 (LRU로 정리)
+- 메모리 LRU (CE_SCORE_CACHE_MAX_ENTRIES)
+- CE_SCORE_CACHE_PATH 지정 시 JSONL 로 추가 기록하여 재시작 후에도 유지
+  (기록 줄 수가 현재 항목 수의 2배를 넘으면 적재 시/실행 중 모두 LRU 항목만 남겨 압축)
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import CE_MODEL, CE_SCORE_CACHE_MAX_ENTRIES, CE_SCORE_CACHE_PATH
+
+PairKey = Tuple[str, str]
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def make_pair_key(query: str, content: str, model: str = CE_MODEL) -> PairKey:
+    return _digest(f"{model}\n{query}"), _digest(content)
+
+
+class CEScoreCache:
+    def __init__(self, max_entries: int = CE_SCORE_CACHE_MAX_ENTRIES, path: str = CE_SCORE_CACHE_PATH):
+        self.max_entries = max_entries
+        self._scores: "OrderedDict[PairKey, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.path: Optional[Path] = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._file_lines = 0  # 저장 파일 줄 수 (압축 판단용)
+        if self.path is not None:
+            try:
+                self._load()
+            except OSError as e:
+                print(f"⚠️ [CE Score Cache] 저장 파일 사용 불가, 메모리 캐시만 사용: {e}")
+                self.path = None
+
+    def _load(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists():
+            return
+        # 줄바꿈 없이 잘린 마지막 줄 제거 (남겨두면 이후 추가한 기록과 붙어 함께 유실)
+        with self.path.open("r+b") as f:
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                self._file_lines += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # 중단 시 잘린 마지막 줄
+                self._remember((record["q"], record["c"]), float(record["s"]))
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        """오래된(LRU 밖)/중복 기록이 쌓였으면 현재 항목만 남겨 파일 재작성 (lock 보유 상태에서 호출)"""
+        if self._file_lines <= len(self._scores) * 2:
+            return
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for (q, c), score in self._scores.items():
+                f.write(json.dumps({"q": q, "c": c, "s": score}) + "\n")
+        tmp.replace(self.path)
+        self._file_lines = len(self._scores)
+
+    def _remember(self, key: PairKey, score: float):
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+
+    def score(self, ce: Any, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        """
+        ce.predict(pairs) 와 같은 순서의 점수 리스트 (캐시에 없는 쌍만 모델 추론)
+        """
+        keys = [make_pair_key(query, content) for query, content in pairs]
+        scores: List[Optional[float]] = [None] * len(pairs)
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._scores.get(key)
+                if cached is not None:
+                    self._scores.move_to_end(key)
+                    scores[i] = cached
+            missing = [i for i, score in enumerate(scores) if score is None]
+            self.hits += len(pairs) - len(missing)
+            self.misses += len(missing)
+        if not missing:
+            return scores
+
+        predicted = ce.predict([pairs[i] for i in missing])
+        records = []
+        with self._lock:
+            for i, value in zip(missing, predicted):
+                scores[i] = float(value)
+                self._remember(keys[i], scores[i])
+                records.append(json.dumps({"q": keys[i][0], "c": keys[i][1], "s": scores[i]}))
+            if self.path is not None:
+                try:
+                    with self.path.open("a", encoding="utf-8") as f:
+                        f.write("\n".join(records) + "\n")
+                    self._file_lines += len(records)
+                    self._maybe_compact()
+                except OSError as e:
+                    print(f"⚠️ [CE Score Cache] 저장 실패: {e}")
+        return scores
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._scores), "hits": self.hits, "misses": self.misses}
+
+
+# Global instance
+ce_score_cache = CEScoreCache()
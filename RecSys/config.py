@@ -27,6 +27,41 @@ KW_BONUS_ALPHA = 1.2
 CUSTOMER_ID_COL = "user_id"
 PRODUCT_VECTOR_FK_COL = "product_id"
 
+# ============================================================================
+# 카탈로그 스냅샷 (products / products_vector 메모리 적재)
+# ============================================================================
+
+CATALOG_REFRESH_INTERVAL = 600  # 변경 확인 주기(초)
+CATALOG_PAGE_SIZE = 1000        # 전체 적재 시 페이지 크기
+
+# 로컬 벡터 인덱스 (match_products RPC 대체)
+VECTOR_INDEX_DTYPE = "float32"  # 임베딩 행렬 dtype ("float16"이면 메모리 절반)
+VECTOR_ANN_MIN_ROWS = 50000     # 이 행 수 이상이면 HNSW(ANN) 사용 (hnswlib 설치 시), 미만은 전수 계산
+VECTOR_ANN_EF = 128             # HNSW 검색 ef (클수록 정확/느림)
+
+# ============================================================================
+# 쿼리 임베딩 캐시 (build_user_query_text 결과 기준)
+# ============================================================================
+
+EMBED_CACHE_MAX_ENTRIES = 10000                                         # 메모리 LRU 최대 항목 수
+EMBED_CACHE_DIR = os.getenv("EMBED_CACHE_DIR", ".cache/query_embeddings")  # 디스크 저장소 경로 (빈 문자열이면 비활성화)
+
+# ============================================================================
+# Cross-Encoder 점수 캐시 ((쿼리 해시, 상품 content 해시) 기준)
+# ============================================================================
+
+CE_SCORE_CACHE_MAX_ENTRIES = 200000                                        # 메모리 LRU 최대 항목 수
+CE_SCORE_CACHE_PATH = os.getenv("CE_SCORE_CACHE_PATH", ".cache/ce_scores.jsonl")  # 저장 파일 (빈 문자열이면 비활성화)
+
+# ============================================================================
+# 추론 실행 / 동시 요청 제한
+# ============================================================================
+
+CE_INFERENCE_WORKERS = int(os.getenv("CE_INFERENCE_WORKERS", "1"))            # Cross-Encoder 추론 전용 스레드 수
+CE_TORCH_THREADS = int(os.getenv("CE_TORCH_THREADS", "0"))                    # torch intra-op 스레드 수 (0이면 torch 기본값)
+RECOMMEND_MAX_CONCURRENCY = int(os.getenv("RECOMMEND_MAX_CONCURRENCY", "4"))  # 동시에 처리하는 추천 요청 수
+RECOMMEND_MAX_QUEUE = int(os.getenv("RECOMMEND_MAX_QUEUE", "64"))             # 대기 가능한 추천 요청 수 (초과 시 503, 0이면 무제한)
+
 # ============================================================================
 # 동의어 매핑
 # ============================================================================
@@ -0,0 +1,158 @@
+"""
+Query Embedding Cache
+build_user_query_text 결과(피부타입/고민/키워드/톤)가 같은 고객은 같은 임베딩을 받으므로
+sha256(EMBED_MODEL + 쿼리 텍스트) → 벡터를 캐싱하여 OpenAI embeddings 호출을 생략합니다.
+
+- 1차: 메모리 LRU (EMBED_CACHE_MAX_ENTRIES)
+- 2차: 디스크 저장소 (EMBED_CACHE_DIR, 재시작 후에도 유지)
+  - vectors.f32: float32 벡터를 행 단위로 이어 붙인 파일 (np.memmap 으로 조회)
+  - keys.jsonl: {"key", "row"} 색인 (벡터 기록 후 추가 → 잘린 마지막 행/줄은 적재 시 제거)
+- EMBED_CACHE_DIR 를 빈 문자열로 두면 메모리 캐시만 사용
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from config import EMBED_MODEL, EMBED_DIM, EMBED_CACHE_MAX_ENTRIES, EMBED_CACHE_DIR
+
+
+def make_embedding_key(text: str, model: str = EMBED_MODEL) -> str:
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+
+class DiskEmbeddingStore:
+    """추가 전용(Append-only) memmap 벡터 저장소"""
+    def __init__(self, directory: str, dim: int = EMBED_DIM):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.vectors_path = self.dir / "vectors.f32"
+        self.keys_path = self.dir / "keys.jsonl"
+        self.vectors_path.touch(exist_ok=True)
+        self._rows: Dict[str, int] = {}
+        self._mmap: Optional[np.memmap] = None
+        self._load()
+
+    def _row_count(self) -> int:
+        return self.vectors_path.stat().st_size // (self.dim * 4)
+
+    def _load(self):
+        rows = self._row_count()
+        # 중단으로 잘린 마지막 벡터는 잘라내어 이후 추가 행의 정렬 유지
+        with self.vectors_path.open("r+b") as f:
+            f.truncate(rows * self.dim * 4)
+        if self.keys_path.exists():
+            # 줄바꿈 없이 잘린 마지막 줄도 제거 (남겨두면 이후 추가한 색인 줄과 붙어 함께 유실)
+            with self.keys_path.open("r+b") as f:
+                data = f.read()
+                f.truncate(data.rfind(b"\n") + 1)
+            with self.keys_path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # 중단 시 잘린 마지막 줄
+                    if record.get("row", rows) < rows:
+                        self._rows[record["key"]] = record["row"]
+        self._remap()
+
+    def _remap(self):
+        rows = self._row_count()
+        self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)) if rows else None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            self._remap()
+        return np.array(self._mmap[row])
+
+    def put(self, key: str, vector: np.ndarray):
+        if key in self._rows:
+            return
+        row = self._row_count()
+        with self.vectors_path.open("ab") as f:
+            f.write(np.asarray(vector, dtype=np.float32).tobytes())
+        with self.keys_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "row": row}) + "\n")
+        self._rows[key] = row
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_entries: int = EMBED_CACHE_MAX_ENTRIES, directory: str = EMBED_CACHE_DIR):
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk: Optional[DiskEmbeddingStore] = None
+        if directory:
+            try:
+                self.disk = DiskEmbeddingStore(directory)
+            except OSError as e:
+                print(f"⚠️ [Embedding Cache] 디스크 저장소 사용 불가, 메모리 캐시만 사용: {e}")
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, text: str) -> Optional[List[float]]:
+        key = make_embedding_key(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector.tolist()
+            vector = self.disk.get(key) if self.disk is not None else None
+            if vector is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, vector)
+            return vector.tolist()
+
+    def set(self, text: str, embedding: List[float]):
+        key = make_embedding_key(text)
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+            if self.disk is not None:
+                try:
+                    self.disk.put(key, vector)
+                except OSError as e:
+                    print(f"⚠️ [Embedding Cache] 디스크 저장 실패: {e}")
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_or_embed(self, text: str, embed: Callable[[str], List[float]]) -> List[float]:
+        """캐시 조회 후 없으면 embed(text) 호출 결과를 저장하여 반환"""
+        cached = self.get(text)
+        if cached is not None:
+            return cached
+        embedding = embed(text)
+        self.set(text, embedding)
+        return embedding
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+
+# Global instance
+query_embedding_cache = QueryEmbeddingCache()
@@ -0,0 +1,88 @@
+"""
+Inference Executor / Admission Control
+Cross-Encoder 추론(CPU 집약)과 동기 Supabase/OpenAI 호출이 FastAPI 이벤트 루프를 막지 않도록 분리합니다.
+
+- run_inference(): 모델 로드/추론 전용 스레드 풀 (CE_INFERENCE_WORKERS 개, torch intra-op 스레드 CE_TORCH_THREADS)
+  → I/O 대기(asyncio.to_thread, 기본 스레드 풀)는 추론 중에도 계속 진행
+- AdmissionGate: 동시 추천 수(RECOMMEND_MAX_CONCURRENCY) 제한, 초과 요청은 도착 순서대로 대기
+  대기열이 RECOMMEND_MAX_QUEUE 를 넘으면 즉시 거절 (AdmissionRejected → 503)
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from config import CE_INFERENCE_WORKERS, CE_TORCH_THREADS, RECOMMEND_MAX_CONCURRENCY, RECOMMEND_MAX_QUEUE
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        if CE_TORCH_THREADS > 0:
+            import torch
+            torch.set_num_threads(CE_TORCH_THREADS)  # 프로세스 전역 intra-op 스레드 수
+        _executor = ThreadPoolExecutor(max_workers=CE_INFERENCE_WORKERS, thread_name_prefix="ce-inference")
+        print(f"[Inference] executor ready: workers={CE_INFERENCE_WORKERS}, torch_threads={CE_TORCH_THREADS or 'default'}")
+    return _executor
+
+
+async def run_inference(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """fn(*args, **kwargs) 를 추론 전용 스레드 풀에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), partial(fn, *args, **kwargs))
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 차 요청을 받지 않음"""
+
+
+class AdmissionGate:
+    def __init__(self, max_concurrent: int, max_queue: int):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue  # 0이면 대기열 제한 없음
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def admit(self):
+        if self.max_queue and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(f"recommendation queue full ({self.waiting} waiting)")
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+        }
+
+
+# Global instance
+recommend_admission = AdmissionGate(RECOMMEND_MAX_CONCURRENCY, RECOMMEND_MAX_QUEUE)
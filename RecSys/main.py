@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
@@ -6,6 +7,8 @@ from recommendation_model_API import get_recommendation
 from dotenv import load_dotenv
 import os
 from models import CustomerProfile
+from catalog_snapshot import catalog_store
+from inference_executor import recommend_admission, AdmissionRejected, shutdown_executor
 
 # Load environment variables
 load_dotenv()
@@ -28,13 +31,23 @@ class RecommendationResponse(BaseModel):
     reason: str
     product_data: Optional[Dict[str, Any]] = None
 
+@app.on_event("startup")
+async def startup_event():
+    # 카탈로그 스냅샷 적재 + 주기적 갱신 (적재 전/실패 시 추천은 DB 조회 경로 사용)
+    app.state.catalog_task = asyncio.create_task(catalog_store.run_refresh())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.catalog_task.cancel()
+    shutdown_executor()
+
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
     return Response(status_code=204)
 
 @app.get("/")
 async def root():
-    return {"status": "healthy", "service": "Recommendation System"}
+    return {"status": "healthy", "service": "Recommendation System", "admission": recommend_admission.stats()}
 
 @app.post("/recommend", response_model=RecommendationResponse)
 async def recommend(request: RecommendationRequest):
@@ -42,8 +55,12 @@ async def recommend(request: RecommendationRequest):
     Recommend a product based on user profile and history using LLM.
     """
     try:
-        result = await get_recommendation(request)
+        # 동시 처리 수 제한 (초과 요청은 도착 순서대로 대기, 대기열 초과 시 503)
+        async with recommend_admission.admit():
+            result = await get_recommendation(request)
         return result
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
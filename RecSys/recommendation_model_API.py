@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 from typing import Dict, Any, List, Optional, Tuple
 from openai import OpenAI
 import httpx
@@ -15,6 +16,10 @@ from config import (
     # 날씨 키워드
     WEATHER_KEYWORDS, WEATHER_PRIORITY_KEYWORDS
 )
+from catalog_snapshot import catalog_store
+from embedding_cache import query_embedding_cache
+from ce_score_cache import ce_score_cache
+from inference_executor import run_inference
 from sentence_transformers import CrossEncoder
 import torch
 from datetime import datetime
@@ -322,18 +327,19 @@ async def recommend_product_with_brands(
     """
     try:
         # Supabase 및 OpenAI 클라이언트 초기화
+        # (동기 클라이언트 호출은 asyncio.to_thread, 모델 로드/추론은 추론 전용 스레드 풀에서 실행)
         from supabase import create_client, Client
-        sb: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        sb: Client = await asyncio.to_thread(create_client, settings.SUPABASE_URL, settings.SUPABASE_KEY)
         oa = OpenAI(api_key=settings.OPENAI_API_KEY)
-        ce = get_cross_encoder()
+        ce = await run_inference(get_cross_encoder)
         
         # 1) 고객 정보 조회
-        customer_resp = (
+        customer_resp = await asyncio.to_thread(
             sb.table("customers")
             .select("user_id, skin_type, skin_concerns, keywords, preferred_tone")
             .eq(CUSTOMER_ID_COL, user_id)
             .limit(1)
-            .execute()
+            .execute
         )
 
         print(f"customer_resp: {customer_resp}")
@@ -363,11 +369,19 @@ async def recommend_product_with_brands(
         # 2) 쿼리 텍스트 생성
         query_text = build_user_query_text(customer)
         
-        # 3) 임베딩 생성
-        query_emb = embed_text(oa, query_text)
+        # 3) 임베딩 생성 (같은 쿼리 텍스트는 캐시에서 재사용)
+        query_emb = await asyncio.to_thread(
+            query_embedding_cache.get_or_embed, query_text, lambda text: embed_text(oa, text)
+        )
         
         # 4) 벡터 유사도 검색 (후보 풀) - 브랜드 필터링 적용
-        if target_brands and len(target_brands) > 0:
+        # 카탈로그 스냅샷의 로컬 벡터 인덱스가 있으면 프로세스 내 검색, 없으면 match_products RPC
+        catalog = catalog_store.snapshot
+        if catalog is not None and catalog.index is not None:
+            print(f"\n🔍 [Local Search] {catalog.index.mode} 검색: brands={target_brands or '전체'} (pool={CANDIDATE_POOL})")
+            matches = await asyncio.to_thread(catalog.index.search, query_emb, CANDIDATE_POOL, target_brands)
+            print(f"📊 [Local Search] 유사도 검색 결과: {len(matches)}개")
+        elif target_brands and len(target_brands) > 0:
             # 브랜드가 지정된 경우
             print(f"\n🔍 [RPC Search] 브랜드 지정 검색: {target_brands}")
             
@@ -378,7 +392,7 @@ async def recommend_product_with_brands(
             }
             
             try:
-                response = sb.rpc('match_products', rpc_payload).execute()
+                response = await asyncio.to_thread(sb.rpc('match_products', rpc_payload).execute)
                 matches = response.data or []
                 
                 print(f"📊 [RPC Response] 브랜드 필터링 검색 결과: {len(matches)}개")
@@ -402,7 +416,7 @@ async def recommend_product_with_brands(
                 "query_embedding": query_emb,
             }
             
-            match_resp = sb.rpc("match_products", rpc_payload).execute()
+            match_resp = await asyncio.to_thread(sb.rpc("match_products", rpc_payload).execute)
             matches = match_resp.data or []
             
             print(f"📊 [RPC Response] 유사도 검색 결과: {len(matches)}개")
@@ -421,14 +435,18 @@ async def recommend_product_with_brands(
         
         # 5) products 상세 정보 조회
         # RPC에서 이미 브랜드 필터링이 적용되었으므로 추가 필터 불필요
-        print(f"\n🗃️ [Products Table] 상세 정보 조회:")
-        products_resp = (
-            sb.table("products")
-            .select("id, brand, name, category_major, category_middle, category_small, price_final, discount_rate, review_score, review_count")
-            .in_("id", candidate_ids)
-            .execute()
-        )
-        products = products_resp.data or []
+        # 카탈로그 스냅샷이 적재되어 있으면 DB 조회 없이 메모리에서 조회
+        print(f"\n🗃️ [Products Table] 상세 정보 조회 ({'snapshot' if catalog else 'db'}):")
+        if catalog is not None:
+            products = [p for p in (catalog.product(pid) for pid in candidate_ids) if p is not None]
+        else:
+            products_resp = await asyncio.to_thread(
+                sb.table("products")
+                .select("id, brand, name, category_major, category_middle, category_small, price_final, discount_rate, review_score, review_count")
+                .in_("id", candidate_ids)
+                .execute
+            )
+            products = products_resp.data or []
         
         print(f"\n📦 [Products Result] 조회 결과:")
         print(f"  - 조회된 제품 수: {len(products)}개")
@@ -454,14 +472,17 @@ async def recommend_product_with_brands(
         print(f"  - 필터링 후 제품 수: {len(filtered_ids)}개")
         
         # 6) products_vector content 가져오기
-        pv_resp = (
-            sb.table("products_vector")
-            .select(f"{PRODUCT_VECTOR_FK_COL}, content")
-            .in_(PRODUCT_VECTOR_FK_COL, filtered_ids)
-            .execute()
-        )
-        pv_rows = pv_resp.data or []
-        pv_map = {r[PRODUCT_VECTOR_FK_COL]: r.get("content") for r in pv_rows}
+        if catalog is not None:
+            pv_map = {pid: catalog.content(pid) for pid in filtered_ids}
+        else:
+            pv_resp = await asyncio.to_thread(
+                sb.table("products_vector")
+                .select(f"{PRODUCT_VECTOR_FK_COL}, content")
+                .in_(PRODUCT_VECTOR_FK_COL, filtered_ids)
+                .execute
+            )
+            pv_rows = pv_resp.data or []
+            pv_map = {r[PRODUCT_VECTOR_FK_COL]: r.get("content") for r in pv_rows}
         
         # 7) Cross-Encoder rerank + keyword bonus
         pairs: List[Tuple[str, str]] = []
@@ -478,7 +499,8 @@ async def recommend_product_with_brands(
             print("[WARN] 브랜드 필터링 후 products_vector.content가 비어있습니다.")
             return None
         
-        ce_scores = ce.predict(pairs)
+        # 같은 (쿼리, content) 쌍은 캐시된 점수 사용, 나머지만 모델 추론
+        ce_scores = await run_inference(ce_score_cache.score, ce, pairs)
         
         reranked = []
         for pid, ce_score in zip(valid_ids, ce_scores):
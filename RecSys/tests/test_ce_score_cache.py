@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# RecSys 폴더를 path에 추가 (config.Settings 필수 값은 테스트용 더미, 전역 캐시는 파일 미사용)
+recsys_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(recsys_dir))
+for name in ("OPENAI_API_KEY", "SUPABASE_URL", "SUPABASE_KEY"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("CE_SCORE_CACHE_PATH", "")
+
+from ce_score_cache import CEScoreCache, make_pair_key
+
+
+class FakeCrossEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs):
+        self.calls.append(list(pairs))
+        return [float(len(query) + len(content)) for query, content in pairs]
+
+
+class TestCEScoreCache(unittest.TestCase):
+    def test_predicts_only_missing_pairs(self):
+        cache = CEScoreCache(max_entries=100, path="")
+        ce = FakeCrossEncoder()
+        first = cache.score(ce, [("q", "a"), ("q", "bb")])
+        second = cache.score(ce, [("q", "bb"), ("q", "ccc"), ("q", "a")])
+
+        self.assertEqual(first, [2.0, 3.0])
+        self.assertEqual(second, [3.0, 4.0, 2.0])
+        self.assertEqual(ce.calls, [[("q", "a"), ("q", "bb")], [("q", "ccc")]])
+        self.assertEqual(cache.stats(), {"entries": 3, "hits": 2, "misses": 3})
+
+    def test_key_changes_with_content_and_model(self):
+        self.assertNotEqual(make_pair_key("q", "old"), make_pair_key("q", "new"))
+        self.assertNotEqual(make_pair_key("q", "c", "model-a"), make_pair_key("q", "c", "model-b"))
+
+        cache = CEScoreCache(max_entries=100, path="")
+        ce = FakeCrossEncoder()
+        cache.score(ce, [("q", "old")])
+        cache.score(ce, [("q", "new content")])
+        self.assertEqual(len(ce.calls), 2)
+
+    def test_scores_persist_and_file_is_compacted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "ce_scores.jsonl"
+            cache = CEScoreCache(max_entries=2, path=str(path))
+            ce = FakeCrossEncoder()
+            for content in ["a", "bb", "ccc", "dddd", "eeeee"]:
+                cache.score(ce, [("q", content)])
+
+            # LRU 밖으로 밀려난 기록이 쌓이면 실행 중에도 현재 항목만 남김
+            lines = path.read_text(encoding="utf-8").splitlines()
+            self.assertLessEqual(len(lines), 2 * cache.max_entries)
+            self.assertEqual(cache._file_lines, len(lines))
+
+            restarted = CEScoreCache(max_entries=2, path=str(path))
+            ce = FakeCrossEncoder()
+            self.assertEqual(restarted.score(ce, [("q", "dddd"), ("q", "eeeee")]), [5.0, 6.0])
+            self.assertEqual(ce.calls, [])
+
+    def test_truncated_last_line_is_skipped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "ce_scores.jsonl"
+            q, c = make_pair_key("q", "a")
+            path.write_text(json.dumps({"q": q, "c": c, "s": 0.5}) + '\n{"q": "tor', encoding="utf-8")
+
+            cache = CEScoreCache(max_entries=10, path=str(path))
+            self.assertEqual(cache.score(FakeCrossEncoder(), [("q", "a")]), [0.5])
+
+            # 잘린 줄 뒤에 추가한 기록도 재시작 후 유지
+            cache.score(FakeCrossEncoder(), [("q", "bb")])
+            ce = FakeCrossEncoder()
+            self.assertEqual(CEScoreCache(max_entries=10, path=str(path)).score(ce, [("q", "bb")]), [3.0])
+            self.assertEqual(ce.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
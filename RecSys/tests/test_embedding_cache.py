@@ -0,0 +1,91 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# RecSys 폴더를 path에 추가 (config.Settings 필수 값은 테스트용 더미, 전역 캐시는 디스크 미사용)
+recsys_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(recsys_dir))
+for name in ("OPENAI_API_KEY", "SUPABASE_URL", "SUPABASE_KEY"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("EMBED_CACHE_DIR", "")
+
+from embedding_cache import DiskEmbeddingStore, QueryEmbeddingCache, make_embedding_key
+
+DIM = 4
+
+
+class TestDiskEmbeddingStore(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def test_rows_survive_reopen(self):
+        store = DiskEmbeddingStore(self.dir, dim=DIM)
+        store.put("a", np.arange(4, dtype=np.float32))
+        store.put("b", np.arange(4, 8, dtype=np.float32))
+        store.put("a", np.zeros(4, dtype=np.float32))  # 이미 있는 키는 무시
+
+        reopened = DiskEmbeddingStore(self.dir, dim=DIM)
+        self.assertEqual(len(reopened), 2)
+        np.testing.assert_array_equal(reopened.get("a"), np.arange(4))
+        np.testing.assert_array_equal(reopened.get("b"), np.arange(4, 8))
+        self.assertIsNone(reopened.get("missing"))
+
+    def test_torn_trailing_row_is_dropped(self):
+        store = DiskEmbeddingStore(self.dir, dim=DIM)
+        store.put("a", np.ones(4, dtype=np.float32))
+        # 벡터 일부만 기록되고 keys.jsonl 은 잘린 채 중단된 상황
+        with store.vectors_path.open("ab") as f:
+            f.write(np.full(2, 9, dtype=np.float32).tobytes())
+        with store.keys_path.open("a", encoding="utf-8") as f:
+            f.write('{"key": "b", "ro')
+
+        reopened = DiskEmbeddingStore(self.dir, dim=DIM)
+        self.assertEqual(len(reopened), 1)
+        self.assertEqual(reopened.vectors_path.stat().st_size, DIM * 4)
+
+        # 이후 추가 행이 올바른 위치에 기록되어야 함
+        reopened.put("c", np.full(4, 3, dtype=np.float32))
+        again = DiskEmbeddingStore(self.dir, dim=DIM)
+        np.testing.assert_array_equal(again.get("a"), np.ones(4))
+        np.testing.assert_array_equal(again.get("c"), np.full(4, 3))
+
+    def test_key_without_vector_row_is_ignored(self):
+        store = DiskEmbeddingStore(self.dir, dim=DIM)
+        store.put("a", np.ones(4, dtype=np.float32))
+        with store.keys_path.open("a", encoding="utf-8") as f:
+            f.write('{"key": "b", "row": 1}\n')  # 벡터 기록 전 중단
+        self.assertIsNone(DiskEmbeddingStore(self.dir, dim=DIM).get("b"))
+
+
+class TestQueryEmbeddingCache(unittest.TestCase):
+    def test_get_or_embed_uses_memory_then_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            calls = []
+
+            def embed(text):
+                calls.append(text)
+                return [0.0] * 1536
+
+            cache = QueryEmbeddingCache(max_entries=10, directory=directory)
+            cache.get_or_embed("건성 보습", embed)
+            cache.get_or_embed("건성 보습", embed)
+            self.assertEqual(calls, ["건성 보습"])
+            self.assertEqual(cache.stats()["hits"], 1)
+
+            restarted = QueryEmbeddingCache(max_entries=10, directory=directory)
+            self.assertEqual(len(restarted.get_or_embed("건성 보습", embed)), 1536)
+            self.assertEqual(calls, ["건성 보습"])
+            self.assertEqual(restarted.stats()["disk_hits"], 1)
+
+    def test_key_includes_model(self):
+        self.assertNotEqual(make_embedding_key("q", "model-a"), make_embedding_key("q", "model-b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
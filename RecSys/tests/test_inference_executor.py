@@ -0,0 +1,100 @@
+import asyncio
+import os
+import sys
+import unittest
+from pathlib import Path
+
+# RecSys 폴더를 path에 추가 (config.Settings 필수 값은 테스트용 더미)
+recsys_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(recsys_dir))
+for name in ("OPENAI_API_KEY", "SUPABASE_URL", "SUPABASE_KEY"):
+    os.environ.setdefault(name, "test")
+
+from inference_executor import AdmissionGate, AdmissionRejected, run_inference, shutdown_executor
+
+
+class TestAdmissionGate(unittest.TestCase):
+    def test_waiters_are_admitted_in_arrival_order(self):
+        async def scenario():
+            gate = AdmissionGate(max_concurrent=1, max_queue=0)
+            order = []
+
+            async def request(i):
+                async with gate.admit():
+                    order.append(i)
+                    await asyncio.sleep(0.01)
+
+            tasks = []
+            for i in range(5):
+                tasks.append(asyncio.ensure_future(request(i)))
+                await asyncio.sleep(0)  # 도착 순서 고정
+            await asyncio.gather(*tasks)
+            return order, gate.stats()
+
+        order, stats = asyncio.run(scenario())
+        self.assertEqual(order, [0, 1, 2, 3, 4])
+        self.assertEqual((stats["active"], stats["waiting"], stats["rejected"]), (0, 0, 0))
+
+    def test_rejects_when_queue_is_full(self):
+        async def scenario():
+            gate = AdmissionGate(max_concurrent=1, max_queue=2)
+            release = asyncio.Event()
+
+            async def request():
+                async with gate.admit():
+                    await release.wait()
+
+            tasks = [asyncio.ensure_future(request()) for _ in range(3)]  # 1개 처리 + 2개 대기
+            await asyncio.sleep(0)
+            stats = gate.stats()
+            with self.assertRaises(AdmissionRejected):
+                async with gate.admit():
+                    pass
+            release.set()
+            await asyncio.gather(*tasks)
+            return stats, gate.stats()
+
+        during, after = asyncio.run(scenario())
+        self.assertEqual((during["active"], during["waiting"]), (1, 2))
+        self.assertEqual(after["rejected"], 1)
+        self.assertEqual((after["active"], after["waiting"]), (0, 0))
+
+    def test_cancelled_waiter_leaves_queue(self):
+        async def scenario():
+            gate = AdmissionGate(max_concurrent=1, max_queue=1)
+            release = asyncio.Event()
+
+            async def request():
+                async with gate.admit():
+                    await release.wait()
+
+            holder = asyncio.ensure_future(request())
+            waiter = asyncio.ensure_future(request())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            waiting = gate.waiting
+            release.set()
+            await holder
+            return waiting
+
+        self.assertEqual(asyncio.run(scenario()), 0)
+
+
+class TestRunInference(unittest.TestCase):
+    def tearDown(self):
+        shutdown_executor()
+
+    def test_runs_in_inference_thread(self):
+        import threading
+
+        async def scenario():
+            return await run_inference(lambda x, y=0: (threading.current_thread().name, x + y), 1, y=2)
+
+        thread_name, value = asyncio.run(scenario())
+        self.assertTrue(thread_name.startswith("ce-inference"))
+        self.assertEqual(value, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# RecSys 폴더를 path에 추가 (config.Settings 필수 값은 테스트용 더미)
+recsys_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(recsys_dir))
+for name in ("OPENAI_API_KEY", "SUPABASE_URL", "SUPABASE_KEY"):
+    os.environ.setdefault(name, "test")
+
+from catalog_snapshot import build_snapshot
+from config import EMBED_DIM
+from vector_index import VectorIndex, parse_embedding
+
+
+def unit(*values):
+    vec = np.zeros(EMBED_DIM, dtype=np.float32)
+    vec[:len(values)] = values
+    return vec
+
+
+class TestVectorIndex(unittest.TestCase):
+    def setUp(self):
+        self.products = [
+            {"id": 3, "brand": "설화수", "name": "C"},
+            {"id": 1, "brand": "설화수", "name": "A"},
+            {"id": 2, "brand": "라네즈", "name": "B"},
+            {"id": 4, "brand": "라네즈", "name": "D"},
+        ]
+        embeddings = {1: unit(1, 0), 2: unit(0.8, 0.6), 3: unit(0.6, 0.8), 4: unit(0, 1)}
+        self.vectors = [
+            # pgvector 는 PostgREST 에서 문자열로 반환됨
+            {"product_id": pid, "content": f"content {pid}", "embedding": "[" + ",".join(map(str, vec.tolist())) + "]"}
+            for pid, vec in embeddings.items()
+        ]
+        self.snapshot = build_snapshot(self.products, self.vectors)
+
+    def test_snapshot_columns_follow_id_order(self):
+        self.assertEqual(self.snapshot.ids.tolist(), [1, 2, 3, 4])
+        self.assertEqual(self.snapshot.product(3)["name"], "C")
+        self.assertEqual(self.snapshot.content(2), "content 2")
+        self.assertIsNone(self.snapshot.product(99))
+        self.assertEqual(self.snapshot.index.mode, "exact")
+
+    def test_exact_top_k_matches_rpc_shape_and_order(self):
+        results = self.snapshot.index.search(unit(1, 0), k=3)
+        self.assertEqual([r["product_id"] for r in results], [1, 2, 3])
+        self.assertEqual(set(results[0]), {"product_id", "similarity"})
+        self.assertIsInstance(results[0]["similarity"], float)
+        np.testing.assert_allclose([r["similarity"] for r in results], [1.0, 0.8, 0.6], atol=1e-6)
+
+    def test_brand_filter_searches_only_brand_rows(self):
+        results = self.snapshot.index.search(unit(1, 0), k=5, brands=["라네즈", "없는브랜드"])
+        self.assertEqual([r["product_id"] for r in results], [2, 4])
+        self.assertEqual(self.snapshot.index.search(unit(1, 0), k=5, brands=["없는브랜드"]), [])
+
+    def test_rows_without_valid_embedding_are_not_indexed(self):
+        vectors = self.vectors[:2] + [{"product_id": 3, "content": "c", "embedding": "[1,2]"}]
+        snapshot = build_snapshot(self.products, vectors)
+        self.assertEqual(len(snapshot), 4)
+        self.assertEqual(sorted(snapshot.index.ids), [1, 2])
+        self.assertIsNone(parse_embedding("not json"))
+
+    def test_version_changes_with_embedding(self):
+        vectors = [dict(row) for row in self.vectors]
+        vectors[0]["embedding"] = unit(0.5, 0.5).tolist()
+        self.assertNotEqual(build_snapshot(self.products, vectors).version, self.snapshot.version)
+        self.assertEqual(build_snapshot(self.products, self.vectors).version, self.snapshot.version)
+
+    def test_matches_bruteforce_on_random_matrix(self):
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((200, EMBED_DIM)).astype(np.float32)
+        index = VectorIndex(list(range(200)), matrix, [None] * 200)
+        query = rng.standard_normal(EMBED_DIM).astype(np.float32)
+
+        normalized = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:10]
+        self.assertEqual([r["product_id"] for r in index.search(query, k=10)], expected.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
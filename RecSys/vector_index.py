@@ -0,0 +1,109 @@
+"""
+Local Vector Index
+products_vector.embedding 을 연속된 NumPy 행렬로 보관하여 match_products RPC 없이
+프로세스 내에서 코사인 유사도 상위 후보를 찾습니다.
+
+- 임베딩은 적재 시 L2 정규화 → 내적 = 코사인 유사도
+- 기본은 전수 행렬곱 (Exact), 행 수가 VECTOR_ANN_MIN_ROWS 이상이고 hnswlib 가 설치되어 있으면
+  브랜드 미지정 검색에 HNSW (ANN) 사용
+- 브랜드 필터(filter_brands)는 브랜드별 행 번호 배열로 부분 행렬만 전수 계산
+- 반환 형태는 match_products RPC 결과와 동일 ([{"product_id", "similarity"}])
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import EMBED_DIM, VECTOR_INDEX_DTYPE, VECTOR_ANN_MIN_ROWS, VECTOR_ANN_EF
+
+try:
+    import hnswlib
+except ImportError:  # 선택 의존성: 없으면 항상 Exact 검색
+    hnswlib = None
+
+
+def parse_embedding(value: Any) -> Optional[np.ndarray]:
+    """pgvector 값 (PostgREST 는 '[0.1,0.2,...]' 문자열로 반환) → float32 벡터, 형식이 다르면 None"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    vec = np.asarray(value, dtype=np.float32)
+    if vec.shape != (EMBED_DIM,):
+        return None
+    return vec
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    def __init__(self, ids: Sequence[Any], embeddings: np.ndarray, brands: Sequence[Optional[str]]):
+        """
+        Args:
+            ids: 행 순서 product id
+            embeddings: (행 수, EMBED_DIM) float32 행렬 (정규화 전)
+            brands: 행 순서 브랜드명
+        """
+        self.ids = list(ids)
+        self.matrix = _normalize(embeddings.astype(np.float32)).astype(VECTOR_INDEX_DTYPE)
+        self.brand_rows: Dict[str, np.ndarray] = {}
+        for brand in set(brands):
+            if brand:
+                self.brand_rows[brand] = np.flatnonzero(np.asarray(brands, dtype=object) == brand)
+
+        self.ann = None
+        if hnswlib is not None and len(self.ids) >= VECTOR_ANN_MIN_ROWS:
+            self.ann = hnswlib.Index(space="ip", dim=self.matrix.shape[1])
+            self.ann.init_index(max_elements=len(self.ids), ef_construction=200, M=16)
+            self.ann.add_items(self.matrix.astype(np.float32), np.arange(len(self.ids)))
+            self.ann.set_ef(VECTOR_ANN_EF)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def mode(self) -> str:
+        return "ann" if self.ann is not None else "exact"
+
+    def _top_k(self, query: np.ndarray, rows: Optional[np.ndarray], k: int):
+        """(행 번호, 유사도) 상위 k개 — rows 가 주어지면 해당 행만 계산"""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        scores = (matrix @ query.astype(matrix.dtype)).astype(np.float32)
+        k = min(k, len(scores))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), scores[:0]
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return (top if rows is None else rows[top]), scores[top]
+
+    def search(self, query_embedding: Sequence[float], k: int, brands: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        코사인 유사도 상위 k개 상품
+        Args:
+            brands: 지정 시 해당 브랜드 상품만 검색 (match_products 의 filter_brands)
+        Returns: [{"product_id": ..., "similarity": ...}] (유사도 내림차순)
+        """
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+
+        if brands:
+            parts = [self.brand_rows[b] for b in dict.fromkeys(brands) if b in self.brand_rows]
+            if not parts:
+                return []
+            rows, scores = self._top_k(query, np.concatenate(parts), k)
+        elif self.ann is not None:
+            labels, distances = self.ann.knn_query(query, k=min(k, len(self.ids)))
+            rows, scores = labels[0], 1.0 - distances[0]  # ip 공간 거리 = 1 - 내적
+        else:
+            rows, scores = self._top_k(query, None, k)
+
+        return [
+            {"product_id": self.ids[row], "similarity": float(score)}
+            for row, score in zip(rows, scores)
+        ]
@@ -0,0 +1,119 @@
+"""
+Compliance Repair Node
+Compliance 실패 시 메시지 전체를 재생성하기 전에, LLM이 지적한 위반 표현만 규칙 기반으로 치환/제거합니다.
+
+프로세스:
+1. violated_rules의 violated_expression을 위반 규칙의 allowed_examples 첫 항목으로 치환 (없으면 제거)
+   - 규칙 keywords 전체가 아닌 LLM이 지적한 표현만 대상
+   - 토큰 경계에서만 매칭 ('PAck', 'Spa' 안의 'pa' 등 다른 단어 일부는 치환하지 않음)
+2. 수정된 메시지는 compliance_check로 다시 보내 LLM 재검수 (잘못된 치환은 여기서 걸러짐)
+3. 치환할 표현이 없거나 이미 수정한 메시지가 다시 실패하면 기존 경로(message_writer 재생성)로 진행
+"""
+import re
+from typing import Any, Dict, List, Optional, Pattern
+from actions.compliance_check import GraphState
+
+_QUOTES = "'\"‘’“”"
+_EXTRA_SPACES = re.compile(r"[ \t]{2,}")
+_SPACE_BEFORE_PUNCT = re.compile(r"[ \t]+([,.!?])")
+
+
+def _find_rule(violation: Dict[str, Any], rules: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """LLM이 반환한 위반 항목에 해당하는 규칙 (rule_id 우선, 없으면 rule_title)"""
+    rule_id = violation.get("rule_id")
+    title = violation.get("rule_title")
+    for rule in rules:
+        if rule_id and str(rule.get("id")) == str(rule_id):
+            return rule
+    for rule in rules:
+        if title and rule.get("rule_title") == title:
+            return rule
+    return {}
+
+
+def build_replacement_table(
+    violated_rules: List[Dict[str, Any]],
+    rules: List[Dict[str, Any]]
+) -> Dict[str, str]:
+    """
+    치환표 구성
+    Returns: LLM이 지적한 위반 표현 -> 대체 표현 (빈 문자열이면 제거)
+    """
+    table: Dict[str, str] = {}
+    for violation in violated_rules:
+        expression = (violation.get("violated_expression") or "").strip().strip(_QUOTES).strip()
+        if not expression:
+            continue
+        rule = _find_rule(violation, rules)
+        allowed = [example for example in rule.get("allowed_examples") or [] if example]
+        table.setdefault(expression, allowed[0] if allowed else "")
+    return table
+
+
+def _expression_pattern(expression: str) -> Pattern:
+    """
+    토큰 경계 매칭 패턴
+    앞: 영문/숫자/한글이 아니어야 함, 뒤: 영문/숫자가 아니어야 함 (한글 조사 '미백으로'는 허용)
+    """
+    return re.compile(rf"(?<![0-9A-Za-z가-힣]){re.escape(expression)}(?![0-9A-Za-z])", re.IGNORECASE)
+
+
+def _tidy(message: str) -> str:
+    """제거로 생긴 중복 공백 / 문장부호 앞 공백 정리 (줄바꿈 유지)"""
+    lines = [_SPACE_BEFORE_PUNCT.sub(r"\1", _EXTRA_SPACES.sub(" ", line)).strip() for line in message.split("\n")]
+    return "\n".join(lines)
+
+
+def repair_message(
+    message: str,
+    violated_rules: List[Dict[str, Any]],
+    rules: List[Dict[str, Any]]
+) -> Optional[str]:
+    """
+    위반 표현 치환/제거 (통과 여부는 compliance_check 재검수에서 판단)
+    Returns: 수정된 메시지, 수정 불가(대상 표현 없음/치환 후에도 남음/빈 메시지) 시 None
+    """
+    table = build_replacement_table(violated_rules, rules)
+    # 실제로 메시지에 토큰으로 등장하는 위반 표현만, 긴 표현부터 치환 ('미백 효과'를 '미백'보다 먼저)
+    # (대체 표현이 위반 표현을 포함하면 치환으로 해결되지 않으므로 제외)
+    patterns = {expr: _expression_pattern(expr) for expr in table}
+    targets = sorted(
+        (expr for expr in table
+         if patterns[expr].search(message) and not patterns[expr].search(table[expr])),
+        key=len, reverse=True,
+    )
+    if not targets:
+        return None
+
+    repaired = message
+    for expression in targets:
+        repaired = patterns[expression].sub(table[expression], repaired)
+    repaired = _tidy(repaired)
+
+    if any(patterns[expr].search(repaired) for expr in targets) or not repaired.strip():
+        return None
+    return repaired
+
+
+async def compliance_repair_node(state: GraphState) -> GraphState:
+    """
+    규칙 기반 위반 표현 수정 노드 (LLM 호출 없음)
+    수정 성공 시 compliance_check 재검수, 실패 시 message_writer 재생성으로 진행
+    """
+    message = state.get("message", "")
+    violated_rules = state.get("violated_rules", [])
+    rules = state.get("retrieved_legal_rules", [])
+
+    repaired = repair_message(message, violated_rules, rules)
+    if repaired is None:
+        print("🩹 [Compliance Repair] 규칙 기반 수정 불가 → LLM 재생성으로 진행")
+        return state
+
+    print(f"🩹 [Compliance Repair] {len(violated_rules)}개 위반 표현 치환/제거 → Compliance 재검수")
+    print(f"  - Repaired Message:\n{repaired}")
+
+    state["message"] = repaired
+    state["message_template"] = repaired
+    state["message_candidates"] = []  # 재검수는 수정된 메시지 1건만
+    state["compliance_repaired"] = True
+    return state
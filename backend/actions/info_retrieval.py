@@ -5,9 +5,10 @@ Info Retrieval Node
 from typing import TypedDict, Optional, List
 from models.user import CustomerProfile
 from models.product import Product, ProductCategory, ProductPrice, ProductReview, ProductAnalytics
-import httpx
 import json
 from config import settings
+from services.recsys_client import recsys_client
+from services.config_registry import config_registry
 from actions.orchestrator import GraphState  # [FIX] Import shared GraphState
 
 
@@ -49,13 +50,12 @@ def _convert_dict_to_product(data: dict) -> Optional[Product]:
         return None
 
 
-def get_recommendation_from_api(user_id: str, user_data: CustomerProfile, target_brands: list = [], reason: str = "") -> Optional[Product]:
+async def get_recommendation_from_api(user_id: str, user_data: CustomerProfile, target_brands: list = [], reason: str = "") -> Optional[Product]:
     """
     실제 RecSys API를 호출하여 추천 상품을 가져옵니다.
     실패 시 None 반환.
     """
     try:
-        url = settings.RECSYS_API_URL
         
         payload = {
             "user_id": user_id,
@@ -63,40 +63,36 @@ def get_recommendation_from_api(user_id: str, user_data: CustomerProfile, target
             "intention": reason,
         }
         
-        print(f"🤖 RecSys Request: {url} (user_id={user_id})")
+        print(f"🤖 RecSys Request: {settings.RECSYS_API_URL} (user_id={user_id})")
         
-        # 타임아웃 제거 (RecSys 연산 시간 고려)
-        with httpx.Client(timeout=None) as client:
-            response = client.post(url, json=payload)
-            response.raise_for_status()
+        # 공용 커넥션 풀 사용 (Timeout/Retry는 settings.recsys_* 참고)
+        result = await recsys_client.recommend(payload)
+
+        if result.get("product_data"):
+            p_data = result["product_data"]
+            if not p_data.get('product_id') and result.get('product_id'):
+                p_data['product_id'] = result['product_id']
             
-            result = response.json()
+            # [FIX] Validate category fields before conversion
+            if p_data.get('category'):
+                cat = p_data['category']
+                if isinstance(cat, dict):
+                    cat['major'] = cat.get('major') or '기타'
+                    cat['middle'] = cat.get('middle') or '기타'
+                    cat['small'] = cat.get('small') or '기타'
             
-            if result.get("product_data"):
-                p_data = result["product_data"]
-                if not p_data.get('product_id') and result.get('product_id'):
-                    p_data['product_id'] = result['product_id']
-                
-                # [FIX] Validate category fields before conversion
-                if p_data.get('category'):
-                    cat = p_data['category']
-                    if isinstance(cat, dict):
-                        cat['major'] = cat.get('major') or '기타'
-                        cat['middle'] = cat.get('middle') or '기타'
-                        cat['small'] = cat.get('small') or '기타'
-                
-                print(f"✅ RecSys Success: {p_data.get('name')}")
-                product = _convert_dict_to_product(p_data)
-                
-                if product:
-                    return product
-                else:
-                    print("⚠️ Product conversion failed after RecSys success")
-                    return None
+            print(f"✅ RecSys Success: {p_data.get('name')}")
+            product = _convert_dict_to_product(p_data)
+            
+            if product:
+                return product
             else:
-                print("⚠️ RecSys returned no product_data")
+                print("⚠️ Product conversion failed after RecSys success")
                 return None
-                
+        else:
+            print("⚠️ RecSys returned no product_data")
+            return None
+            
     except Exception as e:
         print(f"❌ RecSys API Failed: {e}")
         import traceback
@@ -104,7 +100,7 @@ def get_recommendation_from_api(user_id: str, user_data: CustomerProfile, target
         return None
 
 
-def info_retrieval_node(state: GraphState) -> GraphState:
+async def info_retrieval_node(state: GraphState) -> GraphState:
     """
     Info Retrieval Node
     
@@ -144,14 +140,14 @@ def info_retrieval_node(state: GraphState) -> GraphState:
         # 1. 상품 식별 (RecSys API 우선, Input ID 차순)
         if recommended_product_id:
             # Input으로 ID가 주어졌다면 해당 상품 조회
-            from services.supabase_client import supabase_client
-            product_data_raw = supabase_client.get_product(recommended_product_id)
+            from services.product_cache import product_cache
+            product_data_raw = await product_cache.aget_product(recommended_product_id)
             
             recommended_product = convert_db_to_product_model(product_data_raw)
           
         else:
             # ID가 없으면 RecSys API 호출
-            recommended_product = call_recsys_api(user_data, recommended_brand, intent)
+            recommended_product = await call_recsys_api(user_data, recommended_brand, intent)
         
         # 새로 조회된 경우 Brand Name 추출
         if recommended_product:
@@ -243,49 +239,16 @@ def info_retrieval_node(state: GraphState) -> GraphState:
 
 
 def get_brand_tone_from_guideline(brand_name_en: str) -> dict:
-    """CRM Guideline JSON에서 브랜드 톤앤매너 조회"""
-    import json
-    import os
-    
-    # 1. JSON 로드
-    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    json_path = os.path.join(base_path, "services", "crm_guideline.json")
-    
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            guidelines = json.load(f)
-    except Exception as e:
-        print(f"Error loading crm_guideline.json: {e}")
-        return None
-
-    # 2. 브랜드명 매핑 (Eng -> Kor)
-    # 실제 환경에서는 별도 매핑 테이블 관리 권장
-    brand_mapping = {
-        "Sulwhasoo": "설화수",
-        "Hera": "헤라",
-        "Laneige": "라네즈",
-        "Mamonde": "마몽드",
-        "IOPE": "아이오페",
-        "Hannul": "한율", 
-        "Hanyul": "한율",
-        "Espoir": "에스쁘아",
-        "Etude": "에뛰드",
-        "Innisfree": "이니스프리",
-        "Aestura": "에스트라",
-        "Primera": "프리메라"
-    }
-    
-    brand_name_kor = brand_mapping.get(brand_name_en, brand_name_en) # 매핑 없으면 그대로 사용 (혹시 한글일 수도 있음)
-    
-    # 3. 데이터 추출
-    brands_data = guidelines.get("brands", {})
-    target_brand = brands_data.get(brand_name_kor)
+    """CRM Guideline에서 브랜드 톤앤매너 조회 (Config Registry 메모리 조회)"""
+    # 브랜드명 매핑 (Eng -> Kor)은 Registry가 처리, 매핑 없으면 그대로 사용 (혹시 한글일 수도 있음)
+    brand_guideline = config_registry.get_brand_guideline(brand_name_en)
     
-    if target_brand:
+    if brand_guideline:
+        target_brand, _ = brand_guideline
         return {
-            "brand_name": brand_name_kor,
-            "tone_manner_style": target_brand.get("tone_manner_style", "Professional"), # 기본값
-            "tone_manner_examples": target_brand.get("tone_manner_examples", [])
+            "brand_name": config_registry.resolve_brand_name(brand_name_en),
+            "tone_manner_style": target_brand.tone_manner_style,
+            "tone_manner_examples": target_brand.tone_manner_examples
         }
     
     return None
@@ -326,7 +289,7 @@ def convert_db_to_product_model(db_data: dict):
     )
 
 
-def call_recsys_api(user_data, target_brand: str = "", intent: str = ""):
+async def call_recsys_api(user_data, target_brand: str = "", intent: str = ""):
     """
     RecSys API를 호출하여 상품 추천 받기
     
@@ -359,10 +322,7 @@ def call_recsys_api(user_data, target_brand: str = "", intent: str = ""):
         
         print(f"[RecSys API] Calling {recsys_url} with intent={intent}, brand={target_brand}")
         
-        with httpx.Client(timeout=None) as client:
-            response = client.post(recsys_url, json=payload)
-            response.raise_for_status()
-            result = response.json()
+        result = await recsys_client.recommend(payload)
         
         print(f"[RecSys API] Success: {result.get('product_name')} (ID: {result.get('product_id')})")
         
@@ -3,7 +3,10 @@ Message Writer Node
 OpenAI GPT-5 API를 사용한 메시지 생성
 """
 from typing import TypedDict
+from langgraph.config import get_stream_writer
 from services.llm_client import llm_client
+from services.config_registry import config_registry
+from config import settings
 from models.user import CustomerProfile
 
 class GraphState(TypedDict):
@@ -28,16 +31,16 @@ class GraphState(TypedDict):
     target_brand: str
     target_persona: str
     recommended_brand: str
+    stream_tokens: bool  # /message/stream 요청 여부 (토큰 스트리밍)
+    message_candidates: list  # 후보 메시지 (writer_candidate_count > 1, Compliance에서 병렬 검수)
+    compliance_repaired: bool  # 현재 메시지가 Compliance Repair 결과인지 (새로 생성하면 False)
 
 
-def message_writer_node(state: GraphState) -> GraphState:
+async def message_writer_node(state: GraphState) -> GraphState:
     """
     Message Writer Node with history reuse
     OpenAI GPT API를 호출하여 개인화된 메시지를 생성합니다.
     """
-    import json
-    import os
-
     user_data = state["user_data"]
     product_data = state["product_data"]
     brand_tone = state["brand_tone"]
@@ -58,42 +61,30 @@ def message_writer_node(state: GraphState) -> GraphState:
         
     weather = weather_detail if intent in ["날씨", "weather"] else ""
     
-    # Load Persona DB
-    base_path = os.path.dirname(os.path.dirname(__file__))
-    persona_db_path = os.path.join(base_path, "actions/persona_db.json")
-    try:
-        with open(persona_db_path, "r", encoding="utf-8") as f:
-            persona_db = json.load(f)
-    except FileNotFoundError:
-        persona_db = {}
-
-    target_persona_data = persona_db.get(str(target_pid), {
-        "persona_name": "Trend Setter", "description": "트렌드 민감", "tone": "트렌디", "keywords": []
-    })
+    # Load Persona / Brand Guidelines (Config Registry 메모리 조회, 디스크 I/O 없음)
+    persona = config_registry.get_persona(target_pid)
+    if persona is not None:
+        target_persona_data = persona.model_dump()
+    else:
+        target_persona_data = {
+            "persona_name": "Trend Setter", "description": "트렌드 민감", "tone": "트렌디", "keywords": []
+        }
     persona_name = target_persona_data['persona_name']
     
     # [Cache Logic Removed: Moved to retrieve_crm_node]
 
-    # 2. 설정 파일 로드 (Brand Guidelines)
-    guideline_path = os.path.join(base_path, "services/crm_guideline.json")
-    try:
-        with open(guideline_path, "r", encoding="utf-8") as f:
-            crm_guidelines = json.load(f)
-    except FileNotFoundError:
-        crm_guidelines = {"brands": {}, "groups": {}}
-
     # [Sender: Brand Persona]
-    if brand_name in crm_guidelines["brands"]:
-        brand_cfg = crm_guidelines["brands"][brand_name]
-        group_cfg = crm_guidelines["groups"][brand_cfg["group"]]
+    brand_guideline = config_registry.get_brand_guideline(brand_name)
+    if brand_guideline:
+        brand_cfg, group_cfg = brand_guideline
         
         sender_context = f"""
 [1. 화자: 브랜드 페르소나 (Sender)]
-- 브랜드: {brand_name} (Group: {brand_cfg['group']})
-- 톤앤매너: {group_cfg['tone']}
-- 핵심 전략: {brand_cfg['focus']}
+- 브랜드: {brand_name} (Group: {brand_cfg.group})
+- 톤앤매너: {group_cfg.tone}
+- 핵심 전략: {brand_cfg.focus}
 - 작성 원칙:
-{chr(10).join(['  - ' + r for r in group_cfg['rules']])}
+{chr(10).join(['  - ' + r for r in group_cfg.rules])}
 """
     else:
         # Fallback
@@ -236,18 +227,52 @@ def message_writer_node(state: GraphState) -> GraphState:
 - 고객 이름은 반드시 `{{customer_name}}` 플레이스홀더를 사용하세요. (실사용 시 치환됨)
 """
     
+    # 이전 시도의 후보가 남지 않도록 먼저 비움 (생성 중 예외 포함)
+    state["message_candidates"] = []
+
     try:
         # 5. LLM 호출
-        result = llm_client.generate_chat_completion(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=ch_cfg['body_token_limit'] + 100 # [NEW] Max Output Tokens Control
-        )
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        max_tokens = ch_cfg['body_token_limit'] + 100 # [NEW] Max Output Tokens Control
+
+        candidates = []  # 후보 모드가 아니면 비어 있음
+        if state.get("stream_tokens"):
+            # [Streaming] /message/stream 요청: 생성 토큰을 custom 스트림 이벤트로 즉시 전달
+            stream_writer = get_stream_writer()
+            attempt = state.get("retry_count", 0)
+            result = await llm_client.astream_chat_completion(
+                messages=messages,
+                temperature=0.7,
+                max_tokens=max_tokens,
+                on_token=lambda token: stream_writer({"type": "token", "attempt": attempt, "text": token}),
+            )
+        elif settings.writer_candidate_count > 1 and not settings.compliance_bypass:
+            # [Candidates] 한 번의 호출로 후보 N개 생성 → Compliance에서 병렬 검수 후 통과한 첫 후보 채택
+            # (Bypass 모드는 검수 없이 첫 메시지를 쓰므로 후보 생성 비용을 쓰지 않음)
+            result = await llm_client.agenerate_chat_candidates(
+                messages=messages,
+                n=settings.writer_candidate_count,
+                temperature=0.7,
+                max_tokens=max_tokens,
+            )
+            candidates = result["contents"]
+            if not candidates:
+                raise ValueError("후보 메시지가 모두 비어 있습니다.")
+            result["content"] = candidates[0]
+            print(f"📝 Generated {len(candidates)} Candidates")
+        else:
+            result = await llm_client.agenerate_chat_completion(
+                messages=messages,
+                temperature=0.7,
+                max_tokens=max_tokens,
+            )
         
         generated_message = result["content"]
+        state["message_candidates"] = candidates
+        state["compliance_repaired"] = False
         print("📝 Generated Message (Template):\n", generated_message)
         usage = result["usage"]
         
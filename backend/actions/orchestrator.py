@@ -2,18 +2,16 @@
 Orchestrator Node
 고객 데이터를 분석하고 메시지 생성 전략 수립
 """
-import json
-import os
-import random
-from pathlib import Path
 from datetime import datetime, timedelta
-from typing import TypedDict, List, Set
+from typing import Any, TypedDict, List, Set, Mapping
 from collections import Counter
 from models.user import CustomerProfile
 from models.persona import Persona
 
 
-from services.supabase_client import supabase_client
+from config import settings
+from services.config_registry import config_registry
+from services.persona_stats_service import persona_stats_service
 
 # [Translation Maps] DB(Eng) -> User(Kor)
 # 1. Skin Type
@@ -99,6 +97,11 @@ class GraphState(TypedDict):
     error_reason: str  # Compliance 실패 이유
     success: bool  # API 응답용
     retrieved_legal_rules: list  # 캐싱용: Compliance 노드에서 한 번 검색한 규칙 재사용
+    stream_tokens: bool  # /message/stream 요청 여부 (Writer 토큰 스트리밍)
+    flight_key: str  # Single Flight Leader인 경우 생성 중인 signature (결과 공유용)
+    flight_future: Any  # join에서 받은 Leader Future (자신의 flight만 resolve)
+    message_candidates: list  # Writer 후보 메시지 (writer_candidate_count > 1)
+    compliance_repaired: bool  # 현재 메시지가 Compliance Repair 결과인지 (Repair는 메시지당 1회)
 
 
 def orchestrator_node(state: GraphState) -> GraphState:
@@ -140,7 +143,8 @@ def orchestrator_node(state: GraphState) -> GraphState:
     if target_brand=="":
         print("⚠️ Target Brand is empty, using DB-based recommendation logic.")
         # [DB Query] Mock 대신 실제 DB 데이터 사용 (user_data 필터링 추가)
-        recent_brands, similar_user_ids = get_persona_recent_brands(target_persona, user_data)
+        recent_brands = get_persona_recent_brands(target_persona)
+        similar_user_ids = get_similar_user_ids(target_persona, user_data)
         recommended_brand = determine_recommended_brand(target_persona, recent_brands)
     else:
         recommended_brand = [target_brand]
@@ -161,110 +165,48 @@ def orchestrator_node(state: GraphState) -> GraphState:
 
 
 
-def get_persona_recent_brands(personatype: str, target_user: CustomerProfile) -> List[str]:
+def get_persona_recent_brands(personatype: str) -> Counter:
     """
-    Supabase 'customers' 테이블에서 
-    1) 해당 페르소나(persona_id)를 가지고
-    2) 랜덤하게 샘플링한 사용자들의 'brand_purchases' 데이터를 조회하여 통합 반환합니다.
+    해당 페르소나(persona_id) 전체 사용자의 'brand_purchases' 빈도 집계를 반환합니다.
+    persona_stats_service가 주기적으로 갱신하는 메모리 집계를 조회하므로 DB 호출이 없습니다.
     """
-    try:
-        # P 접두사 제거
-        target_p = str(personatype)
-        print(f"\n🔎 [DB] Fetching users for persona: {target_p}")
-        
-        # [STEP 1] count 쿼리는 타임아웃 문제로 제거, 랜덤 offset 범위 사용
-        # 페르소나당 대략 20,000~40,000명 정도 있다고 가정
-        max_offset = 30000  # 충분히 큰 offset 범위
-        random_offset = random.randint(0, max_offset)
-        print(f"🎲 Random offset: {random_offset}")
-        
-        # [STEP 2] 랜덤 offset부터 1000개 가져오기 (프로필 데이터 포함)
-        query = supabase_client.client.table("user_data").select(
-            "user_id, brand_purchases, skin_type, skin_concerns, preferred_tone, keywords"
-        ).eq("persona_id", target_p).range(random_offset, random_offset + 999)
-        
-        # Execute
-        resp = query.execute()
-        
-        print(f"📊 DB Query returned {len(resp.data)} users")
-            
-        if not resp.data:
-            print(f"⚠️ No users found for persona '{target_p}'.")
-            return [], []  # [FIX] 2개 값 반환
-        
-        print(f"✅ Fetched {len(resp.data)} random users from persona '{target_p}'")
-        
-        # [NEW] 유사 프로필 검사
-        print(f"\n🔍 Checking for similar profiles...")
-        print(f"🎯 Target User: {target_user.user_id}")
-        print(f"   - skin_type: {target_user.skin_type}")
-        print(f"   - skin_concerns: {target_user.skin_concerns}")
-        print(f"   - preferred_tone: {target_user.preferred_tone}")
-        print(f"   - keywords: {target_user.keywords}")
-        
-        similar_count = 0
-        exact_match_count = 0
-        similar_user_ids = []  # [NEW] 유사 유저 ID 저장
-        
-        # 브랜드 추출 및 유사도 검사
-        all_brands = []
-        for row in resp.data:
-            # Skip self
-            if row.get("user_id") == target_user.user_id:
-                continue
-            
-            # [NEW] 프로필 유사도 검사
-            db_skin_type = set([row.get("skin_type")]) if isinstance(row.get("skin_type"), str) else set(row.get("skin_type", []))
-            db_concerns_raw = row.get("skin_concerns", [])
-            db_concerns = set(db_concerns_raw) if isinstance(db_concerns_raw, list) else set([c.strip() for c in db_concerns_raw.split(",") if c.strip()])
-            db_tone = row.get("preferred_tone", "")
-            db_keywords = set(row.get("keywords", []))
-            
-            user_skin_type = set(target_user.skin_type)
-            user_concerns = set(target_user.skin_concerns)
-            user_keywords = set(target_user.keywords)
-            
-            # 완전 일치 검사
-            if (db_skin_type == user_skin_type and 
-                db_concerns == user_concerns and 
-                db_tone == target_user.preferred_tone and 
-                db_keywords == user_keywords):
-                exact_match_count += 1
-                similar_user_ids.append(row.get('user_id'))  # [NEW] ID 저장
-                print(f"   ✅ EXACT MATCH: {row.get('user_id')}")
-            
-            # 부분 일치 검사 (skin_type + tone 일치)
-            elif (db_skin_type == user_skin_type and db_tone == target_user.preferred_tone):
-                similar_count += 1
-                similar_user_ids.append(row.get('user_id'))  # [NEW] ID 저장
-                
-            purchases = row.get("brand_purchases", [])
-            if isinstance(purchases, list):
-                all_brands.extend(purchases)
-            elif isinstance(purchases, str):
-                all_brands.extend([b.strip() for b in purchases.split(",") if b.strip()])
-        
-        # 중복 제거 및 빈 값 제거
-        all_brands = [b for b in all_brands if b]
-        
-        print(f"\n📊 Similarity Check Results:")
-        print(f"   - Total checked: {len(resp.data)} users")
-        print(f"   - 🎯 Exact matches (all 4 attributes): {exact_match_count}")
-        print(f"   - 🔹 Partial matches (skin_type + tone): {similar_count}")
-        print(f"   - 📦 Total brand purchases collected: {len(all_brands)}")
-        print(f"   - Sample brands: {all_brands[:10]}...")
-        print(f"   - 👥 Similar user IDs (first 10): {similar_user_ids[:10]}")
-        
-        return all_brands, similar_user_ids  # [NEW] 유사 유저 ID도 반환
+    brand_counts = persona_stats_service.get_brand_counts(str(personatype))
+    print(f"📦 [Persona Stats] persona '{personatype}': {len(brand_counts)} brands, {sum(brand_counts.values())} purchases")
+    return brand_counts
 
-    except Exception as e:
-        print(f"❌ Error fetching brands from DB: {e}")
-        import traceback
-        traceback.print_exc()
-        return [], []  # [FIX] 2개 값 반환
+
+def get_similar_user_ids(personatype: str, target_user: CustomerProfile) -> List[str]:
+    """
+    같은 페르소나(persona_id) 내에서 타겟 고객과 프로필이 유사한 사용자 ID를 반환합니다.
+    - 완전 일치: skin_type, skin_concerns, preferred_tone, keywords 모두 일치
+    - 부분 일치: skin_type + preferred_tone 일치
+    persona_stats_service의 프로필 시그니처 역색인을 조회하므로 DB 호출 없이 O(매칭 수)입니다.
+    """
+    target_p = str(personatype)
+    print(f"\n🔍 Looking up similar profiles for persona '{target_p}'...")
+    print(f"🎯 Target User: {target_user.user_id}")
+    print(f"   - skin_type: {target_user.skin_type}")
+    print(f"   - skin_concerns: {target_user.skin_concerns}")
+    print(f"   - preferred_tone: {target_user.preferred_tone}")
+    print(f"   - keywords: {target_user.keywords}")
+
+    profile = (target_user.skin_type, target_user.skin_concerns, target_user.preferred_tone, target_user.keywords)
+    similar_user_ids = persona_stats_service.find_similar_users(
+        target_p, *profile,
+        exclude_user_id=target_user.user_id,
+        limit=settings.similar_users_limit,
+    )
+    exact_count, partial_bucket = persona_stats_service.count_similar_users(target_p, *profile)
+
+    print(f"\n📊 Similarity Lookup Results:")
+    print(f"   - 🎯 Exact matches (all 4 attributes): {exact_count}")
+    print(f"   - 🔹 skin_type + tone bucket size: {partial_bucket}")
+    print(f"   - 👥 Similar user IDs (first 10): {similar_user_ids[:10]}")
+
+    return similar_user_ids
 
 
-def determine_recommended_brand(personatype: int, recent_brands: List[str]) -> List[str]:
+def determine_recommended_brand(personatype: int, recent_brands: Mapping[str, int]) -> List[str]:
     """
     페르소나 적합도와 최근 이용 빈도를 기반으로 브랜드 랭킹을 산정합니다.
     
@@ -274,47 +216,30 @@ def determine_recommended_brand(personatype: int, recent_brands: List[str]) -> L
     
     Args:
         personatype: 전략 케이스 번호 (1-5)
-        recent_brands: 최근 이용 브랜드 리스트 (중복 포함, 빈도 계산용)
+        recent_brands: 페르소나 브랜드 구매 빈도 (brand -> count, 리스트를 넘기면 빈도로 변환)
         
     Returns:
-        점수순으로 정렬된 추천 브랜드 리스트
+        점수순으로 정렬된 추천 브랜드 리스트 (동점은 브랜드명 순, 항상 같은 결과)
     """
     try:
         print(f"\n🕵️ [Determine Brand] Starting...")
         print(f"  Input - Persona: {personatype} (type: {type(personatype)})")
-        print(f"  Input - Recent Brands Count: {len(recent_brands)}")
-        print(f"  Input - Recent Brands: {recent_brands[:5]}..." if len(recent_brands) > 5 else f"  Input - Recent Brands: {recent_brands}")
+        recent_counts = Counter(recent_brands)
+        print(f"  Input - Recent Brands Count: {sum(recent_counts.values())}")
 
-        # 현재 파일(orchestrator.py)이 있는 위치 기준 (Relative Path)
-        current_dir = Path(__file__).parent
-        json_path = current_dir / "persona_db.json"
-        
-        if not json_path.exists():
-            print(f"❌ Error: Persona DB file not found at {json_path}")
-            return ["이니스프리"]
-            
-        with open(json_path, "r", encoding="utf-8") as f:
-            persona_db = json.load(f)
-        
-        print(f"✅ Persona DB loaded. Available keys: {list(persona_db.keys())}")
-            
-        # 1. 타겟 페르소나 브랜드 식별
-        key = str(personatype)
-        if key.lower().startswith('p'):
-            key = key[1:]
-        
+        # 1. 타겟 페르소나 브랜드 식별 (Config Registry 메모리 조회)
+        key = config_registry.normalize_persona_id(personatype)
         print(f"  Looking up persona key: '{key}'")
         
-        if key not in persona_db:
+        persona = config_registry.get_persona(key)
+        if persona is None:
             print(f"❌ Error: Persona '{key}' not found in DB!")
-            print(f"  Available personas: {list(persona_db.keys())}")
+            print(f"  Available personas: {config_registry.persona_ids()}")
             return ["이니스프리"]
         
-        target_brands = set(persona_db[key].get("recommended_brands", []))
+        target_brands = set(persona.recommended_brands)
         print(f"  ✅ Persona '{key}' found. Recommended brands: {target_brands}")
             
-        # 2. 최근 이용 브랜드 빈도 계산
-        recent_counts = Counter(recent_brands)
         print(f"  Recent brand frequencies: {dict(recent_counts.most_common(5))}")
         
         # 3. 랭킹 후보군 선정 (페르소나 브랜드 + 최근 이용 브랜드)
@@ -340,8 +265,8 @@ def determine_recommended_brand(personatype: int, recent_brands: List[str]) -> L
             
             scored_brands.append((brand, score))
             
-        # 5. 점수 내림차순 정렬
-        scored_brands.sort(key=lambda x: x[1], reverse=True)
+        # 5. 점수 내림차순 정렬 (동점은 브랜드명 순)
+        scored_brands.sort(key=lambda x: (-x[1], x[0]))
         
         # 6. 최고 점수 브랜드들 추출 (동점자 처리)
         if not scored_brands:
@@ -2,8 +2,11 @@ import json
 from typing import Dict, Any
 from actions.orchestrator import GraphState
 from services.crm_history_service import crm_history_service
+from services.semantic_cache import semantic_crm_cache
+from services.metrics import record_cache
+from config import settings
 
-def retrieve_crm_node(state: GraphState) -> GraphState:
+async def retrieve_crm_node(state: GraphState) -> GraphState:
     """
     CRM Cache Retrieval Node
     메시지 생성 전, 동일 조건의 과거 성공 메시지가 있는지 확인합니다.
@@ -50,7 +53,7 @@ def retrieve_crm_node(state: GraphState) -> GraphState:
         }
 
         # 3. Check Cache
-        cached_msg = crm_history_service.find_message(
+        cache_key = dict(
             brand=product_info["brand"],
             persona=str(target_pid),
             intent=crm_reason,
@@ -59,6 +62,32 @@ def retrieve_crm_node(state: GraphState) -> GraphState:
             channel=channel,
             beauty_profile=beauty_profile
         )
+        cached_msg = await crm_history_service.afind_message(**cache_key)
+        semantic_hit = False
+
+        if cached_msg:
+            # Exact Hit 템플릿도 유사도 인덱스에 반영 (Semantic Cache 비활성 시 No-op)
+            await semantic_crm_cache.add(**cache_key, message_content=cached_msg)
+        else:
+            # 3-1. [Optional] 유사 조건 템플릿 검색
+            cached_msg = await semantic_crm_cache.lookup(**cache_key)
+            semantic_hit = cached_msg is not None
+
+        if not cached_msg:
+            # 3-2. [Single Flight] 같은 signature를 생성 중인 요청이 있으면 LLM 호출 없이 그 결과를 공유
+            flight_key = crm_history_service._generate_signature(**cache_key)
+            flights = crm_history_service.generation_flights
+            flight_future = flights.join(flight_key)
+            if flight_future is not None:
+                # Leader: save_crm / return_response에서 resolve (중단 시 api의 leader_scope에서 None으로 정리)
+                state["flight_key"] = flight_key
+                state["flight_future"] = flight_future
+            else:
+                print(f"⏳ [Retrieve CRM] Same signature in flight (sig={flight_key[:8]}...). Waiting for leader...")
+                cached_msg = await flights.wait(flight_key, settings.generation_flight_timeout)
+                record_cache("crm_single_flight", cached_msg is not None)
+                if not cached_msg:
+                    print("⚠️ [Retrieve CRM] Leader failed or timed out. Generating independently.")
         
         if cached_msg:
             print(f"✅ [Retrieve CRM] Cache Hit! Using cached template.")
@@ -68,7 +97,8 @@ def retrieve_crm_node(state: GraphState) -> GraphState:
             final_msg = cached_msg
             
             # [NEW] Add Notice Prefix
-            notice = "━━━━━━━━━━━━━━━━━━━━━━━━\n📢 **시스템 알림**: 과거 동일한 조건의 생성 이력이 있어, 저장된 메시지를 불러옵니다.\n━━━━━━━━━━━━━━━━━━━━━━━━\n\n\n"
+            condition = "유사한" if semantic_hit else "동일한"
+            notice = f"━━━━━━━━━━━━━━━━━━━━━━━━\n📢 **시스템 알림**: 과거 {condition} 조건의 생성 이력이 있어, 저장된 메시지를 불러옵니다.\n━━━━━━━━━━━━━━━━━━━━━━━━\n\n\n"
             final_msg = notice + final_msg
             
             # [FIX] Update state directly to preserve all keys (including similar_user_ids)
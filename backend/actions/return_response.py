@@ -9,13 +9,8 @@ from typing import TypedDict
 from models.user import CustomerProfile
 from models.message import GeneratedMessage, MessageResponse
 from actions.orchestrator import GraphState  # [FIX] Import shared GraphState
-
-
-def _load_fallback_messages():
-    """Fallback 메시지 JSON 파일 로드"""
-    json_path = os.path.join(os.path.dirname(__file__), "..", "services", "fallback_messages.json")
-    with open(json_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+from services.config_registry import config_registry
+from services.crm_history_service import crm_history_service
 
 
 def _get_brand_fallback_message(brand_name: str, channel: str, customer_name: str) -> str:
@@ -31,19 +26,19 @@ def _get_brand_fallback_message(brand_name: str, channel: str, customer_name: st
         브랜드 톤앤매너가 반영된 Fallback 메시지
     """
     try:
-        fallback_data = _load_fallback_messages()
-        brand_messages = fallback_data.get("fallback_messages", {}).get(brand_name)
+        # Config Registry 메모리 조회 (요청마다 JSON 파일을 읽지 않음)
+        brand_messages = config_registry.get_brand_fallback(brand_name)
         
         if not brand_messages:
             # 브랜드가 없으면 기본 메시지
             return f"{customer_name}님, 특별한 혜택을 준비했습니다. 자세한 내용은 앱에서 확인해주세요."
         
         # 채널별 메시지가 있으면 사용, 없으면 safe_messages 중 랜덤 선택
-        channel_variants = brand_messages.get("channel_variants", {})
+        channel_variants = brand_messages.channel_variants
         if channel in channel_variants:
             message_template = channel_variants[channel]
         else:
-            safe_messages = brand_messages.get("safe_messages", [])
+            safe_messages = brand_messages.safe_messages
             if safe_messages:
                 message_template = random.choice(safe_messages)
             else:
@@ -80,6 +75,11 @@ def return_response_node(state: GraphState) -> dict:
     print(f"🔍 state['message'] preview (first 150 chars):\n{current_message[:150]}")
     print("="*80 + "\n")
     
+    # Single Flight Leader가 저장 없이 끝난 경우(Compliance 실패 등) 대기 중인 요청을 해제
+    # (save_crm에서 이미 resolve된 경우 No-op)
+    if state.get("flight_key"):
+        crm_history_service.generation_flights.resolve(state["flight_key"], None, state.get("flight_future"))
+
     # 고객 이름 추출 (이름이 없는 경우 '00' 사용)
     customer_name = getattr(state['user_data'], 'name', '00')
     
@@ -4,8 +4,9 @@ import os
 from typing import Dict, Any
 from actions.orchestrator import GraphState
 from services.crm_history_service import crm_history_service
+from services.semantic_cache import semantic_crm_cache
 
-def save_crm_message_node(state: GraphState) -> GraphState:
+async def save_crm_message_node(state: GraphState) -> GraphState:
     """
     CRM 메시지 저장 Node
     Compliance Check를 통과한 메시지를 CRM History에 영구 저장합니다.
@@ -37,7 +38,7 @@ def save_crm_message_node(state: GraphState) -> GraphState:
         msg_content = state.get("message_template") or state["message"]
         
         # 5. Call Service to Save
-        crm_history_service.save_message(
+        cache_key = dict(
             brand=product_info.get("brand", "Unknown"),
             persona=str(target_pid),  # Modified: Save as ID instead of Name
             intent=state.get("crm_reason", "regular"),
@@ -45,8 +46,13 @@ def save_crm_message_node(state: GraphState) -> GraphState:
             product_name=product_info.get("name", "상품"),
             channel=channel,
             beauty_profile=beauty_profile,
-            message_content=msg_content
         )
+        await crm_history_service.asave_message(**cache_key, message_content=msg_content)
+        # 같은 signature를 기다리는 요청들에게 템플릿 전달 (Single Flight Leader인 경우)
+        if state.get("flight_key"):
+            crm_history_service.generation_flights.resolve(state["flight_key"], msg_content, state.get("flight_future"))
+        # 유사 조건 재사용 인덱스에도 추가 (Semantic Cache 비활성 시 No-op)
+        await semantic_crm_cache.add(**cache_key, message_content=msg_content)
         print("✅ Message successfully saved to CRM History.")
         
     except Exception as e:
@@ -1,19 +1,125 @@
 """
 backend/api/message.py
-[Hybrid Mode] 
+[Hybrid Mode]
 - 상황 정보: 프론트엔드에서 수신
 - 고객 정보: 백엔드가 Supabase DB에서 직접 조회 (Fixed Logic)
 """
+import asyncio
+import json
 from fastapi import APIRouter, Header, HTTPException, Query, Body
-from models.message import MessageResponse, ErrorResponse, MessageRequest
+from fastapi.responses import StreamingResponse
+from models.message import MessageResponse, ErrorResponse, MessageRequest, BatchMessageRequest
+from models.user import CustomerProfile
 from services.supabase_client import supabase_client
 from services.user_service import get_customer_from_db, get_customer_list
+from services.crm_history_service import crm_history_service
 from graph import message_workflow
-from typing import Optional
+from config import settings
+from typing import Optional, List, Dict, Any, AsyncIterator
 import traceback
 
 router = APIRouter()
 
+
+def _build_customer_profile(db_user: Optional[Dict[str, Any]]) -> Optional[CustomerProfile]:
+    """
+    DB Dict -> CustomerProfile 변환
+    사용자 요청에 따라 필수 4요소(피부타입, 고민, 톤, 키워드) 위주로 구성하고 나머지는 자동 처리
+    """
+    if not db_user:
+        return None
+
+    try:
+        return CustomerProfile(
+            user_id=db_user.get("user_id"),
+            name="00",  # 항상 '00'으로 고정
+            age_group=db_user.get("age_group", "Unknown"),
+            membership_level=db_user.get("membership_level", "General"),
+
+            # [Core Elements] 사용자가 지정한 핵심 4요소
+            skin_type=db_user.get("skin_type", []),
+            skin_concerns=db_user.get("skin_concerns", []),
+            preferred_tone=db_user.get("preferred_tone"),
+            keywords=db_user.get("keywords", []),
+
+            # 나머지 필드는 모델 정의에서 Optional이나 Default가 있으므로 생략 가능
+        )
+    except Exception as e:
+        print(f"Error converting DB user data: {e}")
+        return None
+
+
+def _build_initial_state(request: MessageRequest, customer: CustomerProfile) -> Dict[str, Any]:
+    """MessageRequest + 고객 프로필로 LangGraph 초기 State 구성"""
+    return {
+        "user_id": request.userId,
+        "user_data": customer,
+        "channel": request.channel or "SMS",
+
+        # GraphState keys
+        "crm_reason": request.intention or "신제품 출시 이벤트",
+        "weather_detail": request.weatherDetail or "좋은 날씨",
+        "target_brand": request.targetBrand or "",
+        "target_persona": request.persona.replace("P", "") if request.persona and request.persona.startswith("P") else (request.persona or "1"),
+
+        # Logic context
+        "season": request.season or "계절 무관",
+        "brand_name": request.targetBrand or "",
+        "persona_name": request.persona or "1",
+
+        # Output placeholders
+        "message": "",
+        "compliance_passed": False,
+        "retry_count": 0,
+        "error": "",
+        "success": False,
+        "retrieved_legal_rules": [],
+        "product_data": {},  # Initialize to avoid KeyError in nodes
+        "similar_user_ids": [],  # [FIX] 초기화 추가
+        "flight_key": "",
+        "flight_future": None,
+        "message_candidates": [],
+        "compliance_repaired": False,
+    }
+
+
+def _load_customer_for_request(request: MessageRequest) -> CustomerProfile:
+    """
+    단건 메시지 요청 공통 사전 처리 (중복 발송 확인 + 고객 조회)
+    실패 시 HTTPException(409/404)을 발생시킵니다.
+    """
+    # 0. Deduplication Check (중복 방지)
+    # 특정 브랜드에 대해 최근 24시간 내에 발송된 메시지가 있는지 확인
+    if request.targetBrand:
+        recent_msgs = supabase_client.get_recent_messages(request.userId, days=1)
+        for msg in recent_msgs:
+            # 브랜드가 일치하고, (옵션) 성공한 메시지인 경우
+            if msg.get('brand_name') == request.targetBrand:
+                print(f"🚫 Duplicate message blocked for User {request.userId}, Brand {request.targetBrand}")
+                # 프론트엔드에서 처리하기 쉽도록 429 Too Many Requests 또는 409 Conflict 반환
+                # 여기서는 409 Conflict 사용
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"최근 24시간 내에 '{request.targetBrand}' 브랜드에 대한 메시지가 이미 생성되었습니다."
+                )
+
+    # 1. 고객 데이터 조회 (Supabase -> Fallback to Mock)
+    db_user = supabase_client.get_user(request.userId)
+    print(f"🧐 Fetching user data for ID: {request.userId}")
+
+    customer = _build_customer_profile(db_user)
+
+    # Fallback 없음: DB 실패 시 에러 처리
+    if not customer:
+        print(f"User '{request.userId}' not found in DB.")
+        raise HTTPException(
+            status_code=404,
+            detail=f"고객 ID '{request.userId}'를 찾을 수 없습니다."
+        )
+
+    return customer
+
+
 @router.get(
     "/customers",
     summary="고객 목록 조회",
@@ -42,60 +148,8 @@ async def generate_message(
     """
     개인화 메시지 생성 API
     """
-    # 0. Deduplication Check (중복 방지)
-    # 특정 브랜드에 대해 최근 24시간 내에 발송된 메시지가 있는지 확인
-    if request.targetBrand:
-        recent_msgs = supabase_client.get_recent_messages(request.userId, days=1)
-        for msg in recent_msgs:
-            # 브랜드가 일치하고, (옵션) 성공한 메시지인 경우
-            if msg.get('brand_name') == request.targetBrand:
-                print(f"🚫 Duplicate message blocked for User {request.userId}, Brand {request.targetBrand}")
-                # 프론트엔드에서 처리하기 쉽도록 429 Too Many Requests 또는 409 Conflict 반환
-                # 여기서는 409 Conflict 사용
-                raise HTTPException(
-                    status_code=409, 
-                    detail=f"최근 24시간 내에 '{request.targetBrand}' 브랜드에 대한 메시지가 이미 생성되었습니다."
-                )
-
-    # 1. 고객 데이터 조회 (Supabase -> Fallback to Mock)
-    db_user = supabase_client.get_user(request.userId)  
-    print(f"🧐 Fetching user data for ID: {request.userId}") 
-    
-    customer = None
-    
-    if db_user:
-        # DB Dict -> CustomerProfile 변환
-        try:
-            from models.user import CustomerProfile
-            
-            # Pydantic 모델 변환
-            # 사용자 요청에 따라 필수 4요소(피부타입, 고민, 톤, 키워드) 위주로 구성하고 나머지는 자동 처리
-            customer = CustomerProfile(
-                user_id=db_user.get("user_id"),
-                name="00",  # 항상 '00'으로 고정
-                age_group=db_user.get("age_group", "Unknown"),
-                membership_level=db_user.get("membership_level", "General"),
-
-                # [Core Elements] 사용자가 지정한 핵심 4요소
-                skin_type=db_user.get("skin_type", []),
-                skin_concerns=db_user.get("skin_concerns", []),
-                preferred_tone=db_user.get("preferred_tone"),
-                keywords=db_user.get("keywords", []),
-                
-                # 나머지 필드는 모델 정의에서 Optional이나 Default가 있으므로 생략 가능
-            )
-        except Exception as e:
-            print(f"Error converting DB user data: {e}")
-            customer = None
+    customer = _load_customer_for_request(request)
 
-    # Fallback 없음: DB 실패 시 에러 처리
-    if not customer:
-        print(f"User '{request.userId}' not found in DB.")
-        raise HTTPException(
-            status_code=404,
-            detail=f"고객 ID '{request.userId}'를 찾을 수 없습니다."
-        )
-        
     # 2. LangGraph 워크플로우 실행
     try:
         # [DEBUG] 프론트엔드에서 받은 요청 데이터 확인
@@ -104,38 +158,15 @@ async def generate_message(
         print(f"  - hasBrand: {request.hasBrand}")
         print(f"  - persona: '{request.persona}'")
         print(f"  - intention: '{request.intention}'")
-        
-        initial_state = {
-            "user_id": request.userId,
-            "user_data": customer,
-            "channel": request.channel or "SMS",
-            
-            # GraphState keys
-            "crm_reason": request.intention or "신제품 출시 이벤트",
-            "weather_detail": request.weatherDetail or "좋은 날씨",
-            "target_brand": request.targetBrand or "",
-            "target_persona": request.persona.replace("P", "") if request.persona and request.persona.startswith("P") else (request.persona or "1"),
-            
-            # Logic context
-            "season": request.season or "계절 무관",
-            "brand_name": request.targetBrand or "",
-            "persona_name": request.persona or "1",
-            
-            # Output placeholders
-            "message": "",
-            "compliance_passed": False,
-            "retry_count": 0,
-            "error": "",
-            "success": False,
-            "retrieved_legal_rules": [],
-            "product_data": {},  # Initialize to avoid KeyError in nodes
-            "similar_user_ids": [],  # [FIX] 초기화 추가
-        }
+
+        initial_state = _build_initial_state(request, customer)
 
         print("🔥 AI 메시지 생성 시작...")
-        
-        result = await message_workflow.ainvoke(initial_state)
-        
+
+        # 실행이 예외/취소로 끝나도 Single Flight Follower가 대기하지 않도록 정리
+        with crm_history_service.generation_flights.leader_scope():
+            result = await message_workflow.ainvoke(initial_state)
+
         # 3. 결과 검증
         if result.get("success", False):
             # [DEBUG] 최종 API 응답 확인
@@ -143,7 +174,7 @@ async def generate_message(
             print(f"🔍 [API DEBUG] Final result similar_user_ids: {len(similar_ids_final)} items")
             if similar_ids_final:
                 print(f"   First 5: {similar_ids_final[:5]}")
-            
+
             # [FIX] Dict를 직접 반환 (similar_user_ids 포함)
             # MessageResponse 모델 변환하지 않고 return_response_node의 결과를 그대로 반환
             api_response = {
@@ -152,9 +183,9 @@ async def generate_message(
                 "method": result["channel"],
                 "similar_user_ids": similar_ids_final
             }
-            
+
             print(f"🔍 [API DEBUG] Returning API response with keys: {api_response.keys()}")
-            
+
             return api_response
         else:
             # 에러 응답
@@ -162,8 +193,237 @@ async def generate_message(
                 status_code=500,
                 detail=result.get("error", "메시지 생성 중 알 수 없는 오류가 발생했습니다.")
             )
-    
+
     except Exception as e:
         print(f"❌ 로직 에러: {e}")
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 프레임 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _summarize_node_update(node: str, update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    노드 완료 이벤트 payload 구성
+    노드는 전체 State를 반환하므로, 프론트엔드 진행 표시에 필요한 값만 추립니다.
+    """
+    if node == "orchestrator":
+        return {
+            "recommended_brand": update.get("recommended_brand"),
+            "similar_user_count": len(update.get("similar_user_ids") or []),
+        }
+    if node == "info_retrieval":
+        product = update.get("product_data") or {}
+        return {
+            "product_id": update.get("recommended_product_id"),
+            "product_name": product.get("name"),
+            "brand": product.get("brand"),
+        }
+    if node == "retrieve_crm":
+        return {"cache_hit": bool(update.get("cache_hit"))}
+    if node == "message_writer":
+        return {"attempt": update.get("retry_count", 0)}
+    if node == "compliance_check":
+        return {
+            "compliance_passed": bool(update.get("compliance_passed")),
+            "retry_count": update.get("retry_count", 0),
+        }
+    if node == "compliance_repair":
+        return {"repaired": bool(update.get("compliance_repaired"))}
+    return {}
+
+
+async def _stream_message_events(request: MessageRequest, customer: CustomerProfile) -> AsyncIterator[str]:
+    """
+    워크플로우를 astream으로 실행하며 SSE 이벤트를 내보냅니다.
+    - node: 노드 완료 시 요약 (브랜드 선정, 상품 추천, 캐시 Hit/Miss, Compliance 결과)
+    - token: Message Writer가 생성하는 토큰 (attempt가 바뀌면 재생성 시작)
+    - done: 최종 메시지 (/message 응답과 동일한 필드)
+    - error: 실패 사유
+    """
+    yield _sse("start", {"userId": request.userId})
+
+    initial_state = _build_initial_state(request, customer)
+    initial_state["stream_tokens"] = True
+    final_state: Dict[str, Any] = dict(initial_state)
+
+    try:
+        # 클라이언트 연결 종료 등으로 중단되어도 Single Flight Follower가 대기하지 않도록 정리
+        with crm_history_service.generation_flights.leader_scope():
+            async for mode, chunk in message_workflow.astream(initial_state, stream_mode=["updates", "custom"]):
+                if mode == "custom":
+                    if chunk.get("type") == "token":
+                        yield _sse("token", {"attempt": chunk["attempt"], "text": chunk["text"]})
+                    continue
+
+                for node, update in chunk.items():
+                    if not isinstance(update, dict):
+                        continue
+                    final_state.update(update)
+                    yield _sse("node", {"node": node, **_summarize_node_update(node, update)})
+
+        if final_state.get("success", False):
+            yield _sse("done", {
+                "message": final_state["message"],
+                "user": final_state["user_id"],
+                "method": final_state["channel"],
+                "similar_user_ids": final_state.get("similar_user_ids", []),
+            })
+        else:
+            yield _sse("error", {
+                "detail": final_state.get("error") or "메시지 생성 중 알 수 없는 오류가 발생했습니다."
+            })
+
+    except Exception as e:
+        print(f"❌ [Stream] 로직 에러: {e}")
+        traceback.print_exc()
+        yield _sse("error", {"detail": str(e)})
+
+
+@router.post(
+    "/message/stream",
+    responses={
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+    },
+    summary="개인화 메시지 생성 (SSE 스트리밍)",
+    description=(
+        "/message와 동일한 요청으로 워크플로우를 실행하되, 노드 진행 상황과 Writer 토큰을 "
+        "Server-Sent Events(node / token / done / error)로 즉시 스트리밍합니다."
+    ),
+)
+async def generate_message_stream(request: MessageRequest):
+    """
+    개인화 메시지 생성 스트리밍 API
+    중복 발송/고객 조회 실패는 스트림 시작 전에 일반 HTTP 에러로 응답합니다.
+    """
+    customer = await asyncio.to_thread(_load_customer_for_request, request)
+
+    return StreamingResponse(
+        _stream_message_events(request, customer),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _generate_for_user(user_id: str, request: BatchMessageRequest) -> Dict[str, Any]:
+    """
+    배치 내 단일 고객에 대한 워크플로우 실행
+    예외를 밖으로 던지지 않고 고객별 성공/실패 결과 dict로 변환합니다.
+    """
+    try:
+        db_user = await asyncio.to_thread(supabase_client.get_user, user_id)
+        customer = _build_customer_profile(db_user)
+        if not customer:
+            return {"userId": user_id, "success": False, "error": f"고객 ID '{user_id}'를 찾을 수 없습니다."}
+
+        message_request = MessageRequest(
+            userId=user_id,
+            channel=request.channel,
+            intention=request.intention,
+            hasBrand=request.hasBrand,
+            targetBrand=request.targetBrand,
+            season=request.season,
+            weatherDetail=request.weatherDetail,
+            persona=request.persona,
+        )
+        with crm_history_service.generation_flights.leader_scope():
+            result = await message_workflow.ainvoke(_build_initial_state(message_request, customer))
+
+        if result.get("success", False):
+            return {
+                "userId": user_id,
+                "success": True,
+                "message": result["message"],
+                "method": result["channel"],
+            }
+        return {
+            "userId": user_id,
+            "success": False,
+            "error": result.get("error", "메시지 생성 중 알 수 없는 오류가 발생했습니다."),
+        }
+
+    except Exception as e:
+        print(f"❌ [Batch] User {user_id} 처리 실패: {e}")
+        traceback.print_exc()
+        return {"userId": user_id, "success": False, "error": str(e)}
+
+
+async def _stream_batch_results(user_ids: List[str], request: BatchMessageRequest, concurrency: int) -> AsyncIterator[str]:
+    """
+    고정 개수의 워커가 user_ids를 나눠 처리하고, 완료되는 순서대로 NDJSON 라인을 내보냅니다.
+    클라이언트 연결이 끊기면 남은 워커를 모두 취소합니다.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    for user_id in user_ids:
+        pending.put_nowait(user_id)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def worker():
+        while True:
+            try:
+                user_id = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await results.put(await _generate_for_user(user_id, request))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(user_ids)))]
+    succeeded = 0
+    try:
+        for _ in range(len(user_ids)):
+            item = await results.get()
+            if item["success"]:
+                succeeded += 1
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+        yield json.dumps({
+            "done": True,
+            "total": len(user_ids),
+            "succeeded": succeeded,
+            "failed": len(user_ids) - succeeded,
+        }, ensure_ascii=False) + "\n"
+        print(f"✅ [Batch] 완료: {succeeded}/{len(user_ids)} 성공")
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+@router.post(
+    "/message/batch",
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+    },
+    summary="대량 개인화 메시지 생성",
+    description=(
+        "고객 ID 리스트 또는 페르소나 필터로 지정한 고객 전체에 대해 메시지 워크플로우를 "
+        "동시성 제한 하에 실행하고, 완료되는 순서대로 고객별 결과를 NDJSON으로 스트리밍합니다."
+    ),
+)
+async def generate_message_batch(request: BatchMessageRequest):
+    """
+    대량 캠페인 메시지 생성 API
+    한 고객의 실패는 해당 라인의 success=false로만 보고되고 배치 전체는 계속 진행됩니다.
+    """
+    if request.userIds:
+        # 순서 유지 중복 제거
+        user_ids = list(dict.fromkeys(request.userIds))
+    elif request.persona:
+        persona_id = request.persona[1:] if request.persona.upper().startswith("P") else request.persona
+        user_ids = await asyncio.to_thread(supabase_client.get_user_ids_by_persona, persona_id, request.limit)
+    else:
+        raise HTTPException(status_code=400, detail="userIds 또는 persona 중 하나는 반드시 지정해야 합니다.")
+
+    if not user_ids:
+        raise HTTPException(status_code=404, detail="조건에 맞는 대상 고객이 없습니다.")
+
+    concurrency = min(request.concurrency or settings.batch_max_concurrency, settings.batch_max_concurrency)
+    print(f"📦 [Batch] {len(user_ids)}명 대상 메시지 생성 시작 (concurrency={concurrency})")
+
+    return StreamingResponse(
+        _stream_batch_results(user_ids, request, concurrency),
+        media_type="application/x-ndjson",
+    )
@@ -3,7 +3,7 @@ Configuration management using pydantic-settings
 환경 변수 로드 및 애플리케이션 설정 관리
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -12,6 +12,7 @@ class Settings(BaseSettings):
     # OpenAI API
     openai_api_key: str
     openai_model: str = "gpt-4o-mini"
+    embedding_model: str = "text-embedding-3-small"
     
     # Supabase Settings
     SUPABASE_URL: str
@@ -19,9 +20,52 @@ class Settings(BaseSettings):
     
     # Application Settings
     max_retry_count: int = 5
+    writer_candidate_count: int = 1  # Writer 1회 호출당 후보 메시지 수 (>1이면 Compliance가 병렬 검수 후 통과한 첫 후보 채택, 스트리밍 요청·compliance_bypass 시 1개)
+    batch_max_concurrency: int = 8  # /message/batch 동시 실행 워크플로우 상한
+    config_reload_interval: float = 5.0  # persona_db/crm_guideline/fallback JSON 변경 감지 주기(초)
+    persona_stats_refresh_interval: float = 3600.0  # 페르소나별 브랜드 구매 집계 재계산 주기(초)
+    persona_stats_page_size: int = 1000  # 집계 스캔 시 user_data 페이지 크기
+    persona_audience_page_size: int = 1000  # 페르소나 배치 대상 조회 페이지 크기 (PostgREST max-rows 이하)
+    similar_users_limit: int = 1000  # 요청당 반환할 유사 고객 ID 상한 (완전 일치 우선)
+    crm_cache_max_entries: int = 10000  # CRM 메시지 L1(In-process LRU) 캐시 최대 항목 수
+    crm_cache_ttl: float = 3600.0  # L1 캐시 Hit 항목 TTL(초)
+    crm_cache_negative_ttl: float = 30.0  # L1 캐시 Miss 항목 TTL(초)
+    crm_signature_filter_capacity: int = 2_000_000  # query_signature Bloom Filter 예상 최대 항목 수
+    crm_signature_filter_error_rate: float = 0.01  # Bloom Filter 목표 False Positive 비율
+    crm_signature_filter_sync_interval: float = 30.0  # 다른 워커가 저장한 signature 동기화 주기(초)
+    crm_signature_filter_page_size: int = 1000  # Bloom Filter 적재 시 페이지 크기
+    crm_semantic_cache_enabled: bool = False  # 유사 조건 템플릿 재사용 (임베딩 기반, Optional)
+    crm_semantic_cache_threshold: float = 0.95  # 재사용할 최소 코사인 유사도
+    crm_semantic_cache_max_per_bucket: int = 2000  # brand/channel/intent/product 버킷당 최대 템플릿 수
+    product_cache_max_entries: int = 5000  # products / legal_info Read-through 캐시 최대 상품 수
+    product_cache_ttl: float = 21600.0  # 상품 메타데이터 캐시 TTL(초), 카탈로그는 하루 단위로 갱신
+    product_cache_negative_ttl: float = 300.0  # 존재하지 않는 상품/legal_info 캐시 TTL(초)
+    product_cache_prefetch_chunk_size: int = 200  # prefetch 시 in_ 쿼리 1회당 상품 수
+    regulation_rules_refresh_interval: float = 600.0  # 규칙/임베딩 메모리 재적재 주기(초)
+    compliance_bypass: bool = True  # 테스트 및 캐시 생성 유도를 위한 강제 Pass 모드 (False면 실제 검수 수행)
+    compliance_keyword_fast_path: bool = True  # 비기능성 제품 + 규제 키워드 0건이면 LLM 판단 생략
+    compliance_repair_enabled: bool = True  # Compliance 실패 시 위반 표현을 규칙 기반으로 치환/제거 후 재검증 (실패 시 LLM 재생성)
+    compliance_batch_enabled: bool = False  # 같은 제품의 동시 검수 요청을 한 번의 LLM 호출로 묶어 판단 (대량 캠페인용)
+    compliance_batch_max_size: int = 8  # 배치당 최대 메시지 수
+    compliance_batch_window: float = 0.05  # 첫 요청 후 같은 제품 요청을 모으는 시간(초)
+    compliance_batch_max_rules: int = 30  # 배치 프롬프트에 포함할 최대 규칙 수 (메시지별 검색 규칙 합집합)
+    compliance_verdict_cache_backend: str = "memory"  # LLM 판정 캐시: memory(워커별) / redis(워커 간 공유) / none
+    compliance_verdict_cache_ttl: float = 86400.0  # 판정 캐시 TTL(초), 규칙 변경 시 버전 키로 자동 무효화
+    compliance_verdict_cache_max_entries: int = 10000  # memory 백엔드 최대 항목 수
+    redis_url: Optional[str] = None  # 예: redis://localhost:6379/0 (redis 백엔드 사용 시)
+    generation_flight_timeout: float = 60.0  # 같은 signature 생성 중인 Leader 결과 대기 상한(초)
+    metrics_enabled: bool = True  # 노드/외부 호출 지연, 토큰, 캐시 Hit 지표 수집 (GET /metrics)
     env: str = "development"
 
     RECSYS_API_URL: str = "http://localhost:8001/recommend"
+    # RecSys HTTP Client (services/recsys_client.py)
+    recsys_connect_timeout: float = 3.0
+    recsys_read_timeout: float = 30.0  # CrossEncoder rerank 시간 고려
+    recsys_max_connections: int = 50
+    recsys_max_keepalive_connections: int = 20
+    recsys_keepalive_expiry: float = 30.0
+    recsys_max_retries: int = 2
+    recsys_retry_backoff: float = 0.5
     
     # CORS
     allowed_origins: str = "http://localhost:5173,https://brave-river-0b768e200.2.azurestaticapps.net"
@@ -7,11 +7,13 @@ from actions.orchestrator import orchestrator_node, GraphState
 from actions.info_retrieval import info_retrieval_node
 from actions.message_writer import message_writer_node
 from actions.compliance_check import compliance_check_node
+from actions.compliance_repair import compliance_repair_node
 from actions.save_crm import save_crm_message_node
 from actions.retrieve_crm import retrieve_crm_node
 # from actions.personalize import personalize_message_node # Removed
 from actions.return_response import return_response_node
 from config import settings
+from services.metrics import traced_node, record_retry
 
 
 def should_retry(state: GraphState) -> str:
@@ -25,14 +27,33 @@ def should_retry(state: GraphState) -> str:
     if compliance_passed:
         # Compliance 통과 → save_crm으로 이동
         return "save_crm"
+    elif (settings.compliance_repair_enabled and state.get("violated_rules")
+          and not state.get("compliance_repaired", False)):
+        # 위반 표현 규칙 기반 수정 시도 (메시지당 1회) → after_repair에서 재검수/재생성/종료 결정
+        return "compliance_repair"
     elif retry_count < max_retries:
         # 재시도 가능 → message_writer로 이동
+        record_retry("compliance")
         return "message_writer"
     else:
         # 최대 재시도 횟수 초과 → return_response로 이동 (에러 응답)
         return "return_response"
 
 
+def after_repair(state: GraphState) -> str:
+    """
+    규칙 기반 수정 결과에 따른 경로 분기
+    수정 성공 시 compliance_check에서 LLM 재검수, 수정 실패 시 기존 재시도 규칙 적용
+    """
+    if state.get("compliance_repaired", False):
+        return "compliance_check"
+    elif state.get("retry_count", 0) < settings.max_retry_count:
+        record_retry("compliance")
+        return "message_writer"
+    else:
+        return "return_response"
+
+
 def check_cache(state: GraphState) -> str:
     """
     CRM Cache Hit 여부에 따른 경로 분기
@@ -68,13 +89,14 @@ def create_workflow() -> StateGraph:
     workflow = StateGraph(GraphState)
     
     # 노드 추가
-    workflow.add_node("orchestrator", orchestrator_node)
-    workflow.add_node("info_retrieval", info_retrieval_node)
-    workflow.add_node("retrieve_crm", retrieve_crm_node)
-    workflow.add_node("message_writer", message_writer_node)
-    workflow.add_node("compliance_check", compliance_check_node)
-    workflow.add_node("save_crm", save_crm_message_node)
-    workflow.add_node("return_response", return_response_node)
+    workflow.add_node("orchestrator", traced_node("orchestrator", orchestrator_node))
+    workflow.add_node("info_retrieval", traced_node("info_retrieval", info_retrieval_node))
+    workflow.add_node("retrieve_crm", traced_node("retrieve_crm", retrieve_crm_node))
+    workflow.add_node("message_writer", traced_node("message_writer", message_writer_node))
+    workflow.add_node("compliance_check", traced_node("compliance_check", compliance_check_node))
+    workflow.add_node("compliance_repair", traced_node("compliance_repair", compliance_repair_node))
+    workflow.add_node("save_crm", traced_node("save_crm", save_crm_message_node))
+    workflow.add_node("return_response", traced_node("return_response", return_response_node))
     
     # 엣지 설정
     workflow.set_entry_point("orchestrator")
@@ -99,11 +121,23 @@ def create_workflow() -> StateGraph:
         should_retry,
         {
             "message_writer": "message_writer",
+            "compliance_repair": "compliance_repair",
             "save_crm": "save_crm",
             "return_response": "return_response",
         }
     )
     
+    # 조건부 엣지: compliance_repair → compliance_check (수정 후 재검수) or message_writer (재생성) or return_response
+    workflow.add_conditional_edges(
+        "compliance_repair",
+        after_repair,
+        {
+            "message_writer": "message_writer",
+            "compliance_check": "compliance_check",
+            "return_response": "return_response",
+        }
+    )
+    
     workflow.add_edge("save_crm", "return_response") # Direct to return_response
     workflow.add_edge("return_response", END)
     
@@ -2,10 +2,21 @@
 Blooming CRM Message Generation System
 페르소나 기반 초개인화 CRM 메시지 생성 시스템
 """
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
 from api.message import router as message_router
+from services.recsys_client import recsys_client
+from services.config_registry import config_registry
+from services.persona_stats_service import persona_stats_service
+from services.crm_history_service import crm_history_service
+from services.semantic_cache import semantic_crm_cache
+from services.compliance_verdict_cache import compliance_verdict_cache
+from services.product_cache import product_cache
+from models.product import ProductCacheRequest
+from services.metrics import render_metrics
+from services.regulation_rule_store import regulation_rule_store
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -39,6 +50,49 @@ async def root():
     }
 
 
+@app.get("/cache/stats", tags=["Health"])
+async def cache_stats():
+    """
+    CRM 메시지 L1 캐시 / Semantic 캐시 / Compliance 판정 캐시 hit/miss 통계
+    """
+    return {
+        "crm_message": crm_history_service.cache_stats(),
+        "crm_semantic": semantic_crm_cache.stats(),
+        "compliance_verdict": compliance_verdict_cache.stats(),
+        "product": product_cache.stats(),
+    }
+
+
+@app.post("/cache/products/prefetch", tags=["Health"])
+async def prefetch_products(request: ProductCacheRequest):
+    """
+    대량 캠페인 전 products / legal_info 캐시 일괄 적재
+    """
+    return await product_cache.prefetch(request.productIds or [])
+
+
+@app.post("/cache/products/invalidate", tags=["Health"])
+async def invalidate_products(request: ProductCacheRequest):
+    """
+    카탈로그 갱신 후 상품 캐시 무효화 (productIds 미지정 시 전체)
+    """
+    if request.productIds is None:
+        product_cache.invalidate()
+    else:
+        for product_id in request.productIds:
+            product_cache.invalidate(product_id)
+    return {"invalidated": "all" if request.productIds is None else len(request.productIds)}
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics():
+    """
+    Prometheus 지표 (노드/외부 호출 지연 Histogram, LLM 토큰, 캐시 Hit/Miss, 재시도 Counter)
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.on_event("startup")
 async def startup_event():
     """
@@ -47,6 +101,14 @@ async def startup_event():
     print("🌸 Blooming CRM API 서버가 시작되었습니다.")
     print(f"Environment: {settings.env}")
     print(f"OpenAI Model: {settings.openai_model}")
+    await recsys_client.start()
+    # 설정 JSON 1회 로드 + 변경 감지 watcher 시작
+    config_registry.reload_if_changed()
+    app.state.config_watcher = asyncio.create_task(config_registry.watch())
+    app.state.persona_stats_task = asyncio.create_task(persona_stats_service.run_scheduler())
+    await persona_stats_service.start_realtime()
+    app.state.signature_filter_task = asyncio.create_task(crm_history_service.run_signature_filter())
+    app.state.rule_store_task = asyncio.create_task(regulation_rule_store.run_refresh())
 
 
 @app.on_event("shutdown")
@@ -55,6 +117,12 @@ async def shutdown_event():
     애플리케이션 종료 시 실행
     """
     print("🌸 Blooming CRM API 서버가 종료됩니다.")
+    app.state.config_watcher.cancel()
+    app.state.persona_stats_task.cancel()
+    await persona_stats_service.stop_realtime()
+    app.state.signature_filter_task.cancel()
+    app.state.rule_store_task.cancel()
+    await recsys_client.aclose()
 
 
     
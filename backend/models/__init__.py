@@ -6,6 +6,7 @@ from .product import Product, ProductCategory, ProductPrice, ProductReview, Prod
 from .persona import Persona
 from .brand import BrandProfile
 from .message import GeneratedMessage, MessageResponse, ErrorResponse
+from .guideline import PersonaProfile, GuidelineGroup, BrandGuideline, CRMGuideline, BrandFallback, FallbackCatalog
 
 __all__ = [
     # User models
@@ -24,4 +25,11 @@ __all__ = [
     "GeneratedMessage",
     "MessageResponse",
     "ErrorResponse",
+    # Config files
+    "PersonaProfile",
+    "GuidelineGroup",
+    "BrandGuideline",
+    "CRMGuideline",
+    "BrandFallback",
+    "FallbackCatalog",
 ]
@@ -0,0 +1,60 @@
+"""
+설정 파일(JSON) 관련 Pydantic 모델
+persona_db.json / crm_guideline.json / fallback_messages.json 데이터 구조 정의
+"""
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Dict, Any
+
+
+class PersonaProfile(BaseModel):
+    """타겟 페르소나 (persona_db.json)"""
+    persona_name: str
+    description: str
+    recommended_brands: List[str] = Field(default_factory=list)
+    tone: str
+    keywords: List[str] = Field(default_factory=list)
+
+
+class GuidelineGroup(BaseModel):
+    """브랜드 그룹 공통 톤앤매너 (crm_guideline.json > groups)"""
+    tone: str
+    rules: List[str] = Field(default_factory=list)
+
+
+class BrandGuideline(BaseModel):
+    """브랜드별 가이드라인 (crm_guideline.json > brands)"""
+    group: str
+    target: str = ""
+    keywords: List[str] = Field(default_factory=list)
+    focus: str = ""
+    tone_manner_style: str = "Professional"
+    tone_manner_examples: List[str] = Field(default_factory=list)
+
+
+class CRMGuideline(BaseModel):
+    """crm_guideline.json 전체"""
+    meta: Dict[str, Any] = Field(default_factory=dict)
+    groups: Dict[str, GuidelineGroup] = Field(default_factory=dict)
+    brands: Dict[str, BrandGuideline] = Field(default_factory=dict)
+
+    @model_validator(mode="after")
+    def _check_brand_groups(self):
+        """모든 브랜드의 group이 groups에 정의되어 있는지 검증"""
+        missing = {name: b.group for name, b in self.brands.items() if b.group not in self.groups}
+        if missing:
+            raise ValueError(f"정의되지 않은 group을 참조하는 브랜드: {missing}")
+        return self
+
+
+class BrandFallback(BaseModel):
+    """브랜드별 Fallback 메시지 (fallback_messages.json > fallback_messages)"""
+    group: str = ""
+    safe_messages: List[str] = Field(default_factory=list)
+    product_mention: str = ""
+    channel_variants: Dict[str, str] = Field(default_factory=dict)
+
+
+class FallbackCatalog(BaseModel):
+    """fallback_messages.json 전체"""
+    meta: Dict[str, Any] = Field(default_factory=dict)
+    fallback_messages: Dict[str, BrandFallback] = Field(default_factory=dict)
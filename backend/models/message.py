@@ -3,7 +3,7 @@ Generated Message 관련 Pydantic 모델
 메시지 생성 결과 및 응답 데이터 구조 정의
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -43,6 +43,24 @@ class MessageRequest(BaseModel):
     persona: Optional[str] = None
 
 
+class BatchMessageRequest(BaseModel):
+    """API 요청 모델 - POST /message/batch
+
+    userIds 또는 persona 중 하나로 대상 고객을 지정하고,
+    나머지 상황 정보는 모든 고객에게 공통으로 적용됩니다.
+    """
+    userIds: Optional[List[str]] = Field(None, description="대상 고객 ID 리스트")
+    persona: Optional[str] = Field(None, description="페르소나 필터 (userIds 미지정 시 해당 페르소나 고객 전체)")
+    limit: int = Field(1000, ge=1, le=100000, description="페르소나 필터 사용 시 최대 대상 고객 수")
+    concurrency: Optional[int] = Field(None, ge=1, description="동시 실행 워크플로우 수 (서버 최대값으로 제한)")
+    channel: str = Field(..., description="SMS | APPPUSH | KAKAO | EMAIL")
+    intention: Optional[str] = Field(None, description="CRM 발송 이유 (날씨, 할인행사 등)")
+    hasBrand: Optional[bool] = False
+    targetBrand: Optional[str] = None
+    season: Optional[str] = None
+    weatherDetail: Optional[str] = None
+
+
 class MessageResponse(BaseModel):
     """API 응답 모델 - GET/POST /message"""
     message: str = Field(..., description="생성된 CRM 메시지 텍스트")
@@ -71,3 +71,8 @@ class Product(BaseModel):
                 "description_short": "24시간 무너짐 없는 실키 피부 표현"
             }
         }
+
+
+class ProductCacheRequest(BaseModel):
+    """API 요청 모델 - POST /cache/products/prefetch, /cache/products/invalidate"""
+    productIds: Optional[List[str]] = Field(None, description="대상 상품 ID 리스트 (invalidate에서 미지정 시 전체)")
@@ -0,0 +1,163 @@
+"""
+Compliance Verdict Cache
+같은 메시지 + 같은 제품 기능성 정보 + 같은 규칙 버전이면 LLM 판정(call_llm_judge)을 재사용합니다.
+
+- 키: 정규화한 메시지 + functional_status + functional_types + regulation_rule_store.version 의 sha256
+- 규칙(regulation_rules)이 바뀌면 version이 달라지므로 이전 판정은 더 이상 조회되지 않음 (TTL로 정리)
+- 백엔드 (settings.compliance_verdict_cache_backend)
+  - "memory": 워커별 In-process LRU (기본값)
+  - "redis":  워커 간 공유 (redis 패키지 + settings.redis_url 필요, 불가 시 memory로 대체)
+  - "none":   캐시 사용 안 함
+- 규칙 스토어 적재 전에는 버전을 알 수 없으므로 캐시를 사용하지 않음
+"""
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+from config import settings
+from services.metrics import record_cache
+from services.regulation_rule_store import regulation_rule_store
+from utils.lru_cache import LRUCache, MISSING
+
+# Redis (선택적 - 설치되어 있지 않으면 memory 백엔드 사용)
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis_asyncio = None
+    REDIS_AVAILABLE = False
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """유니코드 정규화(NFKC) + 공백 정리 (줄바꿈/중복 공백 차이만 있는 재시도 메시지를 같은 키로)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", message or "")).strip()
+
+
+def make_verdict_key(message: str, legal_info: Dict[str, Any], rule_version: str) -> str:
+    payload = json.dumps([
+        normalize_message(message),
+        legal_info.get("functional_status"),
+        sorted(str(t) for t in legal_info.get("functional_types") or []),
+        rule_version,
+    ], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MemoryVerdictBackend:
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._cache = LRUCache(max_entries=max_entries, ttl=ttl)
+        self._rule_version: Optional[str] = None
+
+    async def get(self, key: str, rule_version: str) -> Optional[Dict[str, Any]]:
+        if rule_version != self._rule_version:
+            # 규칙이 바뀐 뒤의 첫 조회: 이전 버전 판정은 다시 쓰일 일이 없으므로 즉시 비움
+            self._cache.clear()
+            self._rule_version = rule_version
+        value = self._cache.get(key)
+        return None if value is MISSING else value
+
+    async def set(self, key: str, rule_version: str, verdict: Dict[str, Any]):
+        if rule_version == self._rule_version:
+            self._cache.set(key, verdict)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+class RedisVerdictBackend:
+    name = "redis"
+
+    def __init__(self, url: str, ttl: float, prefix: str = "crm:compliance_verdict:"):
+        self._client = redis_asyncio.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    async def get(self, key: str, rule_version: str) -> Optional[Dict[str, Any]]:
+        raw = await self._client.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, rule_version: str, verdict: Dict[str, Any]):
+        await self._client.set(self.prefix + key, json.dumps(verdict, ensure_ascii=False), ex=self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+def create_backend():
+    backend = settings.compliance_verdict_cache_backend
+    if backend == "none":
+        return None
+    if backend == "redis":
+        if REDIS_AVAILABLE and settings.redis_url:
+            return RedisVerdictBackend(settings.redis_url, settings.compliance_verdict_cache_ttl)
+        print("⚠️ [Verdict Cache] redis 패키지 또는 redis_url이 없어 memory 백엔드를 사용합니다.")
+    return MemoryVerdictBackend(
+        settings.compliance_verdict_cache_max_entries, settings.compliance_verdict_cache_ttl
+    )
+
+
+class ComplianceVerdictCache:
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, message: str, legal_info: Dict[str, Any]) -> Optional[str]:
+        if self.backend is None or not regulation_rule_store.is_ready:
+            return None
+        return make_verdict_key(message, legal_info, regulation_rule_store.version)
+
+    async def get(self, message: str, legal_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 판정 조회
+        Returns: call_llm_judge 결과 dict, 없으면 None
+        """
+        key = self._key(message, legal_info)
+        if key is None:
+            return None
+        try:
+            verdict = await self.backend.get(key, regulation_rule_store.version)
+        except Exception as e:
+            # 캐시 장애는 판정 경로를 막지 않음 (LLM 호출로 진행)
+            self.errors += 1
+            print(f"⚠️ [Verdict Cache] Lookup failed: {e}")
+            return None
+
+        record_cache("compliance_verdict", verdict is not None)
+        if verdict is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return verdict
+
+    async def set(self, message: str, legal_info: Dict[str, Any], verdict: Dict[str, Any]):
+        key = self._key(message, legal_info)
+        if key is None:
+            return
+        try:
+            await self.backend.set(key, regulation_rule_store.version, verdict)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ [Verdict Cache] Store failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend else "none",
+            "rule_version": regulation_rule_store.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "errors": self.errors,
+            **(self.backend.stats() if self.backend else {}),
+        }
+
+
+# Global instance
+compliance_verdict_cache = ComplianceVerdictCache(create_backend())
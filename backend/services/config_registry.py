@@ -0,0 +1,171 @@
+"""
+Config Registry Service
+persona_db.json / crm_guideline.json / fallback_messages.json을 프로세스당 한 번만 파싱하여
+검증된 모델 + 조회용 인덱스로 메모리에 보관합니다.
+
+- 요청 경로(Hot Path)에서는 디스크 I/O 없이 메모리 스냅샷만 조회
+- 백그라운드 watcher가 파일 mtime 변경을 감지하면 새 스냅샷을 만들어 통째로 교체 (Atomic Swap)
+- 재로드 중 파싱/검증에 실패하면 기존 스냅샷을 그대로 유지
+"""
+import asyncio
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, Callable, Any
+from config import settings
+from models.guideline import (
+    PersonaProfile, GuidelineGroup, BrandGuideline, CRMGuideline, BrandFallback, FallbackCatalog
+)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERSONA_DB_PATH = os.path.join(BASE_DIR, "actions", "persona_db.json")
+CRM_GUIDELINE_PATH = os.path.join(BASE_DIR, "services", "crm_guideline.json")
+FALLBACK_MESSAGES_PATH = os.path.join(BASE_DIR, "services", "fallback_messages.json")
+
+# 브랜드명 매핑 (Eng -> Kor)
+BRAND_NAME_KR = {
+    "Sulwhasoo": "설화수",
+    "Hera": "헤라",
+    "Laneige": "라네즈",
+    "Mamonde": "마몽드",
+    "IOPE": "아이오페",
+    "Hannul": "한율",
+    "Hanyul": "한율",
+    "Espoir": "에스쁘아",
+    "Etude": "에뛰드",
+    "Innisfree": "이니스프리",
+    "Aestura": "에스트라",
+    "Primera": "프리메라"
+}
+
+
+def _parse_personas(raw: Dict[str, Any]) -> Dict[str, PersonaProfile]:
+    return {str(k): PersonaProfile(**v) for k, v in raw.items()}
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """한 시점의 설정 파일 파싱 결과 (불변)"""
+    personas: Dict[str, PersonaProfile] = field(default_factory=dict)
+    guideline: CRMGuideline = field(default_factory=CRMGuideline)
+    fallbacks: FallbackCatalog = field(default_factory=FallbackCatalog)
+    mtimes: Dict[str, int] = field(default_factory=dict)
+
+
+class ConfigRegistry:
+    # path -> (snapshot 필드명, 파서)
+    _FILES: Dict[str, Tuple[str, Callable[[Dict[str, Any]], Any]]] = {
+        PERSONA_DB_PATH: ("personas", _parse_personas),
+        CRM_GUIDELINE_PATH: ("guideline", lambda raw: CRMGuideline(**raw)),
+        FALLBACK_MESSAGES_PATH: ("fallbacks", lambda raw: FallbackCatalog(**raw)),
+    }
+
+    def __init__(self):
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._lock = threading.Lock()
+
+    # ===== Snapshot 관리 =====
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # watcher 없이 사용되는 경우(스크립트/테스트) 최초 접근 시 1회 로드
+            self.reload_if_changed()
+            snapshot = self._snapshot
+        return snapshot
+
+    def reload_if_changed(self) -> bool:
+        """
+        mtime이 바뀐 파일만 다시 파싱하여 새 스냅샷으로 교체
+        Returns: 교체 여부
+        """
+        with self._lock:
+            current = self._snapshot or ConfigSnapshot()
+            updates: Dict[str, Any] = {}
+            mtimes = dict(current.mtimes)
+
+            for path, (attr, parser) in self._FILES.items():
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError as e:
+                    if path not in mtimes:
+                        print(f"⚠️ [Config Registry] {os.path.basename(path)} 없음, 기본값 사용: {e}")
+                        mtimes[path] = 0
+                    continue
+
+                if mtimes.get(path) == mtime:
+                    continue
+
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        updates[attr] = parser(json.load(f))
+                    mtimes[path] = mtime
+                    print(f"🔄 [Config Registry] {os.path.basename(path)} 로드 완료")
+                except Exception as e:
+                    # 잘못된 파일이 배포되어도 기존 스냅샷으로 계속 서비스
+                    # (mtime은 기록하여 파일이 다시 바뀔 때까지 재파싱/재로그하지 않음)
+                    print(f"❌ [Config Registry] {os.path.basename(path)} 파싱 실패, 기존 설정 유지: {e}")
+                    mtimes[path] = mtime
+
+            if not updates and self._snapshot is not None:
+                if mtimes != current.mtimes:
+                    self._snapshot = ConfigSnapshot(
+                        personas=current.personas, guideline=current.guideline,
+                        fallbacks=current.fallbacks, mtimes=mtimes,
+                    )
+                return False
+
+            self._snapshot = ConfigSnapshot(
+                personas=updates.get("personas", current.personas),
+                guideline=updates.get("guideline", current.guideline),
+                fallbacks=updates.get("fallbacks", current.fallbacks),
+                mtimes=mtimes,
+            )
+            return True
+
+    async def watch(self):
+        """
+        파일 변경 감지 루프 (main.py startup 이벤트에서 Task로 실행)
+        """
+        while True:
+            await asyncio.sleep(settings.config_reload_interval)
+            try:
+                await asyncio.to_thread(self.reload_if_changed)
+            except Exception as e:
+                print(f"⚠️ [Config Registry] Reload error: {e}")
+
+    # ===== 조회 API =====
+    @staticmethod
+    def normalize_persona_id(persona_id: Any) -> str:
+        """'P1' / 'p1' / 1 → '1'"""
+        key = str(persona_id)
+        if key.lower().startswith("p"):
+            key = key[1:]
+        return key
+
+    def get_persona(self, persona_id: Any) -> Optional[PersonaProfile]:
+        return self.snapshot.personas.get(self.normalize_persona_id(persona_id))
+
+    def persona_ids(self):
+        return list(self.snapshot.personas.keys())
+
+    @staticmethod
+    def resolve_brand_name(brand_name: str) -> str:
+        """영문 브랜드명을 가이드라인 키(한글)로 변환, 매핑이 없으면 그대로 사용"""
+        return BRAND_NAME_KR.get(brand_name, brand_name)
+
+    def get_brand_guideline(self, brand_name: str) -> Optional[Tuple[BrandGuideline, GuidelineGroup]]:
+        """브랜드 가이드라인과 소속 그룹 가이드라인을 함께 반환"""
+        guideline = self.snapshot.guideline
+        brand = guideline.brands.get(self.resolve_brand_name(brand_name))
+        if brand is None:
+            return None
+        return brand, guideline.groups[brand.group]
+
+    def get_brand_fallback(self, brand_name: str) -> Optional[BrandFallback]:
+        return self.snapshot.fallbacks.fallback_messages.get(self.resolve_brand_name(brand_name))
+
+
+# Global instance
+config_registry = ConfigRegistry()
@@ -1,15 +1,32 @@
 from typing import Optional, Dict, List, Any
+import asyncio
 import hashlib
 import json
 from supabase import create_client, Client
 from config import settings
-from datetime import datetime
+from services.supabase_client import supabase_client
+from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
+from utils.lru_cache import LRUCache, MISSING
+from utils.bloom_filter import BloomFilter
+from utils.single_flight import SingleFlight
+from services.metrics import external_span, record_cache, record_skip
 
 class CRMHistoryService:
     def __init__(self):
         self.sb: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
         self.table_name = "crm_message_history"
+        # [L1] signature -> message_content (None은 최근 확인된 Miss)
+        self.local_cache = LRUCache(settings.crm_cache_max_entries, ttl=settings.crm_cache_ttl)
+        # 저장된 전체 query_signature의 Bloom Filter (로드 완료 전에는 판정에 쓰지 않음)
+        self.signature_filter = BloomFilter(
+            settings.crm_signature_filter_capacity, settings.crm_signature_filter_error_rate
+        )
+        self.signature_filter_ready = False
+        self._filter_watermark: Optional[datetime] = None  # 마지막으로 반영한 created_at (UTC aware)
+        self.filter_skips = 0
+        # 같은 signature의 동시 생성 병합 (Leader 1건만 LLM 호출)
+        self.generation_flights = SingleFlight(stale_after=settings.generation_flight_timeout)
 
     def _generate_signature(self, brand: str, persona: str, intent: str, weather: str, product_name: str, channel: str, beauty_profile: Dict) -> str:
         """
@@ -41,43 +58,223 @@ class CRMHistoryService:
         조건에 맞는 메시지 검색
         """
         signature = self._generate_signature(brand, persona, intent, weather, product_name, channel, beauty_profile)
+
+        cached = self._lookup_local(signature)
+        if cached is not MISSING:
+            return cached
         
         try:
             # signature로 검색
-            resp = (
-                self.sb.table(self.table_name)
-                .select("message_content")
-                .eq("query_signature", signature)
-                .limit(1)
-                .execute()
-            )
-            
-            if resp.data and len(resp.data) > 0:
-                print(f"✅ [CRM Cache] Hit! (sig={signature[:8]}...)")
-                return resp.data[0]["message_content"]
-            else:
-                print(f"💨 [CRM Cache] Miss (sig={signature[:8]}...)")
-                return None
+            with external_span("supabase", "crm_find"):
+                resp = (
+                    self.sb.table(self.table_name)
+                    .select("message_content")
+                    .eq("query_signature", signature)
+                    .limit(1)
+                    .execute()
+                )
+            return self._parse_find_response(resp, signature)
                 
         except Exception as e:
             print(f"⚠️ [CRM Cache] Error finding message: {e}")
             return None
 
-    def save_message(self, 
-                     brand: str, 
-                     persona: str, 
-                     intent: str, 
-                     weather: str, 
-                     product_name: str,
-                     channel: str,
-                     beauty_profile: Dict, 
-                     message_content: str):
+    async def afind_message(self,
+                            brand: str,
+                            persona: str,
+                            intent: str,
+                            weather: str,
+                            product_name: str,
+                            channel: str,
+                            beauty_profile: Dict) -> Optional[str]:
         """
-        생성된 메시지 저장
+        조건에 맞는 메시지 검색 (Async Supabase client)
         """
         signature = self._generate_signature(brand, persona, intent, weather, product_name, channel, beauty_profile)
-        
-        payload = {
+
+        cached = self._lookup_local(signature)
+        if cached is not MISSING:
+            return cached
+
+        try:
+            sb = await supabase_client.get_async_client()
+            with external_span("supabase", "crm_find"):
+                resp = await (
+                    sb.table(self.table_name)
+                    .select("message_content")
+                    .eq("query_signature", signature)
+                    .limit(1)
+                    .execute()
+                )
+            return self._parse_find_response(resp, signature)
+
+        except Exception as e:
+            print(f"⚠️ [CRM Cache] Error finding message: {e}")
+            return None
+
+    def _lookup_local(self, signature: str) -> Any:
+        """
+        [L1] In-process LRU + Bloom Filter 조회 (Supabase 왕복 전)
+        Returns: 메시지 / None(캐싱된 Miss 또는 확실한 Miss) / MISSING(DB 조회 필요)
+        """
+        cached = self.local_cache.get(signature)
+        record_cache("crm_l1", cached is not MISSING)
+        if cached is not MISSING:
+            print(f"⚡ [CRM Cache] L1 {'Hit' if cached is not None else 'Negative Hit'} (sig={signature[:8]}...)")
+            return cached
+
+        # Bloom Filter에 없으면 DB에도 없음이 확실하므로 조회 생략
+        if self.signature_filter_ready and signature not in self.signature_filter:
+            self.filter_skips += 1
+            record_skip("crm_bloom")
+            print(f"💨 [CRM Cache] Definite Miss by Bloom Filter (sig={signature[:8]}...)")
+            return None
+        return MISSING
+
+    def _parse_find_response(self, resp, signature: str) -> Optional[str]:
+        record_cache("crm_db", bool(resp.data))
+        if resp.data and len(resp.data) > 0:
+            print(f"✅ [CRM Cache] Hit! (sig={signature[:8]}...)")
+            message = resp.data[0]["message_content"]
+            self.local_cache.set(signature, message)
+            return message
+        print(f"💨 [CRM Cache] Miss (sig={signature[:8]}...)")
+        # 같은 signature가 몰릴 때 DB 재조회를 막도록 Miss도 짧게 캐싱
+        self.local_cache.set(signature, None, ttl=settings.crm_cache_negative_ttl)
+        return None
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """L1 캐시 hit/miss/eviction 통계 + Bloom Filter 상태"""
+        stats = self.local_cache.stats()
+        stats["signature_filter"] = {
+            "ready": self.signature_filter_ready,
+            "signatures": self.signature_filter.count,
+            "size_bytes": self.signature_filter.size_bytes,
+            "estimated_error_rate": round(self.signature_filter.estimated_error_rate(), 6),
+            "skipped_lookups": self.filter_skips,
+        }
+        return stats
+
+    # ===== Signature Bloom Filter =====
+    @staticmethod
+    def _parse_timestamp(value: Any) -> Optional[datetime]:
+        """
+        created_at → UTC aware datetime
+        (로컬 저장은 KST '+09:00', Postgres timestamptz는 UTC '+00:00' 문자열이므로 문자열 비교 불가)
+        """
+        if not value:
+            return None
+        try:
+            parsed = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc)
+
+    def _advance_watermark(self, created_at: Any):
+        parsed = self._parse_timestamp(created_at)
+        if parsed and (self._filter_watermark is None or parsed > self._filter_watermark):
+            self._filter_watermark = parsed
+
+    def _add_signatures(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            if row.get("query_signature"):
+                self.signature_filter.add(row["query_signature"])
+            self._advance_watermark(row.get("created_at"))
+
+    def _add_local_signature(self, signature: str, created_at: Any):
+        """
+        이 프로세스가 저장한 signature 반영
+        (Watermark가 아직 없을 때만 설정 — 이미 있으면 앞당기지 않음:
+         아직 동기화하지 않은 다른 워커의 더 이른 저장분을 건너뛰게 되므로)
+        """
+        self.signature_filter.add(signature)
+        if self._filter_watermark is None:
+            self._filter_watermark = self._parse_timestamp(created_at)
+
+    async def load_signature_filter(self):
+        """
+        crm_message_history 전체 query_signature를 Bloom Filter에 적재 (id 기준 Keyset Pagination)
+        """
+        sb = await supabase_client.get_async_client()
+        page_size = settings.crm_signature_filter_page_size
+        last_id = None
+        # 적재 중/이후 다른 워커가 저장한 행을 sync에서 놓치지 않도록 시작 시각을 기준점으로 사용
+        load_started = datetime.now(timezone.utc)
+
+        while True:
+            query = sb.table(self.table_name).select("id, query_signature, created_at").order("id").limit(page_size)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = (await query.execute()).data or []
+            self._add_signatures(rows)
+            if len(rows) < page_size:
+                break
+            last_id = rows[-1]["id"]
+
+        # 테이블이 비어 있으면(신규 배포) 적재 시작 시각부터 동기화
+        if self._filter_watermark is None:
+            self._filter_watermark = load_started
+        self.signature_filter_ready = True
+        if self.signature_filter.count > self.signature_filter.capacity:
+            print(f"⚠️ [CRM Cache] Signature filter over capacity ({self.signature_filter.count}), FP rate will rise")
+        print(
+            f"🌸 [CRM Cache] Signature filter loaded: {self.signature_filter.count} signatures "
+            f"({self.signature_filter.size_bytes / 1024 / 1024:.1f}MB)"
+        )
+
+    async def sync_signature_filter(self):
+        """
+        마지막 반영 시점 이후 저장된 signature를 추가 (다른 워커/프로세스가 저장한 메시지 반영)
+        """
+        if self._filter_watermark is None:
+            return
+        sb = await supabase_client.get_async_client()
+        page_size = settings.crm_signature_filter_page_size
+        # 경계 행을 매 주기 다시 가져오지 않도록 watermark 초과(gt)만 조회
+        since = self._filter_watermark.isoformat()
+        offset = 0
+
+        while True:
+            rows = (await (
+                sb.table(self.table_name)
+                .select("query_signature, created_at")
+                .gt("created_at", since)
+                .order("created_at")
+                .range(offset, offset + page_size - 1)
+                .execute()
+            )).data or []
+            self._add_signatures(rows)
+            if len(rows) < page_size:
+                return
+            offset += page_size
+
+    async def run_signature_filter(self):
+        """
+        Bloom Filter 적재 후 주기적으로 신규 signature 동기화 (main.py startup 이벤트에서 Task로 실행)
+        적재에 실패하면 Filter 없이(항상 DB 조회) 동작하며 다음 주기에 재시도합니다.
+        """
+        while True:
+            try:
+                if not self.signature_filter_ready:
+                    await self.load_signature_filter()
+                else:
+                    await self.sync_signature_filter()
+            except Exception as e:
+                print(f"⚠️ [CRM Cache] Signature filter refresh failed: {e}")
+            await asyncio.sleep(settings.crm_signature_filter_sync_interval)
+
+    def _build_payload(self,
+                       signature: str,
+                       brand: str,
+                       persona: str,
+                       intent: str,
+                       weather: str,
+                       channel: str,
+                       beauty_profile: Dict,
+                       message_content: str) -> Dict[str, Any]:
+        return {
             "brand": brand,
             "persona": persona,
             "intent": intent,
@@ -89,9 +286,52 @@ class CRMHistoryService:
             "query_signature": signature,
             "created_at": datetime.now(ZoneInfo("Asia/Seoul")).isoformat()
         }
+
+    def save_message(self, 
+                     brand: str, 
+                     persona: str, 
+                     intent: str, 
+                     weather: str, 
+                     product_name: str,
+                     channel: str,
+                     beauty_profile: Dict, 
+                     message_content: str):
+        """
+        생성된 메시지 저장
+        """
+        signature = self._generate_signature(brand, persona, intent, weather, product_name, channel, beauty_profile)
+        payload = self._build_payload(signature, brand, persona, intent, weather, channel, beauty_profile, message_content)
         
         try:
-            self.sb.table(self.table_name).insert(payload).execute()
+            with external_span("supabase", "crm_save"):
+                self.sb.table(self.table_name).insert(payload).execute()
+            self.local_cache.set(signature, message_content)
+            self._add_local_signature(signature, payload["created_at"])
+            print(f"💾 [CRM Cache] Saved new message (sig={signature[:8]}...)")
+        except Exception as e:
+            print(f"⚠️ [CRM Cache] Failed to save message: {e}")
+
+    async def asave_message(self,
+                            brand: str,
+                            persona: str,
+                            intent: str,
+                            weather: str,
+                            product_name: str,
+                            channel: str,
+                            beauty_profile: Dict,
+                            message_content: str):
+        """
+        생성된 메시지 저장 (Async Supabase client)
+        """
+        signature = self._generate_signature(brand, persona, intent, weather, product_name, channel, beauty_profile)
+        payload = self._build_payload(signature, brand, persona, intent, weather, channel, beauty_profile, message_content)
+
+        try:
+            sb = await supabase_client.get_async_client()
+            with external_span("supabase", "crm_save"):
+                await sb.table(self.table_name).insert(payload).execute()
+            self.local_cache.set(signature, message_content)
+            self._add_local_signature(signature, payload["created_at"])
             print(f"💾 [CRM Cache] Saved new message (sig={signature[:8]}...)")
         except Exception as e:
             print(f"⚠️ [CRM Cache] Failed to save message: {e}")
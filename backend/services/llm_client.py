@@ -4,13 +4,43 @@ Centralized client for LLM interactions (OpenAI)
 """
 import openai
 from config import settings
-from typing import List, Dict, Any, Optional
+from services.metrics import external_span, record_llm_usage
+from typing import List, Dict, Any, Optional, Callable
 
 class LLMClient:
     def __init__(self):
         self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        self.async_client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_model
 
+    def _build_kwargs(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if response_format:
+            kwargs["response_format"] = response_format
+        return kwargs
+
+    @staticmethod
+    def _to_result(response) -> Dict[str, Any]:
+        return {
+            "content": response.choices[0].message.content.strip(),
+            "usage": {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens
+            }
+        }
+
     def generate_chat_completion(
         self, 
         messages: List[Dict[str, str]], 
@@ -24,27 +54,124 @@ class LLMClient:
             Dict containing 'content' (str) and 'usage' (dict)
         """
         try:
-            kwargs = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-            }
-            if response_format:
-                kwargs["response_format"] = response_format
+            kwargs = self._build_kwargs(messages, temperature, max_tokens, response_format)
+            with external_span("openai", "chat"):
+                response = self.client.chat.completions.create(**kwargs)
+            result = self._to_result(response)
+            record_llm_usage("generation", result["usage"])
+            return result
+        except Exception as e:
+            print(f"Error generating completion: {e}")
+            raise e
+
+    async def agenerate_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of generate_chat_completion (AsyncOpenAI)
+        이벤트 루프를 막지 않으므로 LangGraph async 노드에서 사용합니다.
+        """
+        try:
+            kwargs = self._build_kwargs(messages, temperature, max_tokens, response_format)
+            with external_span("openai", "chat"):
+                response = await self.async_client.chat.completions.create(**kwargs)
+            result = self._to_result(response)
+            record_llm_usage("generation", result["usage"])
+            return result
+        except Exception as e:
+            print(f"Error generating completion: {e}")
+            raise e
 
-            response = self.client.chat.completions.create(**kwargs)
-            return {
-                "content": response.choices[0].message.content.strip(),
+    async def agenerate_chat_candidates(
+        self,
+        messages: List[Dict[str, str]],
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 500
+    ) -> Dict[str, Any]:
+        """
+        한 번의 호출로 후보 응답 n개 생성 (OpenAI n= 파라미터, 입력 토큰은 1회만 과금)
+        Returns:
+            Dict containing 'contents' (List[str], 빈 응답 제외) and 'usage' (dict)
+        """
+        try:
+            kwargs = self._build_kwargs(messages, temperature, max_tokens, None)
+            with external_span("openai", "chat_candidates"):
+                response = await self.async_client.chat.completions.create(**kwargs, n=n)
+            result = {
+                "contents": [
+                    choice.message.content.strip()
+                    for choice in response.choices
+                    if choice.message.content and choice.message.content.strip()
+                ],
                 "usage": {
                     "prompt_tokens": response.usage.prompt_tokens,
                     "completion_tokens": response.usage.completion_tokens,
                     "total_tokens": response.usage.total_tokens
                 }
             }
+            record_llm_usage("generation", result["usage"])
+            return result
         except Exception as e:
-            print(f"Error generating completion: {e}")
+            print(f"Error generating completion candidates: {e}")
+            raise e
+
+    async def astream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Streaming version of agenerate_chat_completion
+        토큰이 도착할 때마다 on_token(delta)을 호출하고, 완료 후 동일한 결과 형식(content, usage)을 반환합니다.
+        """
+        try:
+            kwargs = self._build_kwargs(messages, temperature, max_tokens, None)
+            parts: List[str] = []
+            usage = None
+
+            with external_span("openai", "chat_stream"):
+                stream = await self.async_client.chat.completions.create(
+                    **kwargs, stream=True, stream_options={"include_usage": True}
+                )
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        usage = chunk.usage  # include_usage: 마지막 chunk에만 포함
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        if on_token:
+                            on_token(delta)
+
+            result = {
+                "content": "".join(parts).strip(),
+                "usage": {
+                    "prompt_tokens": usage.prompt_tokens if usage else 0,
+                    "completion_tokens": usage.completion_tokens if usage else 0,
+                    "total_tokens": usage.total_tokens if usage else 0
+                }
+            }
+            record_llm_usage("generation", result["usage"])
+            return result
+        except Exception as e:
+            print(f"Error streaming completion: {e}")
             raise e
 
+    async def aget_embedding(self, text: str) -> List[float]:
+        """
+        텍스트 임베딩 생성 (AsyncOpenAI, settings.embedding_model)
+        """
+        with external_span("openai", "embedding"):
+            response = await self.async_client.embeddings.create(model=settings.embedding_model, input=text)
+        return response.data[0].embedding
+
 # Global instance
 llm_client = LLMClient()
@@ -0,0 +1,120 @@
+"""
+Metrics Service
+Prometheus 지표 정의 + 측정 헬퍼 (GET /metrics 로 노출)
+
+- 노드 지연: LangGraph 노드를 traced_node()로 감싸 노드별 Histogram 기록
+- 외부 호출 지연: Supabase / OpenAI / RecSys 호출을 external_span()으로 감싸 Histogram 기록
+- LLM 토큰 수, 캐시 Hit/Miss, 재시도 횟수는 Counter로 기록
+- settings.metrics_enabled=False 이면 traced_node는 원본 함수를 그대로 반환하고,
+  external_span은 공용 nullcontext를 반환하므로 측정 비용이 거의 없음
+"""
+import functools
+import inspect
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Optional
+from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+NODE_LATENCY = Histogram(
+    "crm_node_latency_seconds", "LangGraph 노드 실행 시간",
+    ["node", "outcome"], buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_CALL_LATENCY = Histogram(
+    "crm_external_call_latency_seconds", "외부 호출(Supabase/OpenAI/RecSys) 시간",
+    ["service", "operation", "outcome"], buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "crm_llm_tokens_total", "LLM 사용 토큰 수",
+    ["purpose", "kind"],
+)
+CACHE_REQUESTS = Counter(
+    "crm_cache_requests_total", "캐시 조회 결과 (Hit 비율 = hit / (hit + miss))",
+    ["cache", "result"],
+)
+RETRIES = Counter(
+    "crm_retries_total", "재시도 횟수",
+    ["component"],
+)
+SKIPPED_LOOKUPS = Counter(
+    "crm_skipped_lookups_total", "확실한 Miss로 판정되어 생략한 조회 수 (Hit 비율에 포함하지 않음)",
+    ["cache"],
+)
+
+# 비활성 시 재사용하는 No-op 컨텍스트 (nullcontext는 상태가 없어 공유 가능)
+_NOOP_SPAN = nullcontext()
+
+
+@contextmanager
+def _span(histogram: Histogram, **labels):
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        histogram.labels(outcome=outcome, **labels).observe(time.perf_counter() - started)
+
+
+def external_span(service: str, operation: str):
+    """
+    외부 호출 시간 측정 컨텍스트
+    사용: with external_span("openai", "chat"): response = await ...
+    """
+    if not settings.metrics_enabled:
+        return _NOOP_SPAN
+    return _span(EXTERNAL_CALL_LATENCY, service=service, operation=operation)
+
+
+def traced_node(name: str, node: Callable) -> Callable:
+    """
+    LangGraph 노드 함수(sync/async)에 실행 시간 측정을 덧씌움
+    functools.wraps로 타입 힌트를 보존하므로 노드별 입력 스키마 추론에 영향 없음
+    """
+    if not settings.metrics_enabled:
+        return node
+
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def async_wrapper(state, *args, **kwargs):
+            with _span(NODE_LATENCY, node=name):
+                return await node(state, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(node)
+    def sync_wrapper(state, *args, **kwargs):
+        with _span(NODE_LATENCY, node=name):
+            return node(state, *args, **kwargs)
+    return sync_wrapper
+
+
+def record_llm_usage(purpose: str, usage: Optional[Dict[str, Any]]):
+    """LLM 응답 usage(prompt/completion tokens) 기록"""
+    if not settings.metrics_enabled or not usage:
+        return
+    LLM_TOKENS.labels(purpose=purpose, kind="prompt").inc(usage.get("prompt_tokens") or 0)
+    LLM_TOKENS.labels(purpose=purpose, kind="completion").inc(usage.get("completion_tokens") or 0)
+
+
+def record_cache(cache: str, hit: bool):
+    if settings.metrics_enabled:
+        CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_skip(cache: str):
+    if settings.metrics_enabled:
+        SKIPPED_LOOKUPS.labels(cache=cache).inc()
+
+
+def record_retry(component: str):
+    if settings.metrics_enabled:
+        RETRIES.labels(component=component).inc()
+
+
+def render_metrics():
+    """Prometheus text exposition (body, content_type)"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,326 @@
+"""
+Persona Stats Service
+user_data 테이블을 주기적으로 전체 스캔(Keyset Pagination)하여
+페르소나별 집계를 메모리에 유지합니다.
+
+- 브랜드 구매 빈도: 요청 경로에서는 1000건 랜덤 샘플링 대신 집계 결과를 O(1) 조회
+- 유사 고객 인덱스: 프로필 시그니처(정규화된 4요소) → user_id 역색인으로 O(매칭 수) 조회
+- 전체 페르소나 데이터 기준이므로 호출마다 결과가 달라지지 않음 (Deterministic)
+- 새 집계가 완성된 후 참조를 통째로 교체 (Atomic Swap)
+- 전체 재집계 사이의 user_data 변경은 Supabase Realtime 이벤트로 증분 반영
+"""
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, List, Any, Optional, AsyncIterator, Tuple, Iterator
+from config import settings
+from services.supabase_client import supabase_client
+
+USER_COLUMNS = "user_id, persona_id, brand_purchases, skin_type, skin_concerns, preferred_tone, keywords"
+
+# (skin_type, skin_concerns, preferred_tone, keywords) / (skin_type, preferred_tone)
+ExactSignature = Tuple[Tuple[str, ...], Tuple[str, ...], str, Tuple[str, ...]]
+PartialSignature = Tuple[Tuple[str, ...], str]
+
+
+def parse_brand_purchases(purchases: Any) -> List[str]:
+    """brand_purchases 컬럼 정규화 (list 또는 콤마 구분 문자열)"""
+    if isinstance(purchases, list):
+        return [b for b in purchases if b]
+    if isinstance(purchases, str):
+        return [b.strip() for b in purchases.split(",") if b.strip()]
+    return []
+
+
+def _code_set(value: Any) -> Tuple[str, ...]:
+    """list / 단일 문자열 / 콤마 구분 문자열 → 정렬된 중복 없는 튜플 (순서 무관 비교용)"""
+    if isinstance(value, str):
+        value = [v.strip() for v in value.split(",")]
+    if not isinstance(value, (list, tuple, set)):
+        return ()
+    return tuple(sorted({v for v in value if v}))
+
+
+def profile_signatures(skin_type: Any, skin_concerns: Any, preferred_tone: Any,
+                       keywords: Any) -> Tuple[ExactSignature, PartialSignature]:
+    """
+    프로필 4요소를 정규화된 시그니처로 변환
+    - exact: 4요소 모두 일치 (완전 일치)
+    - partial: skin_type + preferred_tone 일치 (부분 일치)
+    """
+    skin = _code_set(skin_type)
+    tone = preferred_tone or ""
+    return (skin, _code_set(skin_concerns), tone, _code_set(keywords)), (skin, tone)
+
+
+@dataclass
+class _UserEntry:
+    persona_id: str
+    exact: ExactSignature
+    partial: PartialSignature
+    brands: List[str]
+
+
+@dataclass
+class _Aggregate:
+    """한 시점의 집계 (refresh 시 통째로 교체, Realtime 이벤트는 제자리 갱신)"""
+    brand_counts: Dict[str, Counter] = field(default_factory=dict)
+    # (persona_id, signature) -> user_id 순서 보존 집합 (dict keys)
+    exact_index: Dict[Tuple[str, ExactSignature], Dict[str, None]] = field(default_factory=dict)
+    partial_index: Dict[Tuple[str, PartialSignature], Dict[str, None]] = field(default_factory=dict)
+    users: Dict[str, _UserEntry] = field(default_factory=dict)
+
+    def add_row(self, row: Dict[str, Any]):
+        """user_data row 반영 (이미 있는 사용자면 기존 기여분을 빼고 다시 반영)"""
+        user_id = row.get("user_id")
+        if user_id is None:
+            return
+        user_id = str(user_id)
+        self.remove_user(user_id)
+
+        exact, partial = profile_signatures(
+            row.get("skin_type"), row.get("skin_concerns"), row.get("preferred_tone"), row.get("keywords")
+        )
+        entry = _UserEntry(
+            persona_id=str(row.get("persona_id")),
+            exact=exact,
+            partial=partial,
+            brands=parse_brand_purchases(row.get("brand_purchases")),
+        )
+        self.users[user_id] = entry
+        self.brand_counts.setdefault(entry.persona_id, Counter()).update(entry.brands)
+        self.exact_index.setdefault((entry.persona_id, exact), {})[user_id] = None
+        self.partial_index.setdefault((entry.persona_id, partial), {})[user_id] = None
+
+    def remove_user(self, user_id: str):
+        entry = self.users.pop(user_id, None)
+        if entry is None:
+            return
+
+        counts = self.brand_counts.get(entry.persona_id)
+        if counts is not None:
+            counts.subtract(entry.brands)
+            for brand in set(entry.brands):
+                if counts[brand] <= 0:
+                    del counts[brand]
+
+        for index, key in ((self.exact_index, (entry.persona_id, entry.exact)),
+                           (self.partial_index, (entry.persona_id, entry.partial))):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(user_id, None)
+                if not bucket:
+                    del index[key]
+
+
+class PersonaStatsService:
+    def __init__(self):
+        self._aggregate = _Aggregate()
+        self.last_refreshed_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+        # refresh 스캔 도중 들어온 Realtime 이벤트 (스캔 완료 후 새 집계에 재적용)
+        self._pending_changes: Optional[List[Dict[str, Any]]] = None
+        self._channel = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.last_refreshed_at is not None
+
+    async def _iter_user_rows(self, columns: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        user_data 전체를 user_id 기준 Keyset Pagination으로 순회
+        (큰 offset 스캔 없이 일정한 비용으로 페이지 조회)
+        """
+        sb = await supabase_client.get_async_client()
+        last_user_id = None
+        page_size = settings.persona_stats_page_size
+
+        while True:
+            query = sb.table("user_data").select(columns).order("user_id").limit(page_size)
+            if last_user_id is not None:
+                query = query.gt("user_id", last_user_id)
+            resp = await query.execute()
+            rows = resp.data or []
+
+            for row in rows:
+                yield row
+
+            if len(rows) < page_size:
+                return
+            last_user_id = rows[-1]["user_id"]
+
+    async def refresh(self):
+        """
+        전체 user_data를 스캔하여 페르소나별 브랜드 빈도 + 유사 고객 인덱스 재구성
+        """
+        async with self._refresh_lock:
+            started = time.monotonic()
+            aggregate = _Aggregate()
+            self._pending_changes = []
+
+            try:
+                async for row in self._iter_user_rows(USER_COLUMNS):
+                    aggregate.add_row(row)
+
+                # 스캔 중 반영된 변경분을 새 집계에도 적용 (같은 row 재적용은 멱등)
+                for change in self._pending_changes:
+                    self._apply_change(aggregate, change)
+            finally:
+                self._pending_changes = None
+
+            self._aggregate = aggregate
+            self.last_refreshed_at = time.time()
+            print(
+                f"📊 [Persona Stats] {len(aggregate.users)} users / {len(aggregate.brand_counts)} personas 집계 완료 "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+
+    async def run_scheduler(self):
+        """
+        주기적 재집계 루프 (main.py startup 이벤트에서 Task로 실행)
+        첫 집계는 즉시 실행하며, 실패 시 기존 집계를 유지하고 다음 주기에 재시도합니다.
+        """
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"⚠️ [Persona Stats] Refresh failed, keeping previous aggregate: {e}")
+            await asyncio.sleep(settings.persona_stats_refresh_interval)
+
+    # ===== 증분 갱신 (Supabase Realtime) =====
+    @staticmethod
+    def _apply_change(aggregate: _Aggregate, change: Dict[str, Any]):
+        event = change.get("type")
+        if event == "DELETE":
+            user_id = (change.get("old_record") or {}).get("user_id")
+            if user_id is not None:
+                aggregate.remove_user(str(user_id))
+        elif event in ("INSERT", "UPDATE") and change.get("record"):
+            aggregate.add_row(change["record"])
+
+    def handle_user_data_change(self, payload: Dict[str, Any]):
+        """
+        user_data INSERT/UPDATE/DELETE 이벤트를 현재 집계에 반영
+        (Realtime postgres_changes 콜백, payload['data']에 type/record/old_record 포함)
+        """
+        change = payload.get("data", payload)
+        try:
+            self._apply_change(self._aggregate, change)
+            if self._pending_changes is not None:
+                self._pending_changes.append(change)
+        except Exception as e:
+            print(f"⚠️ [Persona Stats] Failed to apply user_data change: {e}")
+
+    async def start_realtime(self):
+        """
+        user_data 변경 구독 시작 (main.py startup 이벤트에서 호출)
+        실패해도 주기적 재집계로 결국 반영되므로 서비스는 계속 진행합니다.
+        """
+        if self._channel is not None:
+            return
+        try:
+            sb = await supabase_client.get_async_client()
+            channel = sb.channel("persona-stats-user-data")
+            channel.on_postgres_changes(
+                "*", callback=self.handle_user_data_change, table="user_data", schema="public"
+            )
+            await channel.subscribe()
+            self._channel = channel
+            print("📡 [Persona Stats] Subscribed to user_data changes")
+        except Exception as e:
+            print(f"⚠️ [Persona Stats] Realtime subscribe failed, relying on periodic refresh: {e}")
+
+    async def stop_realtime(self):
+        if self._channel is not None:
+            try:
+                sb = await supabase_client.get_async_client()
+                await sb.remove_channel(self._channel)
+            finally:
+                self._channel = None
+
+    # ===== 조회 API =====
+    def get_brand_counts(self, persona_id: str) -> Counter:
+        """
+        페르소나의 브랜드 구매 빈도 (메모리 조회)
+        집계 전이면 빈 Counter 반환
+        """
+        if not self.is_ready:
+            print("⚠️ [Persona Stats] Aggregate not ready yet. Using persona brands only.")
+        return self._aggregate.brand_counts.get(str(persona_id), Counter())
+
+    def persona_ids(self) -> List[str]:
+        """집계된 페르소나 ID 목록"""
+        return sorted({entry.persona_id for entry in self._aggregate.users.values()})
+
+    def top_profiles(self, persona_id: str, limit: int) -> List[Tuple[ExactSignature, str, int]]:
+        """
+        페르소나 내 고객 수 상위 뷰티 프로필 (완전 일치 시그니처 기준, 템플릿 사전 생성용)
+        Returns: [(시그니처, 대표 user_id, 고객 수), ...] 고객 수 내림차순
+        """
+        persona_id = str(persona_id)
+        buckets = [
+            (signature, users) for (pid, signature), users in self._aggregate.exact_index.items()
+            if pid == persona_id and users
+        ]
+        buckets.sort(key=lambda item: (-len(item[1]), item[0]))
+        return [(signature, next(iter(users)), len(users)) for signature, users in buckets[:limit]]
+
+    def _iter_similar_users(self, persona_id: str, skin_type: Any, skin_concerns: Any,
+                            preferred_tone: Any, keywords: Any,
+                            exclude_user_id: Optional[str]) -> Iterator[str]:
+        aggregate = self._aggregate
+        exact, partial = profile_signatures(skin_type, skin_concerns, preferred_tone, keywords)
+
+        # 1) 완전 일치
+        for user_id in aggregate.exact_index.get((persona_id, exact), {}):
+            if user_id != exclude_user_id:
+                yield user_id
+
+        # 2) 부분 일치 (완전 일치 사용자는 이미 반환했으므로 제외)
+        for user_id in aggregate.partial_index.get((persona_id, partial), {}):
+            if user_id == exclude_user_id:
+                continue
+            entry = aggregate.users.get(user_id)
+            if entry is not None and entry.exact == exact:
+                continue
+            yield user_id
+
+    def count_similar_users(self, persona_id: str, skin_type: Any, skin_concerns: Any,
+                            preferred_tone: Any, keywords: Any) -> Tuple[int, int]:
+        """(완전 일치 수, 부분 일치 버킷 크기) - 로깅용, 버킷 크기 조회라 O(1)"""
+        exact, partial = profile_signatures(skin_type, skin_concerns, preferred_tone, keywords)
+        persona_id = str(persona_id)
+        return (
+            len(self._aggregate.exact_index.get((persona_id, exact), {})),
+            len(self._aggregate.partial_index.get((persona_id, partial), {})),
+        )
+
+    def find_similar_users(self, persona_id: str, skin_type: Any, skin_concerns: Any,
+                           preferred_tone: Any, keywords: Any,
+                           exclude_user_id: Optional[str] = None,
+                           offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """
+        같은 페르소나 내 프로필 유사 고객 ID 조회 (완전 일치 → 부분 일치 순)
+
+        Args:
+            persona_id: 페르소나 ID
+            skin_type / skin_concerns / preferred_tone / keywords: 타겟 고객 프로필
+            exclude_user_id: 결과에서 제외할 사용자 (타겟 본인)
+            offset / limit: 페이지네이션 (limit=None이면 전체)
+        """
+        if not self.is_ready:
+            print("⚠️ [Persona Stats] Aggregate not ready yet. No similar users.")
+        stop = None if limit is None else offset + limit
+        return list(islice(
+            self._iter_similar_users(
+                str(persona_id), skin_type, skin_concerns, preferred_tone, keywords,
+                str(exclude_user_id) if exclude_user_id is not None else None,
+            ),
+            offset, stop,
+        ))
+
+
+# Global instance
+persona_stats_service = PersonaStatsService()
@@ -0,0 +1,122 @@
+"""
+Product Metadata Cache (Read-through)
+products / legal_info 행을 product id 기준으로 프로세스 메모리에 보관합니다.
+
+- 카탈로그 데이터는 하루 단위로만 바뀌므로 TTL(기본 6시간) 동안 DB 왕복 없이 재사용
+  (Compliance 재시도, 같은 상품을 받는 여러 고객)
+- 존재하지 않는 상품/legal_info도 짧은 TTL로 캐싱 (Negative Caching)
+- 조회 실패(네트워크 오류 등)는 캐싱하지 않음
+- prefetch(): 대량 캠페인 전에 in_ 쿼리로 여러 상품을 한 번에 적재
+- invalidate(): 카탈로그 갱신 시 특정 상품 또는 전체 무효화
+"""
+from typing import Any, Dict, Iterable, Optional
+from config import settings
+from services.supabase_client import supabase_client
+from services.metrics import external_span, record_cache
+from utils.lru_cache import LRUCache, MISSING
+
+LEGAL_INFO_COLUMNS = "product_code, functional_status, functional_type, all_ingredients, precautions, volume_weight"
+
+
+class ProductCache:
+    def __init__(self):
+        self.products = LRUCache(max_entries=settings.product_cache_max_entries, ttl=settings.product_cache_ttl)
+        self.legal_info = LRUCache(max_entries=settings.product_cache_max_entries, ttl=settings.product_cache_ttl)
+
+    def _store(self, cache: LRUCache, key: str, row: Optional[Dict[str, Any]]):
+        cache.set(key, row, ttl=None if row is not None else settings.product_cache_negative_ttl)
+
+    # ===== Read-through 조회 =====
+    async def aget_product(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """products 행 (없거나 조회 실패 시 None)"""
+        key = str(product_id)
+        cached = self.products.get(key)
+        record_cache("product", cached is not MISSING)
+        if cached is not MISSING:
+            return cached
+
+        try:
+            sb = await supabase_client.get_async_client()
+            with external_span("supabase", "get_product"):
+                response = await sb.table("products").select("*").eq("id", key).execute()
+        except Exception as e:
+            print(f"Error fetching product from Supabase: {e}")
+            return None
+
+        row = response.data[0] if response.data else None
+        self._store(self.products, key, row)
+        return row
+
+    async def aget_legal_info(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """
+        legal_info 행 (product_code = product_id)
+        Returns: 행 dict, 없으면 None
+        Raises: 조회 실패 시 예외 (호출부의 기존 Fallback 처리 유지)
+        """
+        key = str(product_id)
+        cached = self.legal_info.get(key)
+        record_cache("legal_info", cached is not MISSING)
+        if cached is not MISSING:
+            return cached
+
+        sb = await supabase_client.get_async_client()
+        with external_span("supabase", "get_legal_info"):
+            response = await sb.from_("legal_info") \
+                .select(LEGAL_INFO_COLUMNS) \
+                .eq("product_code", key) \
+                .execute()
+
+        row = response.data[0] if response.data else None
+        self._store(self.legal_info, key, row)
+        return row
+
+    # ===== 대량 적재 / 무효화 =====
+    async def prefetch(self, product_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        여러 상품의 products / legal_info 행을 chunk 단위 in_ 쿼리로 적재
+        이미 캐시에 있는 상품은 건너뜀 (DB에 없는 상품은 Negative 캐싱)
+        Returns: {"products": 적재 수, "legal_info": 적재 수}
+        """
+        ids = list(dict.fromkeys(str(pid) for pid in product_ids if pid))
+        loaded = {"products": 0, "legal_info": 0}
+        if not ids:
+            return loaded
+
+        sb = await supabase_client.get_async_client()
+        chunk_size = settings.product_cache_prefetch_chunk_size
+        targets = [
+            ("products", self.products, "products", "*", "id"),
+            ("legal_info", self.legal_info, "legal_info", LEGAL_INFO_COLUMNS, "product_code"),
+        ]
+        for name, cache, table, columns, id_column in targets:
+            missing = [pid for pid in ids if pid not in cache]
+            for start in range(0, len(missing), chunk_size):
+                chunk = missing[start:start + chunk_size]
+                with external_span("supabase", f"prefetch_{name}"):
+                    response = await sb.table(table).select(columns).in_(id_column, chunk).execute()
+                rows = {str(row.get(id_column)): row for row in response.data or []}
+                for pid in chunk:
+                    self._store(cache, pid, rows.get(pid))
+                loaded[name] += len(rows)
+
+        print(f"📦 [Product Cache] Prefetched {loaded['products']} products / {loaded['legal_info']} legal_info ({len(ids)} ids)")
+        return loaded
+
+    def invalidate(self, product_id: Optional[str] = None):
+        """특정 상품(없으면 전체)의 products / legal_info 캐시 무효화"""
+        if product_id is None:
+            self.products.clear()
+            self.legal_info.clear()
+            return
+        self.products.invalidate(str(product_id))
+        self.legal_info.invalidate(str(product_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "products": self.products.stats(),
+            "legal_info": self.legal_info.stats(),
+        }
+
+
+# Global instance
+product_cache = ProductCache()
@@ -0,0 +1,92 @@
+"""
+RecSys Client Service
+Backend → RecSys API 호출용 애플리케이션 공용 HTTP 클라이언트
+(Keep-Alive 커넥션 풀 + HTTP/2 + Timeout + Retry)
+"""
+import asyncio
+import httpx
+from config import settings
+from services.metrics import external_span, record_retry
+from typing import Optional, Dict, Any
+
+# 재시도 대상 HTTP 상태 코드 (일시적 장애)
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+
+class RecSysClient:
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        """
+        커넥션 풀 생성 (main.py startup 이벤트에서 호출)
+        """
+        if self._client is not None:
+            return
+
+        limits = httpx.Limits(
+            max_connections=settings.recsys_max_connections,
+            max_keepalive_connections=settings.recsys_max_keepalive_connections,
+            keepalive_expiry=settings.recsys_keepalive_expiry,
+        )
+        timeout = httpx.Timeout(
+            connect=settings.recsys_connect_timeout,
+            read=settings.recsys_read_timeout,
+            write=settings.recsys_connect_timeout,
+            pool=settings.recsys_connect_timeout,
+        )
+        self._client = httpx.AsyncClient(
+            http2=True,
+            limits=limits,
+            timeout=timeout,
+            # 재시도는 recommend()의 백오프 루프에서만 수행 (transport 재시도와 중첩되지 않도록 0)
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=limits,
+                retries=0,
+            ),
+        )
+        print(f"🔌 [RecSys Client] Pool started (max_connections={settings.recsys_max_connections}, http2=True)")
+
+    async def aclose(self):
+        """
+        커넥션 풀 종료 (main.py shutdown 이벤트에서 호출)
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            print("🔌 [RecSys Client] Pool closed")
+
+    async def recommend(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        RecSys /recommend 호출
+        타임아웃, 연결 오류, 5xx(502/503/504)는 지수 백오프로 재시도하고
+        최종 실패 시 마지막 예외를 그대로 던집니다.
+        """
+        if self._client is None:
+            # startup 이벤트 없이 사용되는 경우 (스크립트/테스트)
+            await self.start()
+
+        url = settings.RECSYS_API_URL
+        attempts = settings.recsys_max_retries + 1
+
+        for attempt in range(1, attempts + 1):
+            try:
+                with external_span("recsys", "recommend"):
+                    response = await self._client.post(url, json=payload)
+                if response.status_code in RETRYABLE_STATUS_CODES and attempt < attempts:
+                    print(f"⚠️ [RecSys Client] {response.status_code} 응답, 재시도 {attempt}/{attempts - 1}")
+                else:
+                    response.raise_for_status()
+                    return response.json()
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                if attempt >= attempts:
+                    raise
+                print(f"⚠️ [RecSys Client] {type(e).__name__}, 재시도 {attempt}/{attempts - 1}")
+
+            record_retry("recsys")
+            await asyncio.sleep(settings.recsys_retry_backoff * (2 ** (attempt - 1)))
+
+
+# Global instance
+recsys_client = RecSysClient()
@@ -0,0 +1,166 @@
+"""
+Regulation Rule Store
+활성 regulation_rules 전체와 임베딩을 메모리(numpy 행렬)에 적재하여
+Compliance 규칙 검색(벡터 + 키워드)을 로컬에서 수행합니다.
+
+- 요청 경로: match_regulation_rules RPC / overlaps 쿼리 없이 행렬곱 + 역색인 조회
+- 규칙 테이블은 작고 변경이 드물어 주기적 전체 재적재 후 통째로 교체 (Atomic Swap)
+- version: 규칙 내용 해시 (규칙이 바뀌면 달라짐, 판정 캐시 키 등에 사용)
+"""
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import numpy as np
+from config import settings
+from services.supabase_client import supabase_client
+from services.metrics import external_span
+from utils.aho_corasick import AhoCorasick
+
+
+def _parse_embedding(value: Any) -> Optional[List[float]]:
+    """pgvector 컬럼은 PostgREST에서 '[0.1,0.2,...]' 문자열로 내려옴"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    return value if isinstance(value, list) and value else None
+
+
+@dataclass(frozen=True)
+class RuleSnapshot:
+    """한 시점의 활성 규칙 (불변)"""
+    rules: List[Dict[str, Any]] = field(default_factory=list)  # embedding 제외
+    # 임베딩이 있는 규칙만 (L2 정규화), embedding_rule_idx[i] = 행렬 i번째 행의 rules 인덱스
+    embeddings: Optional[np.ndarray] = None
+    embedding_rule_idx: List[int] = field(default_factory=list)
+    keyword_index: Dict[str, List[int]] = field(default_factory=dict)  # lower(keyword) -> rules 인덱스
+    keyword_matcher: AhoCorasick = field(default_factory=lambda: AhoCorasick([]))
+    version: str = ""
+
+
+def build_snapshot(rows: List[Dict[str, Any]]) -> RuleSnapshot:
+    rules: List[Dict[str, Any]] = []
+    vectors: List[np.ndarray] = []
+    embedding_rule_idx: List[int] = []
+    keyword_index: Dict[str, List[int]] = {}
+    all_keywords = set()
+
+    for row in sorted(rows, key=lambda r: str(r.get("id"))):
+        idx = len(rules)
+        rule = {k: v for k, v in row.items() if k != "embedding"}
+        rules.append(rule)
+
+        embedding = _parse_embedding(row.get("embedding"))
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm:
+                vectors.append(vector / norm)
+                embedding_rule_idx.append(idx)
+
+        for keyword in rule.get("keywords") or []:
+            if keyword:
+                keyword_index.setdefault(keyword.lower(), []).append(idx)
+                all_keywords.add(keyword)
+
+    version = hashlib.sha256(
+        json.dumps(rules, sort_keys=True, ensure_ascii=False, default=str).encode()
+    ).hexdigest()[:12]
+
+    return RuleSnapshot(
+        rules=rules,
+        embeddings=np.vstack(vectors) if vectors else None,
+        embedding_rule_idx=embedding_rule_idx,
+        keyword_index=keyword_index,
+        # 긴 키워드 우선 (기존 load_all_keywords 정렬과 동일)
+        keyword_matcher=AhoCorasick(sorted(all_keywords, key=len, reverse=True)),
+        version=version,
+    )
+
+
+class RegulationRuleStore:
+    def __init__(self):
+        self._snapshot: Optional[RuleSnapshot] = None
+        self.last_refreshed_at: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def snapshot(self) -> RuleSnapshot:
+        return self._snapshot or RuleSnapshot()
+
+    @property
+    def version(self) -> str:
+        return self.snapshot.version
+
+    async def refresh(self):
+        """활성 규칙 전체 재적재 (실패 시 예외, 기존 스냅샷 유지)"""
+        sb = await supabase_client.get_async_client()
+        with external_span("supabase", "load_regulation_rules"):
+            result = await sb.from_("regulation_rules") \
+                .select("*, regulation_categories(*)") \
+                .eq("is_active", True) \
+                .execute()
+
+        snapshot = build_snapshot(result.data or [])
+        changed = snapshot.version != self.version
+        self._snapshot = snapshot
+        self.last_refreshed_at = time.time()
+        if changed:
+            print(
+                f"📚 [Rule Store] {len(snapshot.rules)} rules / {len(snapshot.embedding_rule_idx)} embeddings 적재 "
+                f"(version={snapshot.version})"
+            )
+
+    async def run_refresh(self):
+        """
+        주기적 재적재 루프 (main.py startup 이벤트에서 Task로 실행)
+        실패 시 기존 스냅샷을 유지하고, 적재 전이면 Compliance는 기존 원격 검색을 사용합니다.
+        """
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"⚠️ [Rule Store] Refresh failed, keeping previous rules: {e}")
+            await asyncio.sleep(settings.regulation_rules_refresh_interval)
+
+    # ===== 로컬 검색 =====
+    def vector_search(self, query_embedding: List[float], threshold: float, top_k: int) -> List[Dict[str, Any]]:
+        """코사인 유사도 threshold 초과 규칙을 유사도 내림차순으로 top_k개 (match_regulation_rules RPC 대체)"""
+        snapshot = self.snapshot
+        if snapshot.embeddings is None or not query_embedding:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        similarities = snapshot.embeddings @ (query / norm)
+
+        candidates = np.nonzero(similarities > threshold)[0]
+        ranked = candidates[np.argsort(-similarities[candidates], kind="stable")][:top_k]
+        return [
+            {**snapshot.rules[snapshot.embedding_rule_idx[i]], "similarity": float(similarities[i])}
+            for i in ranked
+        ]
+
+    def keyword_search(self, keywords: List[str], limit: int) -> List[Dict[str, Any]]:
+        """keywords와 하나라도 겹치는 규칙을 priority 내림차순으로 limit개 (overlaps 쿼리 대체)"""
+        snapshot = self.snapshot
+        indices = sorted({
+            idx for keyword in keywords for idx in snapshot.keyword_index.get(keyword.lower(), [])
+        })
+        ranked = sorted(indices, key=lambda i: snapshot.rules[i].get("priority") or 0, reverse=True)
+        return [snapshot.rules[i] for i in ranked[:limit]]
+
+
+# Global instance
+regulation_rule_store = RegulationRuleStore()
@@ -0,0 +1,169 @@
+"""
+Semantic CRM Cache (Optional)
+exact signature가 Miss여도, 프로필/날씨가 거의 같은 조건에서 생성된 템플릿을 재사용합니다.
+
+- brand / channel / intent / product_name 이 모두 같은 버킷 안에서만 검색 (Strict Filter)
+- 버킷 내부는 signature 입력값(페르소나, 날씨, 뷰티 프로필 4요소) 임베딩의 코사인 유사도로 검색
+- 유사도가 crm_semantic_cache_threshold 이상일 때만 Hit
+- 임베딩 행렬은 프로세스 메모리(numpy)에 보관하며, 저장/Exact Hit 시점에 채워짐
+- settings.crm_semantic_cache_enabled=False 이면 모든 메서드가 No-op
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
+from config import settings
+from services.llm_client import llm_client
+from services.crm_history_service import crm_history_service
+from utils.lru_cache import LRUCache, MISSING
+from services.metrics import record_cache
+
+BucketKey = Tuple[str, str, str, str]
+
+# 통계에서 "이 threshold였다면 Hit율이 얼마였을지" 계산할 후보 값
+THRESHOLD_CANDIDATES = (0.85, 0.9, 0.93, 0.95, 0.97, 0.99)
+
+
+def build_semantic_text(persona: str, weather: str, beauty_profile: Dict) -> str:
+    """signature 입력값 중 버킷 키를 제외한 나머지를 임베딩용 텍스트로 직렬화"""
+    return " | ".join([
+        f"persona: {persona}",
+        f"weather: {weather}",
+        f"skin_type: {', '.join(sorted(beauty_profile.get('skin_type') or []))}",
+        f"skin_concerns: {', '.join(sorted(beauty_profile.get('skin_concerns') or []))}",
+        f"tone: {beauty_profile.get('preferred_tone') or ''}",
+        f"keywords: {', '.join(sorted(beauty_profile.get('keywords') or []))}",
+    ])
+
+
+@dataclass
+class _Bucket:
+    vectors: Optional[np.ndarray] = None  # (N, dim) L2 정규화된 float32
+    messages: List[str] = field(default_factory=list)
+    signatures: List[str] = field(default_factory=list)
+
+
+class SemanticCRMCache:
+    def __init__(self):
+        self.enabled = settings.crm_semantic_cache_enabled
+        self.threshold = settings.crm_semantic_cache_threshold
+        self._buckets: Dict[BucketKey, _Bucket] = {}
+        # lookup Miss 때 만든 임베딩을 저장 시점에 재사용 (같은 요청의 save_crm)
+        self._recent_vectors = LRUCache(max_entries=1000, ttl=600)
+
+        self.lookups = 0
+        self.hits = 0
+        self.empty_bucket_skips = 0
+        self.errors = 0
+        self._recent_best = deque(maxlen=1000)  # 최근 lookup의 최고 유사도
+
+    async def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(await llm_client.aget_embedding(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def lookup(self, brand: str, persona: str, intent: str, weather: str,
+                     product_name: str, channel: str, beauty_profile: Dict) -> Optional[str]:
+        """
+        유사 조건 템플릿 검색
+        Returns: 유사도가 threshold 이상인 템플릿, 없으면 None
+        """
+        if not self.enabled:
+            return None
+
+        self.lookups += 1
+        bucket = self._buckets.get((brand, channel, intent, product_name))
+        if bucket is None or bucket.vectors is None:
+            # 비교 대상이 없으면 임베딩 호출도 생략
+            self.empty_bucket_skips += 1
+            return None
+
+        signature = crm_history_service._generate_signature(
+            brand, persona, intent, weather, product_name, channel, beauty_profile
+        )
+        try:
+            query = await self._embed(build_semantic_text(persona, weather, beauty_profile))
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ [Semantic Cache] Embedding failed: {e}")
+            return None
+        self._recent_vectors.set(signature, query)
+
+        similarities = bucket.vectors @ query
+        best = int(np.argmax(similarities))
+        score = float(similarities[best])
+        self._recent_best.append(score)
+
+        record_cache("crm_semantic", score >= self.threshold)
+        if score >= self.threshold:
+            self.hits += 1
+            print(f"🧲 [Semantic Cache] Hit (similarity={score:.3f} >= {self.threshold})")
+            return bucket.messages[best]
+
+        print(f"💨 [Semantic Cache] Miss (best similarity={score:.3f} < {self.threshold})")
+        return None
+
+    async def add(self, brand: str, persona: str, intent: str, weather: str,
+                  product_name: str, channel: str, beauty_profile: Dict, message_content: str):
+        """
+        템플릿을 버킷 인덱스에 추가 (save_crm 저장 / Exact Hit 시 호출, 이미 있는 signature는 무시)
+        """
+        if not self.enabled or not message_content:
+            return
+
+        signature = crm_history_service._generate_signature(
+            brand, persona, intent, weather, product_name, channel, beauty_profile
+        )
+        key = (brand, channel, intent, product_name)
+        bucket = self._buckets.get(key)
+        if bucket is not None and signature in bucket.signatures:
+            return
+
+        vector = self._recent_vectors.get(signature)
+        if vector is MISSING:
+            try:
+                vector = await self._embed(build_semantic_text(persona, weather, beauty_profile))
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ [Semantic Cache] Embedding failed, not indexed: {e}")
+                return
+
+        # await 이후 버킷을 다시 조회 (동시에 추가된 경우 대비)
+        bucket = self._buckets.setdefault(key, _Bucket())
+        if signature in bucket.signatures:
+            return
+        row = vector[np.newaxis, :]
+        bucket.vectors = row if bucket.vectors is None else np.vstack([bucket.vectors, row])
+        bucket.messages.append(message_content)
+        bucket.signatures.append(signature)
+
+        # 버킷당 최대 항목 수 초과 시 오래된 항목부터 제거
+        overflow = len(bucket.messages) - settings.crm_semantic_cache_max_per_bucket
+        if overflow > 0:
+            bucket.vectors = bucket.vectors[overflow:]
+            del bucket.messages[:overflow]
+            del bucket.signatures[:overflow]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit율 + threshold 조정용 유사도 분포"""
+        scored = list(self._recent_best)
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "empty_bucket_skips": self.empty_bucket_skips,
+            "errors": self.errors,
+            "buckets": len(self._buckets),
+            "entries": sum(len(b.messages) for b in self._buckets.values()),
+            # 최근 lookup 기준, threshold를 바꿨다면 Hit였을 비율
+            "hit_rate_at_threshold": {
+                str(t): round(sum(s >= t for s in scored) / len(scored), 4) if scored else 0.0
+                for t in sorted(set(THRESHOLD_CANDIDATES) | {self.threshold})
+            },
+        }
+
+
+# Global instance
+semantic_crm_cache = SemanticCRMCache()
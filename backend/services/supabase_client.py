@@ -3,14 +3,30 @@
 Supabase Client Service
 Supabase REST API와의 통신을 담당
 """
-from supabase import create_client, Client
+import asyncio
+from supabase import create_client, Client, acreate_client, AsyncClient
 from config import settings
+from services.metrics import external_span
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
 class SupabaseClient:
     def __init__(self):
         self.client: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        # Async client는 이벤트 루프 안에서만 생성 가능하므로 첫 사용 시 생성 (Lazy)
+        self._async_client: Optional[AsyncClient] = None
+        self._async_lock = asyncio.Lock()
+
+    async def get_async_client(self) -> AsyncClient:
+        """
+        프로세스 공용 Async Supabase client 반환
+        LangGraph async 노드들이 같은 커넥션 풀을 공유합니다.
+        """
+        if self._async_client is None:
+            async with self._async_lock:
+                if self._async_client is None:
+                    self._async_client = await acreate_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        return self._async_client
 
     def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -18,7 +34,8 @@ class SupabaseClient:
         Table: customers
         """
         try:
-            response = self.client.table("customers").select("*").eq("user_id", user_id).execute()
+            with external_span("supabase", "get_user"):
+                response = self.client.table("customers").select("*").eq("user_id", user_id).execute()
             if response.data:
                 return response.data[0]
             return None
@@ -26,6 +43,36 @@ class SupabaseClient:
             print(f"Error fetching user from Supabase: {e}")
             return None
 
+    def get_user_ids_by_persona(self, persona_id: str, limit: int = 1000) -> List[str]:
+        """
+        Fetch user IDs belonging to a persona
+        Table: customers
+        PostgREST max-rows(기본 1000)에 잘리지 않도록 user_id 기준 Keyset Pagination으로 limit개까지 수집
+        """
+        try:
+            user_ids: List[str] = []
+            last_user_id = None
+            while len(user_ids) < limit:
+                page_size = min(settings.persona_audience_page_size, limit - len(user_ids))
+                query = (
+                    self.client.table("customers")
+                    .select("user_id")
+                    .eq("persona_id", persona_id)
+                    .order("user_id")
+                    .limit(page_size)
+                )
+                if last_user_id is not None:
+                    query = query.gt("user_id", last_user_id)
+                rows = query.execute().data or []
+                user_ids.extend(row["user_id"] for row in rows)
+                if len(rows) < page_size:
+                    break
+                last_user_id = rows[-1]["user_id"]
+            return user_ids
+        except Exception as e:
+            print(f"Error fetching persona users from Supabase: {e}")
+            return []
+
     def get_product(self, product_id: str) -> Optional[Dict[str, Any]]:
         """
         Fetch product details from Supabase
@@ -40,6 +87,22 @@ class SupabaseClient:
             print(f"Error fetching product from Supabase: {e}")
             return None
 
+    async def aget_product(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Async version of get_product
+        Table: products
+        """
+        try:
+            client = await self.get_async_client()
+            with external_span("supabase", "get_product"):
+                response = await client.table("products").select("*").eq("id", product_id).execute()
+            if response.data:
+                return response.data[0]
+            return None
+        except Exception as e:
+            print(f"Error fetching product from Supabase: {e}")
+            return None
+
     def save_generated_message(self, message_data: Dict[str, Any]) -> bool:
         """
         Save generated message to 'crm_message_history' table
@@ -10,6 +10,7 @@ Metrics covered:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
 import statistics
@@ -291,16 +292,16 @@ def evaluate_workflow_stability_and_recovery(cfg: EvalConfig) -> Dict[str, Any]:
     original_judge = compliance_check.call_llm_judge
     from services.llm_client import llm_client
 
-    original_generate = llm_client.generate_chat_completion
+    original_generate = llm_client.agenerate_chat_completion
     calls = {"judge": 0}
 
-    def stub_generate_chat_completion(*_args: Any, **_kwargs: Any) -> Dict[str, Any]:
+    async def stub_generate_chat_completion(*_args: Any, **_kwargs: Any) -> Dict[str, Any]:
         return {
             "content": "Hello {{customer_name}}, check out our offer.",
             "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
         }
 
-    def sequence_judge(_prompt: str) -> Dict[str, Any]:
+    async def sequence_judge(_prompt: str) -> Dict[str, Any]:
         calls["judge"] += 1
         if calls["judge"] <= 2:
             return {
@@ -326,7 +327,7 @@ def evaluate_workflow_stability_and_recovery(cfg: EvalConfig) -> Dict[str, Any]:
             "suggestions": "",
         }
 
-    llm_client.generate_chat_completion = stub_generate_chat_completion
+    llm_client.agenerate_chat_completion = stub_generate_chat_completion
     compliance_check.call_llm_judge = sequence_judge
 
     state = _build_sample_state()
@@ -334,15 +335,15 @@ def evaluate_workflow_stability_and_recovery(cfg: EvalConfig) -> Dict[str, Any]:
     max_retries = 5
     while True:
         attempts += 1
-        state = message_writer_node(state)
-        state = compliance_check.compliance_check_node(state)
+        state = asyncio.run(message_writer_node(state))
+        state = asyncio.run(compliance_check.compliance_check_node(state))
         if state.get("compliance_passed"):
             break
         if state.get("retry_count", 0) >= max_retries:
             break
 
     compliance_check.call_llm_judge = original_judge
-    llm_client.generate_chat_completion = original_generate
+    llm_client.agenerate_chat_completion = original_generate
 
     return {
         "attempts": attempts,
@@ -357,28 +358,28 @@ def estimate_generation_cost(cfg: EvalConfig) -> Dict[str, Any]:
     from services.llm_client import llm_client
 
     usage_records = []
-    original_generate = llm_client.generate_chat_completion
+    original_generate = llm_client.agenerate_chat_completion
 
-    def wrapped_generate(*args: Any, **kwargs: Any) -> Dict[str, Any]:
-        result = original_generate(*args, **kwargs)
+    async def wrapped_generate(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        result = await original_generate(*args, **kwargs)
         usage_records.append(result.get("usage", {}))
         return result
 
-    def stub_generate(*_args: Any, **_kwargs: Any) -> Dict[str, Any]:
+    async def stub_generate(*_args: Any, **_kwargs: Any) -> Dict[str, Any]:
         usage = {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
         usage_records.append(usage)
         return {"content": "Hello {{customer_name}}", "usage": usage}
 
     if cfg.enable_llm_judge and cfg.openai_api_key:
-        llm_client.generate_chat_completion = wrapped_generate
+        llm_client.agenerate_chat_completion = wrapped_generate
     else:
-        llm_client.generate_chat_completion = stub_generate
+        llm_client.agenerate_chat_completion = stub_generate
 
     for _ in range(cfg.samples_per_user):
         state = _build_sample_state()
-        message_writer_node(state)
+        asyncio.run(message_writer_node(state))
 
-    llm_client.generate_chat_completion = original_generate
+    llm_client.agenerate_chat_completion = original_generate
 
     prompt_tokens = [u.get("prompt_tokens", 0) for u in usage_records if u]
     completion_tokens = [u.get("completion_tokens", 0) for u in usage_records if u]
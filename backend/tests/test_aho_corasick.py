@@ -0,0 +1,29 @@
+import sys
+import unittest
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.aho_corasick import AhoCorasick
+
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_matches_same_keywords_as_substring_search(self):
+        keywords = ["미백 효과", "피부 재생", "미백", "주름", "FDA", "재생"]
+        text = "fda 인증! 미백 효과와 피부 재생을 한 번에"
+        matcher = AhoCorasick(keywords)
+
+        expected = [k for k in keywords if k.lower() in text.lower()]
+        self.assertEqual(matcher.find_all(text), expected)
+        self.assertEqual(matcher.find_all(text), ["미백 효과", "피부 재생", "미백", "FDA", "재생"])
+
+    def test_no_hits_and_duplicate_patterns(self):
+        matcher = AhoCorasick(["주름", "주름", "", "탈모"])
+        self.assertEqual(len(matcher), 2)
+        self.assertEqual(matcher.find_all("촉촉한 수분 크림"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import hashlib
+import sys
+import unittest
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.bloom_filter import BloomFilter
+
+
+def _sig(i):
+    return hashlib.sha256(f"sig-{i}".encode()).hexdigest()
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=10000, error_rate=0.01)
+        for i in range(10000):
+            bloom.add(_sig(i))
+
+        self.assertTrue(all(_sig(i) in bloom for i in range(10000)))
+        false_positives = sum(_sig(i) in bloom for i in range(10000, 30000))
+        self.assertLess(false_positives / 20000, 0.02)
+
+    def test_duplicate_add_does_not_increase_count(self):
+        bloom = BloomFilter(capacity=100, error_rate=0.01)
+        self.assertTrue(bloom.add("sig"))
+        self.assertFalse(bloom.add("sig"))
+        bloom.add("sig")
+        self.assertEqual(bloom.count, 1)
+
+    def test_compact_size(self):
+        # 100만 signature / 1% → 약 1.2MB
+        bloom = BloomFilter(capacity=1_000_000, error_rate=0.01)
+        self.assertLess(bloom.size_bytes, 1.3 * 1024 * 1024)
+        self.assertEqual(bloom.num_hashes, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
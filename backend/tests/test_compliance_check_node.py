@@ -0,0 +1,93 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from actions.compliance_check import compliance_check_node
+from config import settings
+
+PASS = {"passed": True, "violated_rules": [], "reasoning": "ok", "confidence": 0.9}
+
+
+def make_state(message="{customer_name}님, 촉촉한 크림을 만나보세요."):
+    return {
+        "message": message,
+        "message_template": message,
+        "product_data": {"product_id": "p1", "name": "크림", "brand": "브랜드"},
+        "retry_count": 0,
+        "retrieved_legal_rules": [],
+    }
+
+
+class TestComplianceCheckNode(unittest.TestCase):
+    def setUp(self):
+        self.evaluate = AsyncMock(return_value=(PASS, ["rule"]))
+        for target, mock in [
+            ("actions.compliance_check.evaluate_message", self.evaluate),
+            ("actions.compliance_check.extract_legal_info_from_product", AsyncMock(return_value={})),
+            ("actions.compliance_check.save_compliance_history", AsyncMock()),
+        ]:
+            patcher = patch(target, mock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_bypass_forces_pass_without_evaluation(self):
+        with patch.object(settings, "compliance_bypass", True):
+            state = asyncio.run(compliance_check_node(make_state()))
+        self.assertTrue(state["compliance_passed"])
+        self.assertEqual(state["llm_reasoning"], "Bypass Mode Activated")
+        self.evaluate.assert_not_called()
+
+    def test_disabled_bypass_runs_evaluation(self):
+        with patch.object(settings, "compliance_bypass", False):
+            state = asyncio.run(compliance_check_node(make_state()))
+        self.assertTrue(state["compliance_passed"])
+        self.assertEqual(state["llm_reasoning"], "ok")
+        self.assertEqual(state["retrieved_legal_rules"], ["rule"])
+        self.evaluate.assert_awaited_once()
+
+    def test_keeps_first_passing_candidate(self):
+        fail = {"passed": False, "violated_rules": [{"rule_title": "r2"}], "reasoning": "bad", "confidence": 0.8}
+        verdicts = {"A": fail, "B": PASS, "C": PASS}
+        self.evaluate.side_effect = lambda message, *args: (verdicts[message], ["rule"])
+
+        state = make_state("A")
+        state["message_candidates"] = ["A", "B", "C"]
+        with patch.object(settings, "compliance_bypass", False):
+            state = asyncio.run(compliance_check_node(state))
+
+        self.assertEqual(self.evaluate.await_count, 3)
+        self.assertTrue(state["compliance_passed"])
+        self.assertEqual(state["message"], "B")
+        self.assertEqual(state["message_template"], "B")
+        self.assertEqual(state["violated_rules"], [])
+
+    def test_uses_first_candidate_violations_when_none_pass(self):
+        verdicts = {
+            "A": {"passed": False, "violated_rules": [{"rule_title": "r1", "violated_expression": "미백"}],
+                  "reasoning": "first", "confidence": 0.8},
+            "B": {"passed": False, "violated_rules": [{"rule_title": "r2", "violated_expression": "치료"}],
+                  "reasoning": "second", "confidence": 0.8},
+        }
+        self.evaluate.side_effect = lambda message, *args: (verdicts[message], ["rule"])
+
+        state = make_state("B")
+        state["message_candidates"] = ["A", "B"]
+        with patch.object(settings, "compliance_bypass", False):
+            state = asyncio.run(compliance_check_node(state))
+
+        self.assertFalse(state["compliance_passed"])
+        self.assertEqual(state["message"], "A")
+        self.assertEqual(state["message_template"], "A")
+        self.assertEqual(state["violated_rules"], verdicts["A"]["violated_rules"])
+        self.assertEqual(state["llm_reasoning"], "first")
+        self.assertEqual(state["retry_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from actions.compliance_check import MOCK_RULES
+from actions.compliance_repair import compliance_repair_node, repair_message
+from graph import after_repair, should_retry
+from services.regulation_rule_store import regulation_rule_store, build_snapshot
+
+RULES = [
+    {"id": "r1", "rule_title": "비기능성 미백 표현 금지", "keywords": ["미백", "화이트닝"],
+     "allowed_examples": ["맑은 피부 표현"]},
+    {"id": "r2", "rule_title": "의약품 오인 표현 금지", "keywords": ["치료"], "allowed_examples": []},
+]
+
+
+class TestComplianceRepair(unittest.TestCase):
+    def setUp(self):
+        self._saved_snapshot = regulation_rule_store._snapshot
+        regulation_rule_store._snapshot = build_snapshot(RULES)
+
+    def tearDown(self):
+        regulation_rule_store._snapshot = self._saved_snapshot
+
+    def test_replaces_with_allowed_example_and_strips(self):
+        message = "{customer_name}님, 화이트닝 크림으로 트러블 치료 !\n지금 확인하세요."
+        violations = [
+            {"rule_id": "r1", "violated_expression": "'화이트닝'"},
+            {"rule_title": "의약품 오인 표현 금지", "violated_expression": "치료"},
+        ]
+        repaired = repair_message(message, violations, RULES)
+        self.assertEqual(repaired, "{customer_name}님, 맑은 피부 표현 크림으로 트러블!\n지금 확인하세요.")
+
+    def test_unrepairable_returns_none(self):
+        # 위반 표현이 메시지에 없으면 수정 불가 → LLM 재생성
+        self.assertIsNone(repair_message("촉촉한 보습 크림", [{"rule_id": "r1", "violated_expression": "미백"}], RULES))
+        # 알 수 없는 규칙 + 위반 표현이 메시지 전체면 빈 메시지가 되므로 실패
+        self.assertIsNone(repair_message("미백", [{"violated_expression": "미백"}], []))
+
+    def test_only_reported_expression_on_token_boundary(self):
+        # 규칙 키워드 전체가 아닌 지적된 표현만, 다른 단어 일부('PAck', 'Spa')는 그대로
+        rules = MOCK_RULES + RULES
+        message = "수분 PAck으로 Spa 같은 하루, 피부결 개선과 미백 효과"
+        violations = [{"rule_id": "r1", "violated_expression": "미백"}]
+        self.assertEqual(
+            repair_message(message, violations, rules),
+            "수분 PAck으로 Spa 같은 하루, 피부결 개선과 맑은 피부 표현 효과",
+        )
+        self.assertIsNone(repair_message(message, [{"violated_expression": "pa"}], rules))
+
+    def test_repaired_message_is_rechecked(self):
+        state = {"message": "화이트닝 크림", "violated_rules": [{"rule_id": "r1", "violated_expression": "화이트닝"}],
+                 "retrieved_legal_rules": RULES, "compliance_passed": False, "retry_count": 1}
+        state = asyncio.run(compliance_repair_node(state))
+        self.assertFalse(state["compliance_passed"])
+        self.assertEqual(state["message"], "맑은 피부 표현 크림")
+        self.assertEqual(after_repair(state), "compliance_check")
+
+        # 재검수에서 다시 실패하면 Repair 반복 없이 재생성
+        state["violated_rules"] = [{"rule_id": "r1", "violated_expression": "맑은 피부"}]
+        self.assertEqual(should_retry(state), "message_writer")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.compliance_verdict_cache import (
+    ComplianceVerdictCache, MemoryVerdictBackend, make_verdict_key,
+)
+from services.regulation_rule_store import regulation_rule_store, build_snapshot
+
+LEGAL_INFO = {"functional_status": "기능성 필함", "functional_types": ["미백", "주름개선"]}
+VERDICT = {"passed": True, "violated_rules": [], "reasoning": "ok", "confidence": 0.9}
+
+
+class TestComplianceVerdictCache(unittest.TestCase):
+    def setUp(self):
+        self._saved_snapshot = regulation_rule_store._snapshot
+        regulation_rule_store._snapshot = build_snapshot([{"id": "r1", "keywords": ["미백"]}])
+        self.cache = ComplianceVerdictCache(MemoryVerdictBackend(max_entries=100, ttl=60))
+
+    def tearDown(self):
+        regulation_rule_store._snapshot = self._saved_snapshot
+
+    def test_key_normalizes_message_and_types(self):
+        key = make_verdict_key("안녕하세요\n  고객님", LEGAL_INFO, "v1")
+        reordered = dict(LEGAL_INFO, functional_types=["주름개선", "미백"])
+        self.assertEqual(key, make_verdict_key(" 안녕하세요 고객님 ", reordered, "v1"))
+        self.assertNotEqual(key, make_verdict_key("안녕하세요 고객님", LEGAL_INFO, "v2"))
+        self.assertNotEqual(key, make_verdict_key("안녕하세요 고객님", {"functional_status": None}, "v1"))
+
+    def test_hit_and_rule_change_invalidates(self):
+        async def scenario():
+            self.assertIsNone(await self.cache.get("메시지", LEGAL_INFO))
+            await self.cache.set("메시지", LEGAL_INFO, VERDICT)
+            self.assertEqual(await self.cache.get("메시지", LEGAL_INFO), VERDICT)
+
+            regulation_rule_store._snapshot = build_snapshot([{"id": "r1", "keywords": ["치료"]}])
+            self.assertIsNone(await self.cache.get("메시지", LEGAL_INFO))
+
+        asyncio.run(scenario())
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_disabled_until_rule_store_ready(self):
+        regulation_rule_store._snapshot = None
+
+        async def scenario():
+            await self.cache.set("메시지", LEGAL_INFO, VERDICT)
+            return await self.cache.get("메시지", LEGAL_INFO)
+
+        self.assertIsNone(asyncio.run(scenario()))
+        self.assertEqual(self.cache.misses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
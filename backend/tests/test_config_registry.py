@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.config_registry import ConfigRegistry, PERSONA_DB_PATH, CRM_GUIDELINE_PATH, FALLBACK_MESSAGES_PATH
+
+
+class TestConfigRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.persona_path = os.path.join(self.tmp.name, "persona_db.json")
+        self._write(self.persona_path, {
+            "1": {"persona_name": "A", "description": "d", "recommended_brands": ["설화수"], "tone": "t", "keywords": []}
+        })
+
+        # persona 파일만 임시 파일로 교체, 나머지는 실제 설정 파일 사용
+        self.registry = ConfigRegistry()
+        self.registry._FILES = dict(ConfigRegistry._FILES)
+        self.registry._FILES[self.persona_path] = self.registry._FILES.pop(PERSONA_DB_PATH)
+
+    def _write(self, path, data, mtime_offset=0):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        if mtime_offset:
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + mtime_offset))
+
+    def test_lookups(self):
+        """페르소나 P 접두사 정규화 및 영문 브랜드명 매핑"""
+        self.assertEqual(self.registry.get_persona("P1").persona_name, "A")
+        self.assertIsNone(self.registry.get_persona("9"))
+
+        brand, group = self.registry.get_brand_guideline("Sulwhasoo")
+        self.assertEqual(brand.group, "Luxury_Heritage")
+        self.assertTrue(group.rules)
+        self.assertIsNotNone(self.registry.get_brand_fallback("설화수"))
+
+    def test_reload_on_mtime_change(self):
+        """mtime이 바뀐 경우에만 새 스냅샷으로 교체"""
+        before = self.registry.snapshot
+        self.assertFalse(self.registry.reload_if_changed())
+        self.assertIs(self.registry.snapshot, before)
+
+        self._write(self.persona_path, {
+            "1": {"persona_name": "B", "description": "d", "tone": "t"}
+        }, mtime_offset=10_000_000)
+        self.assertTrue(self.registry.reload_if_changed())
+        self.assertEqual(self.registry.get_persona("1").persona_name, "B")
+        # 바뀌지 않은 파일은 기존 객체 재사용
+        self.assertIs(self.registry.snapshot.guideline, before.guideline)
+
+    def test_invalid_file_keeps_previous_snapshot(self):
+        """검증 실패 시 기존 설정 유지"""
+        self.registry.snapshot
+        self._write(self.persona_path, {"1": {"persona_name": "broken"}}, mtime_offset=10_000_000)
+        self.registry.reload_if_changed()
+        self.assertEqual(self.registry.get_persona("1").persona_name, "A")
+
+        # 실패한 파일의 mtime도 기록 → 파일이 다시 바뀔 때까지 재파싱하지 않음
+        with unittest.mock.patch("services.config_registry.open") as mock_open:
+            self.assertFalse(self.registry.reload_if_changed())
+        mock_open.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.crm_history_service import CRMHistoryService
+
+
+class FakeQuery:
+    """crm_message_history 조회 흉내 (id/created_at 필터 + order + range/limit)"""
+    def __init__(self, rows, calls):
+        self.rows = rows
+        self.calls = calls
+        self.filters = []
+        self.window = None
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def order(self, column):
+        self.order_by = column
+        return self
+
+    def limit(self, n):
+        self.window = (0, n)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end - start + 1)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    async def execute(self):
+        self.calls.append(self.filters)
+        rows = self.rows
+        for column, value in self.filters:
+            if column == "created_at":
+                since = CRMHistoryService._parse_timestamp(value)
+                rows = [r for r in rows if CRMHistoryService._parse_timestamp(r["created_at"]) > since]
+            else:
+                rows = [r for r in rows if r[column] > value]
+        rows = sorted(rows, key=lambda r: r[self.order_by])
+        start, size = self.window
+        return MagicMock(data=rows[start:start + size])
+
+
+class TestSignatureFilterSync(unittest.TestCase):
+    def setUp(self):
+        with patch("services.crm_history_service.create_client"):
+            self.service = CRMHistoryService()
+        self.rows = []
+        self.calls = []
+        sb = MagicMock()
+        sb.table.side_effect = lambda name: FakeQuery(self.rows, self.calls)
+
+        async def get_async_client():
+            return sb
+
+        patcher = patch("services.crm_history_service.supabase_client.get_async_client", get_async_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_mixed_offsets_compare_as_instants(self):
+        # KST 로컬 저장 후 5분 뒤 UTC로 반환된 DB 행은 watermark를 앞당겨야 함
+        self.service._add_local_signature("local", "2026-10-17T12:00:00+09:00")
+        self.service._add_signatures([{"query_signature": "db", "created_at": "2026-10-17T03:05:00+00:00"}])
+        self.assertEqual(self.service._filter_watermark.isoformat(), "2026-10-17T03:05:00+00:00")
+
+        # 더 이른 시각(문자열로는 더 큼)은 watermark를 되돌리지 않음
+        self.service._advance_watermark("2026-10-17T11:59:00+09:00")
+        self.assertEqual(self.service._filter_watermark.isoformat(), "2026-10-17T03:05:00+00:00")
+
+    def test_empty_table_seeds_watermark_and_sync_adds_each_row_once(self):
+        asyncio.run(self.service.load_signature_filter())
+        self.assertIsNotNone(self.service._filter_watermark)
+        seeded = self.service._filter_watermark
+
+        # 다른 워커가 적재 이후 저장
+        later = datetime.fromtimestamp(seeded.timestamp() + 60, tz=seeded.tzinfo).isoformat()
+        self.rows.append({"id": 1, "query_signature": "remote", "created_at": later})
+
+        for _ in range(3):
+            asyncio.run(self.service.sync_signature_filter())
+
+        self.assertIn("remote", self.service.signature_filter)
+        self.assertEqual(self.service.signature_filter.count, 1)
+        self.assertEqual(self.service._filter_watermark, CRMHistoryService._parse_timestamp(later))
+        # 이후 sync는 watermark 초과(gt) 조회이므로 경계 행을 다시 받지 않음
+        self.assertEqual(self.calls[-1], [("created_at", self.service._filter_watermark.isoformat())])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.lru_cache import LRUCache, MISSING
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # a를 최근 사용으로 갱신
+        cache.set("c", 3)
+
+        self.assertIs(cache.get("b"), MISSING)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_negative_entry_with_short_ttl(self):
+        cache = LRUCache(max_entries=10, ttl=60)
+        cache.set("sig", None, ttl=0.01)
+        self.assertIsNone(cache.get("sig"))
+
+        time.sleep(0.02)
+        self.assertIs(cache.get("sig"), MISSING)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from actions.message_writer import message_writer_node
+from config import settings
+from models.user import CustomerProfile
+
+USAGE = {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+
+
+def make_state(**overrides):
+    state = {
+        "user_data": CustomerProfile(user_id="u1", skin_type=["Dry"], skin_concerns=[], keywords=[]),
+        "product_data": {
+            "name": "윤조에센스", "brand": "설화수", "price": {"discount_rate": 10},
+            "description_short": "x", "review": {"top_keywords": ["촉촉"]},
+        },
+        "brand_tone": {},
+        "channel": "SMS",
+        "retry_count": 1,
+        "message_candidates": ["이전 후보 1", "이전 후보 2"],
+    }
+    state.update(overrides)
+    return state
+
+
+class TestMessageWriterCandidates(unittest.TestCase):
+    def setUp(self):
+        self.llm = patch("actions.message_writer.llm_client").start()
+        self.addCleanup(patch.stopall)
+        self.llm.agenerate_chat_completion = AsyncMock(return_value={"content": "단일", "usage": USAGE})
+        self.llm.astream_chat_completion = AsyncMock(return_value={"content": "스트림", "usage": USAGE})
+        self.llm.agenerate_chat_candidates = AsyncMock(
+            return_value={"contents": ["후보 1", "후보 2", "후보 3"], "usage": USAGE}
+        )
+        patch.object(settings, "writer_candidate_count", 3).start()
+
+    def test_generates_candidates_when_compliance_enabled(self):
+        with patch.object(settings, "compliance_bypass", False):
+            state = asyncio.run(message_writer_node(make_state()))
+        self.assertEqual(state["message_candidates"], ["후보 1", "후보 2", "후보 3"])
+        self.assertEqual(state["message"], "후보 1")
+        self.assertEqual(self.llm.agenerate_chat_candidates.await_args.kwargs["n"], 3)
+
+    def test_bypass_skips_candidate_generation(self):
+        with patch.object(settings, "compliance_bypass", True):
+            state = asyncio.run(message_writer_node(make_state()))
+        self.llm.agenerate_chat_candidates.assert_not_called()
+        self.assertEqual(state["message"], "단일")
+        self.assertEqual(state["message_candidates"], [])
+
+    def test_streaming_clears_previous_candidates(self):
+        with patch.object(settings, "compliance_bypass", False), \
+                patch("actions.message_writer.get_stream_writer", return_value=lambda event: None):
+            state = asyncio.run(message_writer_node(make_state(stream_tokens=True)))
+        self.llm.agenerate_chat_candidates.assert_not_called()
+        self.assertEqual(state["message"], "스트림")
+        self.assertEqual(state["message_candidates"], [])
+
+    def test_failed_generation_clears_previous_candidates(self):
+        self.llm.agenerate_chat_candidates.side_effect = RuntimeError("boom")
+        with patch.object(settings, "compliance_bypass", False):
+            state = asyncio.run(message_writer_node(make_state()))
+        self.assertIn("boom", state["error"])
+        self.assertEqual(state["message_candidates"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services import metrics
+
+
+def _node_count(node):
+    return [s.value for s in metrics.NODE_LATENCY.collect()[0].samples
+            if s.name.endswith("_count") and s.labels == {"node": node, "outcome": "ok"}]
+
+
+class TestMetrics(unittest.TestCase):
+    def test_disabled_returns_original_node_and_noop_span(self):
+        async def node(state):
+            return state
+
+        with patch.object(metrics.settings, "metrics_enabled", False):
+            self.assertIs(metrics.traced_node("n", node), node)
+            self.assertIs(metrics.external_span("openai", "chat"), metrics.external_span("recsys", "recommend"))
+
+    def test_enabled_records_node_latency_and_keeps_signature(self):
+        async def node(state: dict) -> dict:
+            return {"ok": True}
+
+        with patch.object(metrics.settings, "metrics_enabled", True):
+            traced = metrics.traced_node("test_node", node)
+
+        self.assertEqual(traced.__annotations__, node.__annotations__)
+        self.assertEqual(asyncio.run(traced({})), {"ok": True})
+        self.assertEqual(_node_count("test_node"), [1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
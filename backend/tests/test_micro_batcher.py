@@ -0,0 +1,77 @@
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.micro_batcher import MicroBatcher
+from actions.compliance_check import merge_batch_rules, parse_batch_verdicts
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_groups_by_key_and_preserves_order(self):
+        calls = []
+
+        async def handler(group_key, items):
+            calls.append((group_key, list(items)))
+            return [f"{group_key}:{item}" for item in items]
+
+        async def scenario():
+            batcher = MicroBatcher(handler, max_batch_size=3, max_wait=0.01)
+            return await asyncio.gather(*[
+                batcher.submit("a" if i % 2 == 0 else "b", i) for i in range(5)
+            ])
+
+        results = asyncio.run(scenario())
+        self.assertEqual(results, ["a:0", "b:1", "a:2", "b:3", "a:4"])
+        self.assertEqual(sorted(calls), [("a", [0, 2, 4]), ("b", [1, 3])])
+
+    def test_handler_error_propagates_to_all(self):
+        async def handler(group_key, items):
+            raise RuntimeError("boom")
+
+        async def scenario():
+            batcher = MicroBatcher(handler, max_batch_size=10, max_wait=0.01)
+            return await asyncio.gather(batcher.submit("k", 1), batcher.submit("k", 2), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in asyncio.run(scenario())))
+
+    def test_running_batch_tasks_are_referenced_until_done(self):
+        async def handler(group_key, items):
+            await asyncio.sleep(0.01)
+            return items
+
+        async def scenario():
+            batcher = MicroBatcher(handler, max_batch_size=2, max_wait=1)
+            pending = asyncio.gather(batcher.submit("k", 1), batcher.submit("k", 2))
+            await asyncio.sleep(0)
+            running = len(batcher._tasks)
+            results = await pending
+            await asyncio.sleep(0)
+            return running, results, len(batcher._tasks)
+
+        self.assertEqual(asyncio.run(scenario()), (1, [1, 2], 0))
+
+
+class TestBatchVerdicts(unittest.TestCase):
+    def test_parse_requires_every_index(self):
+        content = json.dumps({"results": [
+            {"index": 1, "passed": False, "violated_rules": [{"rule_title": "미백"}]},
+            {"index": 0, "passed": True},
+        ]})
+        verdicts = parse_batch_verdicts(content, 2)
+        self.assertEqual([v["passed"] for v in verdicts], [True, False])
+        self.assertIsNone(parse_batch_verdicts(content, 3))
+        self.assertIsNone(parse_batch_verdicts("not json", 2))
+
+    def test_merge_rules_interleaves_and_dedupes(self):
+        merged = merge_batch_rules([[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 1}, {"id": 4}]], limit=3)
+        self.assertEqual([r["id"] for r in merged], [1, 3, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
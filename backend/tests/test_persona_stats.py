@@ -0,0 +1,64 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.persona_stats_service import PersonaStatsService
+
+
+def _row(user_id, skin, concerns, tone, keywords, brands="", persona_id="1"):
+    return {
+        "user_id": user_id, "persona_id": persona_id, "brand_purchases": brands,
+        "skin_type": skin, "skin_concerns": concerns, "preferred_tone": tone, "keywords": keywords,
+    }
+
+
+def _change(event, record=None, old_record=None):
+    return {"data": {"type": event, "record": record, "old_record": old_record or {}}}
+
+
+class TestPersonaStatsIndex(unittest.TestCase):
+    def setUp(self):
+        self.service = PersonaStatsService()
+        self.service.last_refreshed_at = time.time()
+        for row in [
+            _row("u1", ["Dry"], ["Wrinkle", "Pore"], "Warm", ["Vegan"], "설화수,헤라"),
+            _row("u2", "Dry", "Pore, Wrinkle", "Warm", ["Vegan"], ["설화수"]),  # 순서/형식만 다른 완전 일치
+            _row("u3", ["Dry"], ["Acne"], "Warm", [], "라네즈"),                  # 부분 일치
+            _row("u4", ["Oily"], ["Wrinkle", "Pore"], "Warm", ["Vegan"]),          # 불일치
+            _row("u5", ["Dry"], ["Wrinkle", "Pore"], "Warm", ["Vegan"], persona_id="2"),
+        ]:
+            self.service.handle_user_data_change(_change("INSERT", row))
+        self.target = (["Dry"], ["Pore", "Wrinkle"], "Warm", ["Vegan"])
+
+    def test_exact_matches_come_before_partial(self):
+        result = self.service.find_similar_users("1", *self.target, exclude_user_id="u1")
+        self.assertEqual(result, ["u2", "u3"])
+        self.assertEqual(self.service.get_brand_counts("1"), {"설화수": 2, "헤라": 1, "라네즈": 1})
+
+    def test_top_profiles(self):
+        profiles = self.service.top_profiles("1", limit=2)
+        self.assertEqual([(user_id, count) for _, user_id, count in profiles], [("u1", 2), ("u3", 1)])
+        self.assertEqual(self.service.persona_ids(), ["1", "2"])
+
+    def test_pagination(self):
+        self.assertEqual(self.service.find_similar_users("1", *self.target, offset=1, limit=1), ["u2"])
+        self.assertEqual(self.service.find_similar_users("1", *self.target, offset=3, limit=5), [])
+
+    def test_update_and_delete_are_applied_incrementally(self):
+        # u3 프로필 변경 → 완전 일치로 이동, 구매 브랜드 교체
+        self.service.handle_user_data_change(
+            _change("UPDATE", _row("u3", ["Dry"], ["Wrinkle", "Pore"], "Warm", ["Vegan"], "헤라"))
+        )
+        self.service.handle_user_data_change(_change("DELETE", old_record={"user_id": "u2"}))
+
+        self.assertEqual(self.service.find_similar_users("1", *self.target), ["u1", "u3"])
+        self.assertEqual(self.service.get_brand_counts("1"), {"설화수": 1, "헤라": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.product_cache import ProductCache
+
+
+class _Query:
+    """Supabase 쿼리 빌더 대역 (select/eq/in_ 체이닝 후 execute)"""
+    def __init__(self, db, table):
+        self.db, self.table = db, table
+        self.filters = []
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, [value]))
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, list(values)))
+        return self
+
+    async def execute(self):
+        self.db.calls += 1
+        rows = self.db.tables[self.table]
+        for column, values in self.filters:
+            rows = [row for row in rows if str(row[column]) in values]
+        return type("Response", (), {"data": rows})()
+
+
+class _FakeDB:
+    def __init__(self):
+        self.calls = 0
+        self.tables = {
+            "products": [{"id": "1", "name": "A"}, {"id": "2", "name": "B"}],
+            "legal_info": [{"product_code": "1", "functional_status": "기능성 필함"}],
+        }
+
+    def table(self, name):
+        return _Query(self, name)
+
+    from_ = table
+
+
+class TestProductCache(unittest.TestCase):
+    def setUp(self):
+        self.db = _FakeDB()
+
+        async def get_async_client():
+            return self.db
+
+        patcher = patch("services.product_cache.supabase_client.get_async_client", get_async_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ProductCache()
+
+    def test_read_through_and_negative_cache(self):
+        async def scenario():
+            for _ in range(3):
+                self.assertEqual((await self.cache.aget_product("1"))["name"], "A")
+                self.assertIsNone(await self.cache.aget_legal_info("2"))
+
+        asyncio.run(scenario())
+        self.assertEqual(self.db.calls, 2)
+
+    def test_prefetch_then_invalidate(self):
+        async def scenario():
+            await self.cache.prefetch(["1", "2", "3"])
+            prefetch_calls = self.db.calls
+            self.assertEqual((await self.cache.aget_legal_info("1"))["functional_status"], "기능성 필함")
+            self.assertIsNone(await self.cache.aget_product("3"))
+            self.assertEqual(self.db.calls, prefetch_calls)
+
+            self.cache.invalidate("1")
+            await self.cache.aget_product("1")
+            self.assertEqual(self.db.calls, prefetch_calls + 1)
+
+        asyncio.run(scenario())
+        self.assertEqual(self.db.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
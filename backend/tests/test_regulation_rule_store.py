@@ -0,0 +1,45 @@
+import sys
+import unittest
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.regulation_rule_store import RegulationRuleStore, build_snapshot
+
+
+RULES = [
+    {"id": "r1", "priority": 100, "keywords": ["미백", "Whitening"], "embedding": "[1, 0, 0]"},
+    {"id": "r2", "priority": 50, "keywords": ["치료"], "embedding": [0.6, 0.8, 0]},
+    {"id": "r3", "priority": 80, "keywords": ["미백 효과"], "embedding": None},
+]
+
+
+class TestRegulationRuleStore(unittest.TestCase):
+    def setUp(self):
+        self.store = RegulationRuleStore()
+        self.store._snapshot = build_snapshot(RULES)
+
+    def test_vector_search_matches_rpc_semantics(self):
+        # threshold 초과만, 유사도 내림차순, top_k 제한, embedding 없는 규칙 제외
+        results = self.store.vector_search([2, 0, 0], threshold=0.5, top_k=10)
+        self.assertEqual([r["id"] for r in results], ["r1", "r2"])
+        self.assertNotIn("embedding", results[0])
+        self.assertEqual([r["id"] for r in self.store.vector_search([0, 0, 1], 0.5, 10)], [])
+        self.assertEqual([r["id"] for r in self.store.vector_search([1, 0, 0], 0.5, 1)], ["r1"])
+
+    def test_keyword_search_and_matcher(self):
+        keywords = self.store.snapshot.keyword_matcher.find_all("WHITENING 미백 효과 보장")
+        self.assertEqual(keywords, ["Whitening", "미백 효과", "미백"])
+        results = self.store.keyword_search(keywords, limit=10)
+        self.assertEqual([r["id"] for r in results], ["r1", "r3"])
+
+    def test_version_changes_with_rule_content(self):
+        changed = [dict(RULES[0], priority=10)] + RULES[1:]
+        self.assertEqual(build_snapshot(list(reversed(RULES))).version, self.store.version)
+        self.assertNotEqual(build_snapshot(changed).version, self.store.version)
+
+
+if __name__ == "__main__":
+    unittest.main()
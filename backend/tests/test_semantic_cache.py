@@ -0,0 +1,60 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.semantic_cache import SemanticCRMCache
+
+
+async def fake_embedding(text):
+    # keyword 개수만 다른 프로필이 가깝게 오도록 단순 Bag-of-Words 벡터
+    vocab = ["Dry", "Oily", "Wrinkle", "Vegan", "Clean_Beauty", "Warm", "맑음", "비"]
+    return [float(text.count(word)) for word in vocab] + [1.0]
+
+
+def _key(keywords, brand="설화수", weather="맑음"):
+    return dict(
+        brand=brand, persona="1", intent="신제품", weather=weather, product_name="윤조에센스", channel="SMS",
+        beauty_profile={"skin_type": ["Dry"], "skin_concerns": ["Wrinkle"], "preferred_tone": "Warm", "keywords": keywords},
+    )
+
+
+class TestSemanticCache(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("services.semantic_cache.llm_client.aget_embedding", side_effect=fake_embedding)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = SemanticCRMCache()
+        self.cache.enabled = True
+        self.cache.threshold = 0.9
+
+    def test_near_duplicate_profile_hits_within_same_bucket_only(self):
+        async def scenario():
+            await self.cache.add(**_key(["Vegan", "Clean_Beauty"]), message_content="템플릿")
+            near = await self.cache.lookup(**_key(["Vegan"]))
+            other_brand = await self.cache.lookup(**_key(["Vegan", "Clean_Beauty"], brand="헤라"))
+            different = await self.cache.lookup(**_key([], weather="비"))
+            return near, other_brand, different
+
+        near, other_brand, different = asyncio.run(scenario())
+        self.assertEqual(near, "템플릿")
+        self.assertIsNone(other_brand)
+        self.assertIsNone(different)
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["lookups"], stats["hits"], stats["empty_bucket_skips"]), (3, 1, 1))
+
+    def test_disabled_is_noop(self):
+        self.cache.enabled = False
+        asyncio.run(self.cache.add(**_key(["Vegan"]), message_content="템플릿"))
+        self.assertIsNone(asyncio.run(self.cache.lookup(**_key(["Vegan"]))))
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
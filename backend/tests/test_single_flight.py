@@ -0,0 +1,107 @@
+import asyncio
+import contextvars
+import sys
+import unittest
+from pathlib import Path
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_followers_share_leader_result(self):
+        calls = []
+
+        async def request(flights):
+            if flights.join("sig"):
+                calls.append(1)
+                await asyncio.sleep(0.01)  # LLM 생성
+                flights.resolve("sig", "template")
+                return "template"
+            return await flights.wait("sig", timeout=1)
+
+        async def scenario():
+            flights = SingleFlight(stale_after=60)
+            results = await asyncio.gather(*[request(flights) for _ in range(10)])
+            return flights, results
+
+        flights, results = asyncio.run(scenario())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["template"] * 10)
+        self.assertEqual((flights.leaders, flights.followers, len(flights)), (1, 9, 0))
+
+    def test_follower_timeout_and_failed_leader_return_none(self):
+        async def scenario():
+            flights = SingleFlight(stale_after=60)
+            self.assertTrue(flights.join("sig"))
+            self.assertFalse(flights.join("sig"))
+            timed_out = await flights.wait("sig", timeout=0.01)
+
+            waiter = asyncio.ensure_future(flights.wait("sig", timeout=1))
+            await asyncio.sleep(0)
+            flights.resolve("sig", None)
+            return timed_out, await waiter, flights.join("sig")
+
+        timed_out, failed, next_is_leader = asyncio.run(scenario())
+        self.assertIsNone(timed_out)
+        self.assertIsNone(failed)
+        self.assertTrue(next_is_leader)
+
+    def test_leader_scope_resolves_abandoned_flight(self):
+        async def leader(flights, started):
+            with flights.leader_scope():
+                # 노드 Task에서 join (Context 복사 후에도 scope에 기록되어야 함)
+                await asyncio.ensure_future(asyncio.sleep(0, flights.join("sig")))
+                started.set()
+                await asyncio.sleep(10)  # resolve 전에 취소됨
+
+        async def scenario():
+            flights = SingleFlight(stale_after=60)
+            started = asyncio.Event()
+            task = asyncio.ensure_future(leader(flights, started))
+            await started.wait()
+            self.assertFalse(flights.join("sig"))
+            waiter = asyncio.ensure_future(flights.wait("sig", timeout=5))
+            await asyncio.sleep(0)
+            task.cancel()
+            result = await asyncio.wait_for(waiter, timeout=1)
+
+            # 이미 resolve 후 새 Leader가 시작한 flight는 scope 종료 시 건드리지 않음
+            with flights.leader_scope():
+                flights.join("other")
+                flights.resolve("other", "done")
+                contextvars.Context().run(flights.join, "other")  # scope 밖 다른 요청
+            return result, len(flights)
+
+        result, remaining = asyncio.run(scenario())
+        self.assertIsNone(result)
+        self.assertEqual(remaining, 1)
+
+    def test_stale_leader_resolve_does_not_end_new_flight(self):
+        async def scenario():
+            flights = SingleFlight(stale_after=0)
+            old_leader = flights.join("sig")
+            new_leader = flights.join("sig")  # stale_after 경과 → 새 Leader
+            waiter = asyncio.ensure_future(flights.wait("sig", timeout=1))
+            await asyncio.sleep(0)
+
+            # 이전 Leader의 늦은 resolve는 새 flight에 영향 없음
+            flights.resolve("sig", "old", old_leader)
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            self.assertEqual(len(flights), 1)
+
+            flights.resolve("sig", "new", new_leader)
+            return old_leader, new_leader, await waiter
+
+        old_leader, new_leader, result = asyncio.run(scenario())
+        self.assertIsNotNone(old_leader)
+        self.assertIsNot(old_leader, new_leader)
+        self.assertEqual(result, "new")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Aho-Corasick 다중 패턴 매칭
+키워드 수와 무관하게 텍스트를 한 번만 훑어 모든 키워드 등장을 찾습니다. (O(텍스트 길이 + 매칭 수))
+- 대소문자 무시 (패턴/텍스트 모두 lower 비교)
+- 겹치거나 포함 관계인 키워드도 모두 검출 (예: '미백', '미백 효과')
+"""
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class AhoCorasick:
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Args:
+            patterns: 키워드 목록 (결과는 이 순서를 유지, 빈 문자열/중복은 무시)
+        """
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        seen = set()
+        for pattern in patterns:
+            key = pattern.lower() if pattern else ""
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self._insert(key, len(self.patterns))
+            self.patterns.append(pattern)
+        self._build_fail_links()
+
+    def _insert(self, key: str, index: int):
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        self._output[node].append(index)
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                # 접미사 노드에서 끝나는 패턴도 함께 출력
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text: str) -> List[str]:
+        """text에 등장하는 모든 패턴 (생성 시 순서 유지, 중복 제거)"""
+        found = set()
+        node = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                found.update(output[node])
+        return [self.patterns[i] for i in sorted(found)]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
@@ -0,0 +1,59 @@
+"""
+Bloom Filter
+"확실히 없음(Definite Miss)"을 네트워크 조회 없이 판정하기 위한 확률적 집합
+- False Negative 없음: add()한 키는 항상 True
+- False Positive 비율은 capacity / error_rate 로 결정 (1% 기준 항목당 약 9.6bit)
+- 해시는 blake2b 128bit 결과를 둘로 나눈 Double Hashing (h1 + i * h2)
+- count는 새 비트를 하나라도 세운 add()만 집계 (이미 있는 키의 중복 add는 제외)
+"""
+import hashlib
+import math
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Args:
+            capacity: 예상 최대 항목 수
+            error_rate: capacity 도달 시 목표 False Positive 비율
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity는 양수, error_rate는 0과 1 사이여야 합니다.")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # m = -n ln(p) / (ln 2)^2, k = (m / n) ln 2
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """Returns: 새로 추가되었으면 True (이미 있거나 False Positive이면 False)"""
+        added = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self._bits[pos >> 3] & mask:
+                self._bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    def estimated_error_rate(self) -> float:
+        """현재 항목 수 기준 예상 False Positive 비율"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
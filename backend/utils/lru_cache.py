@@ -0,0 +1,96 @@
+"""
+In-process LRU + TTL 캐시
+- 최대 엔트리 수 초과 시 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+- 항목별 TTL 지원 (Negative Caching 용 짧은 TTL 등)
+- hit / miss / eviction / expiration 카운터 제공
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# None을 값으로 캐싱(Negative Cache)할 수 있도록 '없음'을 구분하는 Sentinel
+MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        """
+        Args:
+            max_entries: 최대 보관 항목 수
+            ttl: 기본 만료 시간(초), None이면 만료 없음
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        # 동기 경로(스레드)와 이벤트 루프에서 함께 쓰이므로 Lock으로 보호
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        캐시 조회
+        Returns: 저장된 값 (None 포함), 없거나 만료되었으면 MISSING
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return MISSING
+
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        캐시 저장 (ttl 미지정 시 기본 TTL 사용)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        """만료되지 않은 항목 존재 여부 (hit/miss 통계와 LRU 순서에 영향 없음)"""
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and (item[1] is None or item[1] > time.monotonic())
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,72 @@
+"""
+Micro Batcher
+짧은 시간창(max_wait) 동안 같은 그룹 키로 들어온 요청을 모아 한 번에 처리합니다.
+
+- submit(group_key, item): 배치 결과 중 자신의 결과를 기다려 반환
+- 그룹의 첫 요청 후 max_wait 초가 지나거나 max_batch_size개가 모이면 handler 호출
+- handler(group_key, items) -> items와 같은 순서/길이의 결과 리스트
+- handler 예외는 배치의 모든 요청에 그대로 전달
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+
+BatchHandler = Callable[[Hashable, List[Any]], Awaitable[List[Any]]]
+
+
+class MicroBatcher:
+    def __init__(self, handler: BatchHandler, max_batch_size: int, max_wait: float):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        # 실행 중인 배치 Task 강한 참조 (이벤트 루프는 약한 참조만 유지 → GC 시 배치 전체가 멈춤)
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, group_key: Hashable, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(group_key, [])
+        batch.append((item, future))
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(group_key)
+        elif len(batch) == 1:
+            self._timers[group_key] = loop.call_later(self.max_wait, self._flush, group_key)
+        return await future
+
+    def _flush(self, group_key: Hashable):
+        timer = self._timers.pop(group_key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(group_key, None)
+        if batch:
+            task = asyncio.ensure_future(self._run(group_key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, group_key: Hashable, batch: List[Tuple[Any, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.handler(group_key, [item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"handler returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
@@ -0,0 +1,95 @@
+"""
+Single Flight (In-flight 요청 병합)
+같은 키의 작업이 이미 진행 중이면 새로 시작하지 않고 진행 중인 결과를 기다립니다.
+
+- join(key): 첫 호출자는 Leader(이 flight의 Future 반환), 이후 호출자는 Follower(None)
+- Leader는 작업 종료 시 resolve(key, value, future)로 결과 전달 (실패 시 None)
+  → future가 현재 flight와 다르면(stale 처리 후 새 Leader가 시작한 경우) 무시
+- Follower는 wait(key, timeout)으로 결과 대기, 타임아웃/실패 시 None
+- Leader가 resolve 없이 사라진 경우를 대비해 stale_after 초가 지난 flight는 새 Leader에게 넘김
+- leader_scope(): 블록 안에서 Leader가 된 flight를 블록 종료 시(예외/취소 포함) 미해결이면 None으로 resolve
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+# 현재 leader_scope에서 Leader가 된 (key, future) 목록
+# (하위 Task는 Context를 복사하지만 리스트 객체는 공유하므로 노드 Task에서 추가한 항목도 보임)
+_led_flights: ContextVar[Optional[List[Tuple[Hashable, asyncio.Future]]]] = ContextVar("single_flight_led", default=None)
+
+
+class SingleFlight:
+    def __init__(self, stale_after: float):
+        self.stale_after = stale_after
+        self._flights: Dict[Hashable, Tuple[asyncio.Future, float]] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def join(self, key: Hashable) -> Optional[asyncio.Future]:
+        """
+        진행 중인 flight에 합류
+        Returns: Leader면 이 flight의 Future(직접 수행 + resolve(key, value, future) 책임), Follower면 None(wait 호출)
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            future, started_at = flight
+            if not future.done() and time.monotonic() - started_at < self.stale_after:
+                self.followers += 1
+                return None
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = (future, time.monotonic())
+        self.leaders += 1
+        led = _led_flights.get()
+        if led is not None:
+            led.append((key, future))
+        return future
+
+    @contextmanager
+    def leader_scope(self):
+        """
+        블록(워크플로우 실행) 안에서 Leader가 된 flight 정리
+        정상 경로의 resolve 전에 실행이 예외/취소로 끝나도 Follower가 stale_after까지 기다리지 않도록
+        아직 같은 flight가 남아 있으면 None으로 resolve (이미 새 Leader로 바뀐 flight는 건드리지 않음)
+        """
+        led: List[Tuple[Hashable, asyncio.Future]] = []
+        token = _led_flights.set(led)
+        try:
+            yield
+        finally:
+            try:
+                _led_flights.reset(token)
+            except ValueError:
+                pass  # 다른 Context에서 종료된 경우 (스트리밍 응답 중단 등)
+            for key, future in led:
+                self.resolve(key, None, future)
+
+    async def wait(self, key: Hashable, timeout: float) -> Optional[Any]:
+        """Leader 결과 대기 (타임아웃, 실패, flight 없음은 모두 None)"""
+        flight = self._flights.get(key)
+        if flight is None:
+            return None
+        try:
+            # shield: 한 Follower의 타임아웃이 공유 Future를 취소하지 않도록
+            return await asyncio.wait_for(asyncio.shield(flight[0]), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def resolve(self, key: Hashable, value: Optional[Any], future: Optional[asyncio.Future] = None):
+        """
+        Leader 결과 전달 및 flight 종료 (중복 호출 무시)
+        Args:
+            future: join에서 받은 Future. 지정 시 현재 flight가 같은 Future일 때만 종료
+                    (stale로 넘겨진 이전 Leader가 새 Leader의 flight를 끝내지 않도록)
+        """
+        flight = self._flights.get(key)
+        if flight is None or (future is not None and flight[0] is not future):
+            return
+        del self._flights[key]
+        if not flight[0].done():
+            flight[0].set_result(value)
+
+    def __len__(self) -> int:
+        return len(self._flights)
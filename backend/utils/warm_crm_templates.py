@@ -0,0 +1,200 @@
+"""
+CRM 템플릿 사전 생성 (Cache Warming) 배치 작업
+실제로 자주 등장하는 조합을 한가한 시간대에 미리 생성해 crm_message_history에 저장합니다.
+피크 시간대 요청은 대부분 이미 저장된 signature를 조회(Cache Hit)하게 됩니다.
+
+조합 = 페르소나 × 브랜드(페르소나별 구매 빈도 상위) × intent × channel × 뷰티 프로필(페르소나별 빈도 상위)
+- 페르소나/브랜드/프로필 빈도는 persona_stats_service 집계(user_data 전체 스캔)를 사용
+- 각 조합은 해당 프로필의 대표 고객으로 메시지 워크플로우를 실행
+  (RecSys 상위 추천 상품 → Writer → Compliance → save_crm의 CRMHistoryService.save_message 저장)
+- 이미 저장된 signature는 retrieve_crm에서 Cache Hit로 끝나므로 LLM 비용 없음
+- --rate 로 분당 실행 수 제한, --resume-file 에 완료 조합을 기록하여 중단 후 재개
+
+사용 예:
+    python utils/warm_crm_templates.py --channels APPPUSH KAKAO --intents 일반홍보 할인행사 --rate 30
+    python utils/warm_crm_templates.py --dry-run
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+# backend 폴더를 path에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.persona_stats_service import persona_stats_service
+from services.supabase_client import supabase_client
+from services.crm_history_service import crm_history_service
+from models.message import MessageRequest
+from api.message import _build_customer_profile, _build_initial_state
+from graph import message_workflow
+
+
+@dataclass(frozen=True)
+class WarmJob:
+    persona_id: str
+    brand: str
+    intent: str
+    channel: str
+    user_id: str  # 프로필 대표 고객
+    profile: str  # 뷰티 프로필 시그니처 (JSON)
+    weather: str = ""
+
+    @property
+    def key(self) -> str:
+        """재개 파일 기록용 조합 키 (대표 고객이 바뀌어도 같은 프로필이면 같은 키)"""
+        return "|".join([self.persona_id, self.brand, self.intent, self.channel, self.weather, self.profile])
+
+
+def enumerate_jobs(args) -> List[WarmJob]:
+    """집계 기반 조합 목록 (페르소나 순, 그 안에서는 빈도 높은 브랜드/프로필부터)"""
+    personas = args.personas or persona_stats_service.persona_ids()
+    weathers = args.weather_details or [""]
+
+    jobs: List[WarmJob] = []
+    for persona_id in personas:
+        brand_counts = persona_stats_service.get_brand_counts(persona_id)
+        brands = [brand for brand, _ in sorted(brand_counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+        profiles = persona_stats_service.top_profiles(persona_id, args.profiles_per_persona)
+        for brand in brands[:args.brands_per_persona]:
+            for signature, user_id, _ in profiles:
+                for intent in args.intents:
+                    for channel in args.channels:
+                        # 날씨 intent만 weather 조합을 펼침 (그 외 intent는 signature에 weather 미포함)
+                        for weather in (weathers if intent in ("날씨", "weather") else [""]):
+                            jobs.append(WarmJob(
+                                persona_id=persona_id, brand=brand, intent=intent, channel=channel,
+                                user_id=user_id, profile=json.dumps(signature, ensure_ascii=False),
+                                weather=weather,
+                            ))
+    return jobs
+
+
+def load_completed(resume_file: Path) -> Set[str]:
+    if not resume_file.exists():
+        return set()
+    completed = set()
+    with resume_file.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # 중단 시 잘린 마지막 줄
+            if record.get("status") in ("generated", "hit"):
+                completed.add(record["key"])
+    return completed
+
+
+class RateLimiter:
+    """분당 실행 수 제한 (시작 간격을 60/rate 초로 고정)"""
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            delay = self._next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_at = max(self._next_at, time.monotonic()) + self.interval
+
+
+async def run_job(job: WarmJob) -> Dict[str, str]:
+    """조합 1개에 대해 메시지 워크플로우 실행"""
+    db_user = await asyncio.to_thread(supabase_client.get_user, job.user_id)
+    customer = _build_customer_profile(db_user)
+    if not customer:
+        return {"status": "failed", "error": f"customer {job.user_id} not found"}
+
+    request = MessageRequest(
+        userId=job.user_id,
+        channel=job.channel,
+        intention=job.intent,
+        hasBrand=True,
+        targetBrand=job.brand,
+        weatherDetail=job.weather or None,
+        persona=job.persona_id,
+    )
+    with crm_history_service.generation_flights.leader_scope():
+        result = await message_workflow.ainvoke(_build_initial_state(request, customer))
+    # success는 Compliance 실패 Fallback 응답에서도 True이므로 저장 여부는 cache_hit / compliance_passed로 판단
+    if result.get("cache_hit"):
+        return {"status": "hit"}
+    if result.get("compliance_passed"):
+        return {"status": "generated"}
+    return {"status": "failed", "error": result.get("error") or result.get("error_reason") or "compliance not passed"}
+
+
+async def warm(args):
+    print("📊 [Warm] user_data 집계 중...")
+    await persona_stats_service.refresh()
+
+    resume_file = Path(args.resume_file)
+    completed = load_completed(resume_file)
+    jobs = [job for job in enumerate_jobs(args) if job.key not in completed]
+    if args.max_jobs:
+        jobs = jobs[:args.max_jobs]
+    print(f"🔥 [Warm] 대상 {len(jobs)}개 조합 (완료 기록 {len(completed)}개 제외)")
+
+    if args.dry_run:
+        for job in jobs:
+            print(f"  - P{job.persona_id} / {job.brand} / {job.intent} / {job.channel} / user={job.user_id}")
+        return
+
+    limiter = RateLimiter(args.rate)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    stats: Counter = Counter()
+    started = time.monotonic()
+
+    with resume_file.open("a", encoding="utf-8") as progress:
+        async def worker(job: WarmJob):
+            async with semaphore:
+                await limiter.acquire()
+                try:
+                    outcome = await run_job(job)
+                except Exception as e:
+                    outcome = {"status": "failed", "error": str(e)}
+
+                stats[outcome["status"]] += 1
+                progress.write(json.dumps({"key": job.key, "user_id": job.user_id, **outcome}, ensure_ascii=False) + "\n")
+                progress.flush()
+
+                done = sum(stats.values())
+                if done % args.log_every == 0 or done == len(jobs):
+                    elapsed = time.monotonic() - started
+                    print(
+                        f"⏳ [Warm] {done}/{len(jobs)} (generated={stats['generated']}, hit={stats['hit']}, "
+                        f"failed={stats['failed']}, {elapsed:.0f}s)"
+                    )
+
+        await asyncio.gather(*[worker(job) for job in jobs])
+
+    print(f"✅ [Warm] 완료: generated={stats['generated']}, hit={stats['hit']}, failed={stats['failed']}")
+
+
+def parse_args(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description="자주 등장하는 조합의 CRM 템플릿을 미리 생성합니다.")
+    parser.add_argument("--personas", nargs="*", help="대상 페르소나 ID (기본: 집계된 전체)")
+    parser.add_argument("--channels", nargs="+", default=["APPPUSH"], help="SMS | APPPUSH | KAKAO | EMAIL")
+    parser.add_argument("--intents", nargs="+", default=["일반홍보"], help="CRM 발송 이유 (예: 일반홍보 할인행사 날씨)")
+    parser.add_argument("--weather-details", nargs="*", help="intent가 '날씨'일 때 펼칠 날씨 상세")
+    parser.add_argument("--brands-per-persona", type=int, default=3, help="페르소나별 구매 빈도 상위 브랜드 수")
+    parser.add_argument("--profiles-per-persona", type=int, default=10, help="페르소나별 빈도 상위 뷰티 프로필 수")
+    parser.add_argument("--rate", type=float, default=30.0, help="분당 최대 실행 수 (0이면 제한 없음)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 실행 워크플로우 수")
+    parser.add_argument("--max-jobs", type=int, default=0, help="이번 실행의 최대 조합 수 (0이면 전체)")
+    parser.add_argument("--resume-file", default="warm_crm_progress.jsonl", help="완료 조합 기록 파일 (재개용)")
+    parser.add_argument("--log-every", type=int, default=10, help="진행 상황 출력 간격")
+    parser.add_argument("--dry-run", action="store_true", help="조합 목록만 출력")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(warm(parse_args()))